@@ -1,13 +1,90 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+from typing import List
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.deps import get_session
+from app.core.downloads import file_download
+from app.core.exceptions import DomainError, NotFoundError, http_error_from_domain
+from app.models.entities import Task
+from app.models.schemas import AttachmentOut
 from app.services.attachment_service import AttachmentService
 from app.repositories.attachment_repo import AttachmentRepo
 
 router = APIRouter()
 
-@router.post("/attachments")
-async def upload_attachment(task_id: int, file: UploadFile = File(...), session: Session = Depends(get_session)):
+# o corpo é lido em streaming pelo serviço; aqui só a documentação do formulário
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+@router.post("/attachments", openapi_extra=UPLOAD_OPENAPI)
+async def upload_attachment(task_id: int, request: Request, session: Session = Depends(get_session)):
+    """
+    Anexa um arquivo (multipart/form-data, campo `file`) à task.
+
+    - 404 se a task não existir
+    - 413 acima de MAX_UPLOAD_BYTES (pelo Content-Length, antes de ler o corpo)
+
+    A resposta sai com processing_status "pending": checksum, tipo e prévia
+    são preenchidos em segundo plano (GET /tasks/{id}/attachments).
+    """
     svc = AttachmentService(AttachmentRepo(session))
-    a = await svc.save(task_id, file)
-    return {"id": a.id, "task_id": a.task_id, "filename": a.filename, "filepath": a.filepath}
+    try:
+        a = await svc.save(task_id, request)
+    except DomainError as e:
+        raise http_error_from_domain(e)
+    return {
+        "id": a.id,
+        "task_id": a.task_id,
+        "filename": a.filename,
+        "filepath": a.filepath,
+        "size": a.size,
+        "sha256": a.sha256,
+        "processing_status": a.processing_status,
+    }
+
+@router.delete("/attachments/{attachment_id}", status_code=204)
+def delete_attachment(attachment_id: int, session: Session = Depends(get_session)):
+    """Remove o anexo; o arquivo sai do disco junto com a última referência ao conteúdo."""
+    try:
+        AttachmentService(AttachmentRepo(session)).delete(attachment_id)
+    except DomainError as e:
+        raise http_error_from_domain(e)
+    return Response(status_code=204)
+
+@router.get("/tasks/{task_id}/attachments", response_model=List[AttachmentOut])
+def list_task_attachments(task_id: int, session: Session = Depends(get_session)):
+    if session.get(Task, task_id) is None:
+        raise http_error_from_domain(NotFoundError("not_found", "Task inexistente."))
+    return AttachmentRepo(session).list_by_task(task_id)
+
+@router.api_route("/attachments/{attachment_id}", methods=["GET", "HEAD"])
+async def download_attachment(attachment_id: int, request: Request, session: Session = Depends(get_session)):
+    """
+    Conteúdo do anexo (app.core.downloads): Range/206, If-None-Match e
+    If-Modified-Since (304); a ETag é o sha256 do conteúdo.
+    """
+    a = await run_in_threadpool(AttachmentRepo(session).get, attachment_id)
+    if a is None:
+        raise http_error_from_domain(NotFoundError("not_found", "Anexo inexistente."))
+    try:
+        return await file_download(
+            request,
+            a.filepath,
+            filename=a.filename,
+            media_type=a.content_type,
+            etag=f'"{a.sha256}"' if a.sha256 else None,
+        )
+    except FileNotFoundError:
+        raise http_error_from_domain(NotFoundError("file_missing", "Arquivo do anexo não encontrado."))
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
+from app.core.cache import response_cache
 router = APIRouter()
 
 @router.get("/health")
 def health():
     return {"status": "ok"}
+
+@router.get("/health/cache")
+def cache_stats():
+    """Contadores do cache de respostas (hits, misses, evictions...)."""
+    return response_cache.stats()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+# Content-Type do formato de exposição em texto do Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Latência por rota/status, tamanhos e requests em andamento (formato Prometheus).
+
+    `async def` de propósito: o registro só é lido e alterado no event loop
+    (ver app.core.metrics); numa thread do threadpool a leitura correria
+    junto com o middleware alterando os dicionários.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlmodel import Session
+from app.core.cache import project_scope
 from app.core.deps import get_session
+from app.core.etag import conditional_json
+from app.core.responses import dumps
 from app.models.entities import Project
 from app.models.schemas import ProjectIn, ProjectOut
+from app.models.sqlite_writer import run_write
 from app.repositories.project_repo import ProjectRepo
 from app.repositories.task_repo import TaskRepo
 from app.services.project_service import ProjectService
@@ -11,13 +15,42 @@ router = APIRouter()
 
 @router.post("/projects", response_model=ProjectOut)
 def create_project(payload: ProjectIn, session: Session = Depends(get_session)):
-    return ProjectRepo(session).create(Project(**payload.model_dump()))
+    project = Project(**payload.model_dump())
+    return run_write(session, lambda s: ProjectRepo(s).create(project))
 
 @router.get("/projects/{project_id}/progress")
-def project_progress(project_id: int, session: Session = Depends(get_session)):
-    return {"progress": ProjectRepo(session).progress(project_id)}
+def project_progress(project_id: int, request: Request, session: Session = Depends(get_session)):
+    return conditional_json(
+        request,
+        session,
+        "project_progress",
+        {"project_id": project_id},
+        [project_scope(project_id)],
+        lambda: dumps({"progress": ProjectRepo(session).progress(project_id)}),
+    )
+
+@router.get("/projects/{project_id}/stats")
+def project_stats(project_id: int, session: Session = Depends(get_session)):
+    return stats_body(project_id, ProjectRepo(session).status_counts(project_id))
+
+def stats_body(project_id: int, counts: dict) -> dict:
+    total = sum(counts.values())
+    done = counts.get("DONE", 0)
+    return {
+        "project_id": project_id,
+        "total": total,
+        "by_status": counts,
+        "progress": round((done / total) * 100.0, 2) if total else 0.0,
+    }
 
 @router.get("/projects/{project_id}/can-archive")
-def can_archive(project_id: int, session: Session = Depends(get_session)):
+def can_archive(project_id: int, request: Request, session: Session = Depends(get_session)):
     svc = ProjectService(ProjectRepo(session), TaskRepo(session))
-    return {"can_archive": svc.can_archive(project_id)}
+    return conditional_json(
+        request,
+        session,
+        "project_can_archive",
+        {"project_id": project_id},
+        [project_scope(project_id)],
+        lambda: dumps({"can_archive": svc.can_archive(project_id)}),
+    )
@@ -0,0 +1,50 @@
+# app/api/v1/projects_async.py
+"""Rotas de projetos em `async def` sobre AsyncSession (ver tasks_async)."""
+from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.projects import stats_body
+from app.core.cache import project_scope
+from app.core.deps import get_async_session
+from app.core.etag import conditional_json_async
+from app.core.responses import dumps
+from app.models.entities import Project
+from app.models.schemas import ProjectIn, ProjectOut
+from app.repositories.project_repo import AsyncProjectRepo
+from app.repositories.task_repo import AsyncTaskRepo
+from app.services.project_service import AsyncProjectService
+
+router = APIRouter()
+
+@router.post("/projects", response_model=ProjectOut)
+async def create_project(payload: ProjectIn, session: AsyncSession = Depends(get_async_session)):
+    return await AsyncProjectRepo(session).create(Project(**payload.model_dump()))
+
+@router.get("/projects/{project_id}/progress")
+async def project_progress(project_id: int, request: Request, session: AsyncSession = Depends(get_async_session)):
+    repo = AsyncProjectRepo(session)
+
+    async def _body() -> bytes:
+        return dumps({"progress": await repo.progress(project_id)})
+
+    return await conditional_json_async(
+        request, session, "project_progress", {"project_id": project_id},
+        [project_scope(project_id)], _body,
+    )
+
+@router.get("/projects/{project_id}/stats")
+async def project_stats(project_id: int, session: AsyncSession = Depends(get_async_session)):
+    counts = await AsyncProjectRepo(session).status_counts(project_id)
+    return stats_body(project_id, counts)
+
+@router.get("/projects/{project_id}/can-archive")
+async def can_archive(project_id: int, request: Request, session: AsyncSession = Depends(get_async_session)):
+    svc = AsyncProjectService(AsyncProjectRepo(session), AsyncTaskRepo(session))
+
+    async def _body() -> bytes:
+        return dumps({"can_archive": await svc.can_archive(project_id)})
+
+    return await conditional_json_async(
+        request, session, "project_can_archive", {"project_id": project_id},
+        [project_scope(project_id)], _body,
+    )
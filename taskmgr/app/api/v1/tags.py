@@ -3,10 +3,12 @@ from sqlmodel import Session
 from app.core.deps import get_session
 from app.models.entities import Tag
 from app.models.schemas import TagIn, TagOut
+from app.models.sqlite_writer import run_write
 from app.repositories.tag_repo import TagRepo
 
 router = APIRouter()
 
 @router.post("/tags", response_model=TagOut)
 def create_tag(payload: TagIn, session: Session = Depends(get_session)):
-    return TagRepo(session).create(Tag(**payload.model_dump()))
+    tag = Tag(**payload.model_dump())
+    return run_write(session, lambda s: TagRepo(s).create(tag))
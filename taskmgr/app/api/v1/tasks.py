@@ -1,77 +1,250 @@
 # app/api/v1/tasks.py
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
+from app.core.cache import TAGS_SCOPE, TASKS_SCOPE, project_scope
+from app.core.config import settings
 from app.core.deps import get_session
+from app.core.etag import conditional_json
+from app.core.responses import RawJSONResponse, encode_task_list, encode_task_page
 from app.core.exceptions import http_error_from_domain, DomainError
 from app.models.entities import Task
-from app.models.schemas import TaskIn, TaskOut
+from app.models.sqlite_writer import run_write
+from app.models.schemas import (
+    BulkItemError,
+    BulkItemResult,
+    BulkStatusIn,
+    BulkStatusItem,
+    BulkStatusResult,
+    BulkTaskResult,
+    TaskIn,
+    TaskOut,
+)
 from app.repositories.task_repo import TaskRepo
+from app.services.export_service import EXPORT_FORMATS, TaskExportService
 from app.services.task_service import TaskService
 
 router = APIRouter()
 
 
+def _to_out(t: Task, tags: List[str]) -> TaskOut:
+    return TaskOut(
+        id=t.id,
+        title=t.title,
+        description=t.description,
+        status=t.status,
+        priority=t.priority,
+        due_date=t.due_date,
+        project_id=t.project_id,
+        assignee_id=t.assignee_id,
+        tags=tags,
+    )
+
+
 @router.post("/tasks", response_model=TaskOut)
 def create_task(payload: TaskIn, session: Session = Depends(get_session)):
     repo = TaskRepo(session)
-    svc = TaskService(repo)
     try:
         task = Task(**payload.model_dump(exclude={"tag_ids"}))
-        created = svc.create_task(task, payload.tag_ids)
-        tag_names = repo.tag_names_for_task(created.id)
-        return TaskOut(
-            id=created.id,
-            title=created.title,
-            description=created.description,
-            status=created.status,
-            priority=created.priority,
-            due_date=created.due_date,
-            project_id=created.project_id,
-            assignee_id=created.assignee_id,
-            tags=tag_names,
-        )
+        created = run_write(session, lambda s: TaskService(TaskRepo(s)).create_task(task, payload.tag_ids))
+        tag_names = repo.tag_names_for_tasks([created.id])
+        return _to_out(created, tag_names[created.id])
     except DomainError as e:
         raise http_error_from_domain(e)
 
 
-@router.get("/tasks")
+@router.post("/tasks/bulk", response_model=BulkTaskResult)
+def create_tasks_bulk(payload: List[TaskIn], session: Session = Depends(get_session)):
+    """
+    Cria várias tarefas numa única transação.
+
+    Cada item passa pelas mesmas regras do POST /tasks (due_date e limite de
+    abertas por usuário, este calculado sobre o lote todo); itens recusados
+    não impedem os demais. A resposta traz o resultado de cada item.
+    """
+    items = bulk_items(payload)
+    outcomes = run_write(session, lambda s: TaskService(TaskRepo(s)).create_tasks_bulk(items))
+    return bulk_task_result(outcomes)
+
+
+def check_bulk_size(size: int) -> None:
+    if size > settings.MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "code": "bulk_too_large",
+                "message": f"Máximo de {settings.MAX_BULK_ITEMS} tarefas por lote.",
+            },
+        )
+
+
+def bulk_items(payload: List[TaskIn]) -> List[Tuple[Task, List[int]]]:
+    check_bulk_size(len(payload))
+    return [
+        (Task(**item.model_dump(exclude={"tag_ids"})), item.tag_ids)
+        for item in payload
+    ]
+
+
+def bulk_task_result(outcomes) -> BulkTaskResult:
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, DomainError):
+            error = BulkItemError(code=outcome.code, message=outcome.message)
+            results.append(BulkItemResult(index=index, ok=False, error=error))
+        else:
+            results.append(BulkItemResult(index=index, ok=True, id=outcome))
+    created = sum(1 for r in results if r.ok)
+    return BulkTaskResult(created=created, failed=len(results) - created, results=results)
+
+
+@router.get("/tasks", response_model=None, response_class=RawJSONResponse)
 def list_tasks(
+    request: Request,
     status: Optional[str] = None,
     project_id: Optional[int] = None,
     assignee_id: Optional[int] = None,
-    tag: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: str = Query("any", pattern="^(any|all)$"),
     q: Optional[str] = None,
     order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
 ):
+    """
+    Lista tarefas com filtros.
+
+    `tag` pode ser repetido (`tag=a&tag=b`); com `tag_mode=all` só vêm as
+    tasks que têm todas as tags, com `any` (padrão) as que têm alguma.
+    Sem `limit`/`cursor` devolve a lista completa (comportamento original).
+    Com `limit` (ou `cursor`) devolve uma página {items, next_cursor};
+    para a próxima página basta repetir a chamada com `cursor=next_cursor`.
+    A resposta traz ETag; com If-None-Match igual, volta 304 sem consultar.
+    """
+    filters = dict(
+        status=status,
+        project_id=project_id,
+        assignee_id=assignee_id,
+        tag=tag,
+        tag_mode=tag_mode,
+        q=q,
+    )
     repo = TaskRepo(session)
-    tasks = repo.list_with_filters(
+
+    # Caminho rápido: tuplas de colunas + JSON gerado direto em bytes
+    # (mesmo formato de TaskOut, sem pydantic/jsonable_encoder por linha).
+    def _body() -> bytes:
+        if limit is None and cursor is None:
+            rows = repo.list_with_filters(order_by=order_by, as_rows=True, **filters)
+            # tags de todas as tasks carregadas em lote (evita N+1 consultas)
+            tag_names = repo.tag_names_for_tasks(r[0] for r in rows)
+            return encode_task_list(rows, tag_names)
+        rows, next_cursor = repo.list_page(
+            limit=limit or settings.DEFAULT_PAGE_SIZE,
+            cursor=cursor,
+            order_by=order_by,
+            as_rows=True,
+            **filters,
+        )
+        tag_names = repo.tag_names_for_tasks(r[0] for r in rows)
+        return encode_task_page(rows, tag_names, next_cursor)
+
+    try:
+        return conditional_json(
+            request, session, "list_tasks",
+            dict(filters, order_by=order_by, limit=limit, cursor=cursor),
+            list_scopes(filters), _body,
+        )
+    except DomainError as e:
+        raise http_error_from_domain(e)
+
+
+def list_scopes(filters: dict) -> List[str]:
+    # filtrada por projeto, a listagem só muda com escritas nesse projeto
+    project_id = filters.get("project_id")
+    return [project_scope(project_id) if project_id else TASKS_SCOPE, TAGS_SCOPE]
+
+
+@router.get("/tasks/export")
+def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: str = Query("any", pattern="^(any|all)$"),
+    q: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Exporta as tasks filtradas em NDJSON (uma task por linha) ou CSV.
+
+    A resposta é enviada em streaming: as linhas são lidas do banco em lotes
+    e escritas conforme chegam, então a memória fica constante.
+    """
+    filters = dict(
         status=status,
         project_id=project_id,
         assignee_id=assignee_id,
         tag=tag,
+        tag_mode=tag_mode,
         q=q,
-        order_by=order_by,
     )
-    out = []
-    for t in tasks:
-        out.append(
-            TaskOut(
-                id=t.id,
-                title=t.title,
-                description=t.description,
-                status=t.status,
-                priority=t.priority,
-                due_date=t.due_date,
-                project_id=t.project_id,
-                assignee_id=t.assignee_id,
-                tags=repo.tag_names_for_task(t.id),
-            )
+    # A sessão da dependência é fechada antes do corpo ser enviado,
+    # por isso o gerador abre a sua própria sessão no mesmo engine.
+    bind = session.get_bind()
+
+    def _chunks():
+        with Session(bind) as export_session:
+            yield from TaskExportService(TaskRepo(export_session)).stream(format, **filters)
+
+    return StreamingResponse(
+        _chunks(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+# Declarada antes de /tasks/{task_id}/status para "bulk" não cair no {task_id}
+@router.patch("/tasks/bulk/status", response_model=BulkStatusResult)
+def update_status_bulk(payload: BulkStatusIn, session: Session = Depends(get_session)):
+    """
+    Altera o status de várias tarefas, por lista de ids ou por filtro.
+
+    A regra "DONE exige responsável" é checada para o conjunto todo e as
+    permitidas são gravadas num UPDATE em lote; a resposta traz o resultado
+    de cada tarefa (erros com os mesmos códigos do PATCH individual).
+    No máximo MAX_BULK_ITEMS ids; um `filter` sem nenhum critério é recusado.
+    """
+    if payload.ids is not None:
+        check_bulk_size(len(payload.ids))
+    filters = payload.filter.model_dump() if payload.filter else None
+    try:
+        outcomes = run_write(
+            session,
+            lambda s: TaskService(TaskRepo(s)).update_status_bulk(
+                payload.new_status, ids=payload.ids, filters=filters
+            ),
         )
-    return out
+    except DomainError as e:
+        raise http_error_from_domain(e)
+    return bulk_status_result(outcomes)
+
+
+def bulk_status_result(outcomes) -> BulkStatusResult:
+    results = []
+    for task_id, outcome in outcomes:
+        if isinstance(outcome, DomainError):
+            error = BulkItemError(code=outcome.code, message=outcome.message)
+            results.append(BulkStatusItem(id=task_id, ok=False, error=error))
+        else:
+            results.append(BulkStatusItem(id=task_id, ok=True, status=outcome))
+    updated = sum(1 for r in results if r.ok)
+    return BulkStatusResult(updated=updated, failed=len(results) - updated, results=results)
 
 
 # 🔧 AJUSTE IMPORTANTE: caminho correto + uso do service
@@ -84,10 +257,8 @@ def update_status(task_id: int, new_status: str, session: Session = Depends(get_
     - 422 se tentar marcar DONE sem responsável (code='no_assignee')
     - 200 com {id, status} em caso de sucesso
     """
-    repo = TaskRepo(session)
-    svc = TaskService(repo)
     try:
-        task = svc.update_status(task_id, new_status)
+        task = run_write(session, lambda s: TaskService(TaskRepo(s)).update_status(task_id, new_status))
         return {"id": task.id, "status": task.status}
     except DomainError as e:
         # http_error_from_domain mapeia:
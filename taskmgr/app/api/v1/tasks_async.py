@@ -0,0 +1,121 @@
+# app/api/v1/tasks_async.py
+"""
+Rotas de tasks em `async def` sobre AsyncSession (ativadas por ASYNC_DB).
+
+Mesmos caminhos, parâmetros e respostas de app/api/v1/tasks.py; o acesso
+ao banco passa por AsyncTaskRepo/AsyncTaskService, então um request
+esperando o banco não ocupa uma thread do threadpool. O export continua
+síncrono (o streaming lê o banco em lotes com uma sessão própria).
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1 import tasks
+from app.core.config import settings
+from app.core.deps import get_async_session
+from app.core.etag import conditional_json_async
+from app.core.exceptions import DomainError, http_error_from_domain
+from app.core.responses import RawJSONResponse, encode_task_list, encode_task_page
+from app.models.entities import Task
+from app.models.schemas import BulkStatusIn, BulkStatusResult, BulkTaskResult, TaskIn, TaskOut
+from app.repositories.task_repo import AsyncTaskRepo
+from app.services.task_service import AsyncTaskService
+
+router = APIRouter()
+
+
+@router.post("/tasks", response_model=TaskOut)
+async def create_task(payload: TaskIn, session: AsyncSession = Depends(get_async_session)):
+    repo = AsyncTaskRepo(session)
+    svc = AsyncTaskService(repo)
+    try:
+        task = Task(**payload.model_dump(exclude={"tag_ids"}))
+        created = await svc.create_task(task, payload.tag_ids)
+        tag_names = await repo.tag_names_for_tasks([created.id])
+        return tasks._to_out(created, tag_names[created.id])
+    except DomainError as e:
+        raise http_error_from_domain(e)
+
+
+@router.post("/tasks/bulk", response_model=BulkTaskResult)
+async def create_tasks_bulk(payload: List[TaskIn], session: AsyncSession = Depends(get_async_session)):
+    svc = AsyncTaskService(AsyncTaskRepo(session))
+    return tasks.bulk_task_result(await svc.create_tasks_bulk(tasks.bulk_items(payload)))
+
+
+@router.get("/tasks", response_model=None, response_class=RawJSONResponse)
+async def list_tasks(
+    request: Request,
+    status: Optional[str] = None,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: str = Query("any", pattern="^(any|all)$"),
+    q: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    repo = AsyncTaskRepo(session)
+    filters = dict(
+        status=status,
+        project_id=project_id,
+        assignee_id=assignee_id,
+        tag=tag,
+        tag_mode=tag_mode,
+        q=q,
+    )
+
+    async def _body() -> bytes:
+        if limit is None and cursor is None:
+            rows = await repo.list_with_filters(order_by=order_by, as_rows=True, **filters)
+            tag_names = await repo.tag_names_for_tasks(r[0] for r in rows)
+            return encode_task_list(rows, tag_names)
+        rows, next_cursor = await repo.list_page(
+            limit=limit or settings.DEFAULT_PAGE_SIZE,
+            cursor=cursor,
+            order_by=order_by,
+            as_rows=True,
+            **filters,
+        )
+        tag_names = await repo.tag_names_for_tasks(r[0] for r in rows)
+        return encode_task_page(rows, tag_names, next_cursor)
+
+    try:
+        return await conditional_json_async(
+            request, session, "list_tasks",
+            dict(filters, order_by=order_by, limit=limit, cursor=cursor),
+            tasks.list_scopes(filters), _body,
+        )
+    except DomainError as e:
+        raise http_error_from_domain(e)
+
+
+router.add_api_route("/tasks/export", tasks.export_tasks, methods=["GET"])
+
+
+# Declarada antes de /tasks/{task_id}/status para "bulk" não cair no {task_id}
+@router.patch("/tasks/bulk/status", response_model=BulkStatusResult)
+async def update_status_bulk(payload: BulkStatusIn, session: AsyncSession = Depends(get_async_session)):
+    if payload.ids is not None:
+        tasks.check_bulk_size(len(payload.ids))
+    svc = AsyncTaskService(AsyncTaskRepo(session))
+    filters = payload.filter.model_dump() if payload.filter else None
+    try:
+        outcomes = await svc.update_status_bulk(payload.new_status, ids=payload.ids, filters=filters)
+    except DomainError as e:
+        raise http_error_from_domain(e)
+    return tasks.bulk_status_result(outcomes)
+
+
+@router.patch("/tasks/{task_id}/status")
+async def update_status(task_id: int, new_status: str, session: AsyncSession = Depends(get_async_session)):
+    svc = AsyncTaskService(AsyncTaskRepo(session))
+    try:
+        task = await svc.update_status(task_id, new_status)
+        return {"id": task.id, "status": task.status}
+    except DomainError as e:
+        raise http_error_from_domain(e)
@@ -0,0 +1,253 @@
+# app/core/cache.py
+"""
+Cache de respostas em memória (LRU + TTL) para as leituras mais repetidas
+(progresso do projeto, can-archive, listagem de tasks).
+
+Cada entrada depende de "escopos" (`project:<id>`, `task`, `tag`). Os
+repositórios marcam na sessão os escopos que uma escrita altera
+(`mark_changed`): antes do commit as versões desses escopos na tabela
+change_version são incrementadas (na mesma transação) e, depois do commit,
+os escopos são invalidados neste processo: a geração de cada um sobe e as
+entradas que dependiam da geração antiga deixam de valer. Como a geração é
+lida antes da consulta, uma resposta calculada durante uma escrita
+concorrente já nasce inválida e não é guardada.
+
+O cache é por processo; entre workers, o TTL limita o tempo de uma resposta
+velha — a menos que a chave inclua as versões do banco (`versions`), como
+fazem as rotas com ETag.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.versions import TAG_SCOPE, TRIGGER_SCOPES, bump_version
+
+# Escopos de invalidação (os mesmos nomes das versões em change_version)
+ALL_SCOPE = "*"
+TASKS_SCOPE = "task"
+TAGS_SCOPE = TAG_SCOPE
+
+# chave em session.info: escopos alterados pela transação corrente
+_PENDING_KEY = "response_cache_pending"
+# chave em session.info: conjunto que acumula os escopos em vez de invalidar
+_DEFERRED_KEY = "response_cache_deferred"
+
+
+def project_scope(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+class ResponseCache:
+    """LRU limitado a `maxsize` entradas, cada uma válida por `ttl` segundos."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # chave -> (expira_em, gerações dos escopos, valor)
+        self._entries: "OrderedDict[Hashable, Tuple[float, tuple, Any]]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _current(self, scopes: tuple) -> tuple:
+        return tuple(self._generations.get(s, 0) for s in scopes)
+
+    def get_or_compute(self, key: Hashable, scopes: Iterable[Hashable], compute: Callable[[], Any]) -> Any:
+        """Devolve o valor em cache para `key` ou calcula (e guarda) com `compute`."""
+        scopes = tuple(scopes)
+        hit, value = self._lookup(key, scopes)
+        if hit:
+            return value
+        generations = value
+        # a consulta roda fora do lock; exceções não são guardadas
+        value = compute()
+        self._store(key, scopes, generations, value)
+        return value
+
+    async def get_or_compute_async(
+        self, key: Hashable, scopes: Iterable[Hashable], compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Como get_or_compute, com `compute` assíncrono."""
+        scopes = tuple(scopes)
+        hit, value = self._lookup(key, scopes)
+        if hit:
+            return value
+        generations = value
+        value = await compute()
+        self._store(key, scopes, generations, value)
+        return value
+
+    def _lookup(self, key: Hashable, scopes: tuple) -> Tuple[Any, Any]:
+        """(True, valor) num hit; (False, gerações atuais dos escopos) num miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, generations, value = entry
+                if generations != self._current(scopes):
+                    del self._entries[key]
+                    self.invalidations += 1
+                elif expires_at <= self._clock():
+                    del self._entries[key]
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+            self.misses += 1
+            return False, self._current(scopes)
+
+    def _store(self, key: Hashable, scopes: tuple, generations: tuple, value: Any) -> None:
+        with self._lock:
+            # alguma escrita confirmou durante o cálculo: o valor já nasce velho
+            if generations == self._current(scopes):
+                self._entries[key] = (self._clock() + self.ttl, generations, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def invalidate(self, *scopes: Hashable) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.RESPONSE_CACHE_ENABLED,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAXSIZE, settings.RESPONSE_CACHE_TTL)
+
+
+def _namespace(session: Session) -> str:
+    return _bind_namespace(session.get_bind())
+
+
+def _bind_namespace(bind) -> str:
+    # bancos diferentes (aplicação, testes) não compartilham entradas; o
+    # driver fica de fora (sqlite e sqlite+aiosqlite são o mesmo banco)
+    url = bind.engine.url
+    return str(url.set(drivername=url.get_backend_name()))
+
+
+def normalize_params(params: Dict[str, Any]) -> tuple:
+    items = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(set(value)))
+        items.append((name, value))
+    return tuple(items)
+
+
+def cached(
+    session: Session,
+    endpoint: str,
+    params: Dict[str, Any],
+    scopes: Iterable[str],
+    compute: Callable[[], Any],
+    versions: Optional[tuple] = None,
+) -> Any:
+    """
+    Read-through: resposta de `endpoint` para `params` (normalizados: sem
+    valores None, listas ordenadas), dependente de `scopes`. `versions`
+    (versões dos escopos lidas do banco) entra na chave, se informado. Com
+    RESPONSE_CACHE_ENABLED desligado, apenas chama `compute`.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return compute()
+    key, deps = _key_and_deps(session, endpoint, params, scopes, versions)
+    return response_cache.get_or_compute(key, deps, compute)
+
+
+async def cached_async(
+    session: Session,
+    endpoint: str,
+    params: Dict[str, Any],
+    scopes: Iterable[str],
+    compute: Callable[[], Awaitable[Any]],
+    versions: Optional[tuple] = None,
+) -> Any:
+    """Como cached, com `compute` assíncrono (`session` é a sync_session da AsyncSession)."""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return await compute()
+    key, deps = _key_and_deps(session, endpoint, params, scopes, versions)
+    return await response_cache.get_or_compute_async(key, deps, compute)
+
+
+def _key_and_deps(session, endpoint, params, scopes, versions) -> Tuple[tuple, list]:
+    ns = _namespace(session)
+    key = (ns, endpoint, normalize_params(params), versions)
+    deps = [(ns, scope) for scope in (ALL_SCOPE, *scopes)]
+    return key, deps
+
+
+def mark_changed(session: Session, *scopes: str) -> None:
+    """
+    Registra escopos alterados pela transação: as versões deles sobem no
+    commit e o cache deste processo é invalidado logo depois.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).update(scopes)
+
+
+def defer_invalidation(session: Session, into: Set[str]) -> None:
+    """
+    Os commits de `session` passam a acumular os escopos alterados em
+    `into`, sem invalidar: para sessões cujo commit não é o definitivo
+    (SAVEPOINT do escritor do SQLite, que chama invalidate_changed depois
+    do COMMIT do lote).
+    """
+    session.info[_DEFERRED_KEY] = into
+
+
+def invalidate_changed(bind, scopes: Iterable[str]) -> None:
+    ns = _bind_namespace(bind)
+    response_cache.invalidate(*((ns, scope) for scope in scopes))
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions_before_commit(session: Session) -> None:
+    for scope in sorted(session.info.get(_PENDING_KEY, ()), key=str):
+        if scope not in TRIGGER_SCOPES:
+            bump_version(session, scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    scopes = session.info.pop(_PENDING_KEY, None)
+    if scopes:
+        deferred = session.info.get(_DEFERRED_KEY)
+        if deferred is not None:
+            deferred.update(scopes)
+        else:
+            invalidate_changed(session.get_bind(), scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
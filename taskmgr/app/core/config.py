@@ -1,10 +1,44 @@
+from typing import Dict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./data/taskmgr.db"
     MAX_OPEN_TASKS_PER_USER: int = 1
     LOG_LEVEL: str = "INFO"
+    # modo debug: respostas com X-DB-Query-Count / X-DB-Query-Time-Ms
+    DEBUG: bool = False
+    # consultas a partir deste tempo vão para o log com o plano (0 desliga)
+    SQL_SLOW_QUERY_MS: float = 200.0
+    # logs saem por uma fila e uma thread própria (app/core/logging_config.py)
+    LOG_QUEUE: bool = True
+    LOG_JSON: bool = False
+    # fração mantida dos logs até INFO, por logger: {"taskmgr.tasks": 0.1}
+    LOG_SAMPLING: Dict[str, float] = {}
+    # histogramas de latência por rota em GET /api/v1/metrics (app/core/metrics.py)
+    METRICS_ENABLED: bool = True
     FILE_STORAGE_DIR: str = "./data/files"
+    # uploads de anexos: lidos em pedaços de UPLOAD_CHUNK_SIZE, até MAX_UPLOAD_BYTES
+    MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # pós-processamento de anexos em processos separados (0 desliga o runner)
+    ATTACHMENT_WORKERS: int = 2
+    ATTACHMENT_JOB_POLL_SECONDS: float = 2.0
+    ATTACHMENT_JOB_MAX_ATTEMPTS: int = 3
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
+    MAX_BULK_ITEMS: int = 5000
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAXSIZE: int = 1024
+    RESPONSE_CACHE_TTL: float = 5.0
+    # rotas de tasks/projetos em async def sobre AsyncSession (aiosqlite)
+    ASYNC_DB: bool = False
+    # conexões mantidas abertas pelo engine assíncrono (uma thread do aiosqlite cada)
+    ASYNC_DB_POOL_SIZE: int = 40
+    # SQLite: WAL + um único escritor com group commit (app/models/sqlite_writer.py)
+    SQLITE_WAL: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_WRITER_ENABLED: bool = True
+    SQLITE_WRITER_MAX_BATCH: int = 64
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 settings = Settings()
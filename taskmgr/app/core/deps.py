@@ -1,6 +1,11 @@
 from sqlmodel import Session
-from app.models.db import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.db import engine, get_async_engine
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+async def get_async_session():
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,159 @@
+# app/core/downloads.py
+"""
+Download de arquivos com Range, respostas condicionais e envio sem cópia.
+
+O FileResponse do Starlette sempre manda o arquivo inteiro. RangeFileResponse
+acrescenta:
+
+- `Range: bytes=início-fim` (um intervalo; sufixo `-N` e `início-` também):
+  206 com Content-Range, ou 416 se o intervalo está fora do arquivo;
+  `If-Range` com ETag/data antiga faz voltar o arquivo inteiro;
+- If-None-Match / If-Modified-Since: 304 sem abrir o arquivo;
+- envio sem passar o conteúdo pelo Python quando o servidor ASGI oferece
+  a extensão `http.response.zerocopysend` (sendfile no descritor) ou
+  `http.response.pathsend`; sem elas, o arquivo é lido em pedaços de
+  64 KiB fora do event loop — nunca inteiro na memória.
+
+Vários intervalos num Range só (multipart/byteranges) não são suportados:
+o pedido é atendido com o arquivo inteiro, como a RFC 9110 permite.
+"""
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.etag import etag_matches
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (início, fim) inclusivo de um `Range: bytes=...` com um intervalo.
+    None se não há Range utilizável (ausente, outra unidade, vários
+    intervalos ou sintaxe inválida: serve-se o arquivo inteiro); levanta
+    ValueError se o intervalo não cabe no arquivo (416).
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        # sufixo: os últimos N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("intervalo vazio")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("intervalo fora do arquivo")
+    return start, end
+
+
+def _not_modified_since(header: Optional[str], mtime: float) -> bool:
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified tem resolução de segundos
+    return int(mtime) <= since
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse de um trecho (offset, count) do arquivo, com envio sem cópia."""
+
+    def __init__(self, path: str, *, offset: int = 0, count: Optional[int] = None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.offset = offset
+        self.count = count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            fd = await anyio.to_thread.run_sync(os.open, self.path, os.O_RDONLY)
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            finally:
+                os.close(fd)
+            return
+        if "http.response.pathsend" in extensions and self.offset == 0 and self.count is None:
+            await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+            return
+        remaining = self.count
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            while True:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await file.read(size) if size else b""
+                if remaining is not None:
+                    remaining -= len(chunk)
+                more_body = len(chunk) == size and remaining != 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not more_body:
+                    break
+
+
+async def file_download(
+    request: Request,
+    path: str,
+    *,
+    filename: str,
+    media_type: Optional[str] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Resposta de download de `path` para `request`: 304, 206, 416 ou 200.
+    `etag` (ex.: o sha256 do conteúdo, já entre aspas) substitui a ETag
+    derivada de mtime/tamanho do FileResponse.
+    """
+    stat = await anyio.to_thread.run_sync(os.stat, path)
+    size = stat.st_size
+    if etag is None:
+        etag = FileResponse(path, stat_result=stat).headers["etag"]
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Accept-Ranges": "bytes"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag) or (
+        if_none_match is None and _not_modified_since(request.headers.get("if-modified-since"), stat.st_mtime)
+    ):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag or if_range == last_modified:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    kwargs = dict(filename=filename, media_type=media_type, stat_result=stat)
+    if byte_range is None:
+        return RangeFileResponse(path, headers=headers, **kwargs)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return RangeFileResponse(
+        path, offset=start, count=end - start + 1, status_code=206, headers=headers, **kwargs
+    )
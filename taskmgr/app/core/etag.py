@@ -0,0 +1,87 @@
+# app/core/etag.py
+"""
+Respostas condicionais (ETag / If-None-Match) a partir das versões de
+mudança do banco (tabela change_version).
+
+A ETag de uma leitura é derivada do endpoint, dos parâmetros normalizados e
+das versões dos escopos de que ela depende; como toda escrita incrementa
+essas versões na própria transação, a ETag muda sempre que a resposta pode
+ter mudado. Conferir a ETag custa uma consulta por chave primária: se o
+cliente já tem a versão atual, a resposta é 304 sem executar a consulta
+nem serializar nada.
+"""
+import hashlib
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import Request
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.responses import Response
+
+from app.core.cache import ALL_SCOPE, cached, cached_async, normalize_params
+from app.core.responses import RawJSONResponse
+from app.models.versions import read_versions
+
+
+def etag_for(endpoint: str, params: Dict, versions: tuple) -> str:
+    digest = hashlib.sha1(repr((endpoint, normalize_params(params), versions)).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara If-None-Match (lista, `*` ou ETags fracas W/) com `etag`."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_json(
+    request: Request,
+    session: Session,
+    endpoint: str,
+    params: Dict,
+    scopes: Iterable[str],
+    compute: Callable[[], bytes],
+) -> Response:
+    """
+    Resposta JSON (`compute` devolve os bytes) com ETag, passando pelo
+    cache de respostas; 304 se o If-None-Match do cliente ainda vale.
+    """
+    scopes = list(scopes)
+    versions = _versions(read_versions(session, [ALL_SCOPE, *scopes]))
+    etag = etag_for(endpoint, params, versions)
+    headers = {"ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = cached(session, endpoint, params, scopes, compute, versions=versions)
+    return RawJSONResponse(body, headers=headers)
+
+
+async def conditional_json_async(
+    request: Request,
+    session: AsyncSession,
+    endpoint: str,
+    params: Dict,
+    scopes: Iterable[str],
+    compute: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Como conditional_json, para as rotas assíncronas (`compute` assíncrono)."""
+    scopes = list(scopes)
+    current = await session.run_sync(lambda s: read_versions(s, [ALL_SCOPE, *scopes]))
+    versions = _versions(current)
+    etag = etag_for(endpoint, params, versions)
+    headers = {"ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = await cached_async(
+        session.sync_session, endpoint, params, scopes, compute, versions=versions
+    )
+    return RawJSONResponse(body, headers=headers)
+
+
+def _versions(current: Dict[str, Optional[int]]) -> tuple:
+    return tuple(sorted(current.items()))
@@ -12,6 +12,14 @@ class NotFoundError(DomainError):
 class ValidationError(DomainError):
     pass
 
+class PayloadTooLargeError(DomainError):
+    pass
+
 def http_error_from_domain(e: DomainError) -> HTTPException:
-    status = 422 if isinstance(e, ValidationError) else 404 if isinstance(e, NotFoundError) else 400
+    status = (
+        422 if isinstance(e, ValidationError)
+        else 404 if isinstance(e, NotFoundError)
+        else 413 if isinstance(e, PayloadTooLargeError)
+        else 400
+    )
     return HTTPException(status_code=status, detail={"code": e.code, "message": e.message})
@@ -1,33 +1,209 @@
+# app/core/logging_config.py
+"""
+Logging do taskmgr (logger "taskmgr" e filhos, ex.: "taskmgr.tasks").
+
+Com LOG_QUEUE (padrão) o logger só tem um QueueHandler: o request coloca o
+registro numa fila em memória e volta; uma thread (QueueListener) formata e
+escreve no console e no arquivo rotativo. Escrita lenta e a rotação do
+arquivo deixam de travar o request.
+
+Antes de entrar na fila, cada registro passa por dois filtros:
+- RequestIdFilter copia o id do request corrente (app.core.request_context)
+  para `record.request_id` — precisa ser na thread do request, não na do
+  listener;
+- SamplingFilter mantém só uma fração dos registros DEBUG/INFO dos loggers
+  em LOG_SAMPLING (ex.: {"taskmgr.tasks": 0.1}); WARNING e acima passam sempre.
+  Dentro de um request a decisão vem do id do request: ou todas as linhas
+  dele ficam, ou nenhuma.
+
+Os filtros ficam num único handler de entrada (o da fila ou, sem LOG_QUEUE,
+um que repassa aos demais), então console e arquivo recebem os mesmos
+registros.
+
+LOG_JSON troca o formato de texto por uma linha JSON por registro.
+"""
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
 from app.core.config import settings
+from app.core.request_context import request_id_var
 
 LOG_DIR = "./logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s [%(request_id)s] - %(message)s"
+# fora de um request
+NO_REQUEST_ID = "-"
+
 logger = logging.getLogger("taskmgr")
 
-# Define o nível a partir do settings (DEBUG, INFO, WARNING...)
-logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
 
-# Evita adicionar handlers duplicados em modo reload do uvicorn
-if not logger.handlers:
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-    )
+def get_logger(name: str) -> logging.Logger:
+    """Logger filho de "taskmgr" (amostragem e nível configuráveis por nome)."""
+    return logger.getChild(name)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Mantém a fração `rates[nome]` dos registros até INFO (vale o prefixo mais longo)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+
+    def _rate(self, name: str) -> float:
+        while True:
+            if name in self.rates:
+                return self.rates[name]
+            if "." not in name:
+                return 1.0
+            name = name.rsplit(".", 1)[0]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id is None:
+            return random.random() < rate
+        # mesma decisão para todas as linhas do request
+        return zlib.crc32(request_id.encode()) / 2**32 < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
 
-    # Console
-    ch = logging.StreamHandler()
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
-
-    # Arquivo com rotação
-    fh = RotatingFileHandler(
-        os.path.join(LOG_DIR, "app.log"),
-        maxBytes=2_000_000,
-        backupCount=3,
-        encoding="utf-8",
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata a mensagem com o traceback junto: o
+    traceback vai já em texto em `exc_text` e o formatter do listener
+    (texto ou JSON) decide onde colocá-lo.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _FanOutHandler(logging.Handler):
+    """Sem fila: ponto de entrada único que repassa cada registro aos handlers."""
+
+    def __init__(self, handlers: list):
+        super().__init__()
+        self.handlers = list(handlers)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for h in self.handlers:
+            if record.levelno >= h.level:
+                h.handle(record)
+
+    def close(self) -> None:
+        for h in self.handlers:
+            h.close()
+        super().close()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Escreve o que ainda está na fila e para a thread do listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    *,
+    use_queue: Optional[bool] = None,
+    json_format: Optional[bool] = None,
+    sampling: Optional[Dict[str, float]] = None,
+    handlers: Optional[list] = None,
+) -> None:
+    """
+    (Re)configura o logger "taskmgr"; o que não for passado vem do settings
+    (LOG_LEVEL, LOG_QUEUE, LOG_JSON, LOG_SAMPLING). `handlers` substitui
+    console + arquivo (benchmarks e testes).
+    """
+    global _listener
+    level = settings.LOG_LEVEL if level is None else level
+    use_queue = settings.LOG_QUEUE if use_queue is None else use_queue
+    json_format = settings.LOG_JSON if json_format is None else json_format
+    sampling = settings.LOG_SAMPLING if sampling is None else sampling
+    stop_logging()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    if handlers is None:
+        handlers = [
+            logging.StreamHandler(),
+            RotatingFileHandler(
+                os.path.join(LOG_DIR, "app.log"),
+                maxBytes=2_000_000,
+                backupCount=3,
+                encoding="utf-8",
+            ),
+        ]
+    formatter = (
+        JsonFormatter() if json_format
+        else logging.Formatter(TEXT_FORMAT, defaults={"request_id": NO_REQUEST_ID})
     )
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    for h in handlers:
+        h.setFormatter(formatter)
+
+    if use_queue:
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        front: logging.Handler = _QueueHandler(q)
+        _listener = QueueListener(q, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        front = _FanOutHandler(handlers)
+    # uma vez, no handler de entrada: um único sorteio por registro para todos os destinos
+    front.addFilter(RequestIdFilter())
+    front.addFilter(SamplingFilter(sampling))
+    logger.addHandler(front)
+
+
+configure_logging()
+# sem isso as últimas linhas na fila se perdem quando o processo termina
+atexit.register(stop_logging)
@@ -0,0 +1,172 @@
+# app/core/metrics.py
+"""
+Métricas HTTP em memória, expostas em formato texto do Prometheus
+(GET /api/v1/metrics), sem serviço externo.
+
+MetricsMiddleware (ASGI puro) registra por (método, rota, status):
+- histograma de latência (buckets fixos em BUCKETS);
+- bytes recebidos (Content-Length) e enviados (corpo da resposta);
+e um gauge de requests em andamento. A rota é o template
+("/api/v1/tasks/{task_id}"), não o caminho: a cardinalidade fica limitada
+ao número de rotas; caminhos sem rota entram como "<unmatched>".
+
+Tudo roda na thread do event loop, então não há lock; o custo por request
+é uma busca em dict e alguns incrementos (benchmarks/bench_metrics.py).
+Cada processo tem os seus números: com vários workers, cada scrape vê só
+o worker que o atendeu.
+"""
+import bisect
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# limites superiores (segundos) dos buckets do histograma de latência
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+PREFIX = "taskmgr_http"
+# métodos sem corpo: não vale procurar Content-Length nos headers do request
+_NO_BODY_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class _Series:
+    __slots__ = ("counts", "duration_sum", "request_bytes", "response_bytes")
+
+    def __init__(self, n_buckets: int):
+        # counts[i]: observações no bucket i (não cumulativo); a última posição é +Inf
+        self.counts = [0] * (n_buckets + 1)
+        self.duration_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+class Metrics:
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple[str, str, int], _Series] = {}
+        self.in_flight = 0
+
+    def reset(self) -> None:
+        self.series.clear()
+        self.in_flight = 0
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        key = (method, route, status)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = _Series(len(self.buckets))
+        series.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        series.duration_sum += seconds
+        series.request_bytes += request_bytes
+        series.response_bytes += response_bytes
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)."""
+        lines: List[str] = []
+        name = f"{PREFIX}_request_duration_seconds"
+        lines += [f"# HELP {name} Duração dos requests HTTP.", f"# TYPE {name} histogram"]
+        sizes: List[Tuple[str, int, int, int]] = []
+        for (method, route, status), s in sorted(self.series.items()):
+            labels = f'method="{_escape(method)}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, s.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{_format_float(bound)}"}} {cumulative}')
+            total = cumulative + s.counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_float(s.duration_sum)}")
+            lines.append(f"{name}_count{{{labels}}} {total}")
+            sizes.append((labels, total, s.request_bytes, s.response_bytes))
+
+        for kind, index, help_text in (
+            ("request", 2, "Bytes recebidos no corpo dos requests (Content-Length)."),
+            ("response", 3, "Bytes enviados no corpo das respostas."),
+        ):
+            name = f"{PREFIX}_{kind}_size_bytes"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+            for entry in sizes:
+                labels, total = entry[0], entry[1]
+                lines.append(f"{name}_sum{{{labels}}} {entry[index]}")
+                lines.append(f"{name}_count{{{labels}}} {total}")
+
+        name = f"{PREFIX}_requests_in_flight"
+        lines += [
+            f"# HELP {name} Requests HTTP em andamento.",
+            f"# TYPE {name} gauge",
+            f"{name} {self.in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# registro do processo (MetricsMiddleware e a rota /metrics)
+metrics = Metrics()
+
+
+def _content_length(headers) -> int:
+    for name, value in headers:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return 0
+    return 0
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry
+        start = perf_counter()
+        registry.in_flight += 1
+        # status, bytes do corpo enviados, headers da resposta
+        state = [500, 0, None]
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.body":
+                state[1] += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                state[0] = message["status"]
+                state[2] = message.get("headers")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            registry.in_flight -= 1
+            method = scope["method"]
+            sent = state[1]
+            if not sent and state[2] and method != "HEAD":
+                # envio sem cópia (zerocopysend/pathsend) não passa o corpo por aqui
+                sent = _content_length(state[2])
+            # o router do FastAPI deixa a rota encontrada no scope
+            route = scope.get("route")
+            registry.observe(
+                method,
+                route.path if route is not None else UNMATCHED_ROUTE,
+                state[0],
+                perf_counter() - start,
+                0 if method in _NO_BODY_METHODS else _content_length(scope["headers"]),
+                sent,
+            )
@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, Optional, Tuple
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(order_by: Optional[str], key: Any, last_id: int) -> str:
+    """
+    Gera um cursor opaco para paginação keyset.
+
+    O cursor guarda a ordenação usada, o valor da coluna de ordenação e o id
+    da última task da página (desempate).
+    """
+    if isinstance(key, date):
+        key = key.isoformat()
+    raw = json.dumps({"o": order_by, "k": key, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Optional[str]) -> Tuple[Any, int]:
+    """Decodifica um cursor gerado por encode_cursor, validando a ordenação."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, last_id = data["k"], int(data["id"])
+        cursor_order = data["o"]
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeError):
+        raise ValidationError("invalid_cursor", "Cursor de paginação inválido.")
+
+    if cursor_order != order_by:
+        raise ValidationError(
+            "invalid_cursor",
+            "Cursor de paginação gerado para outra ordenação.",
+        )
+    return key, last_id
@@ -0,0 +1,163 @@
+# app/core/query_stats.py
+"""
+Instrumentação das consultas SQL (eventos do engine do SQLAlchemy).
+
+instrument_engine(engine) mede cada execução de cursor e:
+- soma quantidade e tempo no QueryStats do request corrente (ContextVar
+  preenchida pelo QueryStatsMiddleware). Rotas síncronas (threadpool) e
+  jobs do escritor (app.models.sqlite_writer) rodam com uma cópia do
+  contexto do request, então as consultas deles também contam;
+- manda para o log "taskmgr.sql" as consultas acima de SQL_SLOW_QUERY_MS,
+  com parâmetros e o EXPLAIN QUERY PLAN (SQLite/pysqlite).
+
+Com DEBUG=true as respostas saem com X-DB-Query-Count e X-DB-Query-Time-Ms
+(consultas até o início da resposta). N+1 aparece como contagem que cresce
+com o tamanho da página; os testes travam isso com a fixture query_budget
+(requests) ou com track_queries (chamadas diretas, também guardando o SQL).
+"""
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger("sql")
+
+QUERY_COUNT_HEADER = "x-db-query-count"
+QUERY_TIME_HEADER = "x-db-query-time-ms"
+# chave em Connection.info: início da execução corrente
+_START_KEY = "query_stats_start"
+# comandos que aceitam EXPLAIN QUERY PLAN (BEGIN, PRAGMA, SAVEPOINT... não)
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with", "replace")
+# tamanho máximo do repr dos parâmetros no log
+_MAX_PARAMS_REPR = 500
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        # (statement, parâmetros) de cada execução; só quando pedido (testes)
+        self.statements: Optional[List[Tuple[str, Any]]] = [] if record_statements else None
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """
+    Conta as consultas feitas dentro do bloco (neste contexto), em engines
+    instrumentados; com record_statements, guarda também o SQL executado.
+    """
+    stats = QueryStats(record_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def explain_query_plan(conn: Connection, statement: str, parameters) -> Optional[List[str]]:
+    """
+    Linhas do EXPLAIN QUERY PLAN de `statement` (indentadas pela árvore do
+    plano), ou None se o banco/driver não permite. Roda num cursor à parte
+    da conexão DBAPI, sem disparar eventos nem mexer no cursor original.
+    """
+    if conn.dialect.name != "sqlite" or conn.dialect.driver != "pysqlite":
+        return None
+    if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+    try:
+        rows = conn.connection.driver_connection.execute(
+            "EXPLAIN QUERY PLAN " + statement, parameters or ()
+        ).fetchall()
+    except Exception as exc:  # plano é só diagnóstico
+        return [f"(EXPLAIN falhou: {exc})"]
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # uma execução por vez em cada conexão: não precisa de pilha
+    conn.info[_START_KEY] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info.pop(_START_KEY, perf_counter())
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((statement, parameters))
+    threshold = settings.SQL_SLOW_QUERY_MS
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        plan = None if executemany else explain_query_plan(conn, statement, parameters)
+        params = repr(parameters)
+        if len(params) > _MAX_PARAMS_REPR:
+            params = params[:_MAX_PARAMS_REPR] + "..."
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s | parâmetros: %s%s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            params,
+            "\nplano:\n" + "\n".join(plan) if plan else "",
+        )
+
+
+_instrumented: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Liga a contagem/tempo de consultas e o log de lentas em `engine` (sync ou async)."""
+    target = getattr(engine, "sync_engine", engine)
+    if target not in _instrumented:
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        _instrumented.add(target)
+    return engine
+
+
+def is_instrumented(engine: Engine) -> bool:
+    return getattr(engine, "sync_engine", engine) in _instrumented
+
+
+class QueryStatsMiddleware:
+    """QueryStats por request; com DEBUG, os totais vão nos headers da resposta."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+                headers[QUERY_TIME_HEADER] = f"{stats.seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,53 @@
+# app/core/request_context.py
+"""
+Id do request corrente, para correlacionar as linhas de log de um request.
+
+RequestIdMiddleware (ASGI puro, sem BaseHTTPMiddleware) usa o X-Request-ID
+recebido — se for um id razoável — ou gera um novo, guarda-o numa
+ContextVar e devolve-o no header X-Request-ID da resposta. As rotas
+síncronas rodam no threadpool com uma cópia do contexto, então o id também
+chega aos logs de serviços e repositórios.
+"""
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "x-request-id"
+# ids vindos do cliente/proxy: curtos e sem caracteres que quebrem o log
+_VALID_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def _incoming_id(scope: Scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER.encode():
+            candidate = value.decode("latin-1")
+            return candidate if _VALID_ID.fullmatch(candidate) else None
+    return None
+
+
+class RequestIdMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = _incoming_id(scope) or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            request_id_var.reset(token)
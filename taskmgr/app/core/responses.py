@@ -0,0 +1,78 @@
+# app/core/responses.py
+"""
+Serialização rápida das listagens de tasks.
+
+O caminho padrão do FastAPI monta um TaskOut (pydantic) por linha, passa a
+lista inteira pelo jsonable_encoder e só então gera o JSON. Para listas
+grandes isso custa mais do que a própria consulta. Aqui as linhas já chegam
+como tuplas de colunas e o JSON é gerado direto em bytes (orjson, se
+instalado; senão o módulo json da biblioteca padrão, no mesmo formato do
+JSONResponse).
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from starlette.responses import Response
+
+try:  # dependência opcional
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Campos de TaskOut, na mesma ordem das colunas de TASK_ROW_COLUMNS (+ tags)
+TASK_OUT_FIELDS = (
+    "id", "title", "description", "status", "priority",
+    "due_date", "project_id", "assignee_id",
+)
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+def _default(value: Any):
+    # date/datetime -> ISO 8601, como o jsonable_encoder faria
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Objeto do tipo {type(value).__name__} não é serializável em JSON")
+
+
+def task_items(rows: Iterable[tuple], tag_names: Dict[int, List[str]]) -> List[dict]:
+    """Monta os dicts no formato de TaskOut a partir das tuplas de colunas."""
+    fields = TASK_OUT_FIELDS
+    items = []
+    for row in rows:
+        item = dict(zip(fields, row))
+        item["tags"] = tag_names.get(row[0], [])
+        items.append(item)
+    return items
+
+
+def encode_task_list(rows: Iterable[tuple], tag_names: Dict[int, List[str]]) -> bytes:
+    return dumps(task_items(rows, tag_names))
+
+
+def encode_task_page(
+    rows: Iterable[tuple],
+    tag_names: Dict[int, List[str]],
+    next_cursor: Optional[str],
+) -> bytes:
+    return dumps({"items": task_items(rows, tag_names), "next_cursor": next_cursor})
+
+
+class RawJSONResponse(Response):
+    """Resposta JSON cujo conteúdo já vem serializado em bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
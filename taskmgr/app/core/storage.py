@@ -0,0 +1,98 @@
+# app/core/storage.py
+"""
+Armazenamento dos anexos endereçado pelo conteúdo.
+
+Cada arquivo é guardado uma única vez, pelo SHA-256 do conteúdo, em
+diretórios aninhados pelos primeiros caracteres do hash:
+
+    FILE_STORAGE_DIR/ab/cd/abcd1234...
+
+Dois níveis de 256 diretórios mantêm cada diretório pequeno mesmo com
+milhões de arquivos (um diretório plano fica lento bem antes disso), nomes
+iguais nunca se sobrescrevem e uploads idênticos viram o mesmo arquivo. As
+linhas de Attachment com o mesmo sha256 são as referências ao arquivo: ele
+só é apagado quando a última delas sai (AttachmentService.delete).
+"""
+import hashlib
+import os
+import shutil
+from typing import Tuple
+
+# dois níveis de dois caracteres hex: 65536 diretórios-folha
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+# uploads em andamento (mesmo sistema de arquivos: os.replace é atômico)
+TMP_DIR = ".tmp"
+# arquivos derivados (miniatura do pós-processamento) ficam ao lado do conteúdo
+THUMBNAIL_SUFFIX = ".thumb.png"
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """(sha256 hex, tamanho) de um arquivo, lido em pedaços."""
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+            size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+class BlobStore:
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(self.root, TMP_DIR)
+
+    def path_for(self, sha256: str) -> str:
+        shards = [sha256[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+        return os.path.join(self.root, *shards, sha256)
+
+    def thumbnail_path(self, sha256: str) -> str:
+        return self.path_for(sha256) + THUMBNAIL_SUFFIX
+
+    def contains_path(self, path: str) -> bool:
+        """`path` já está no layout do store (nome = hash, nos diretórios do hash)?"""
+        path = os.path.abspath(path)
+        return path == self.path_for(os.path.basename(path))
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path_for(sha256))
+
+    def put(self, src: str, sha256: str) -> Tuple[str, bool]:
+        """
+        Move `src` (temporário com o conteúdo de hash `sha256`) para o
+        store. Se o conteúdo já existe, `src` é descartado. Devolve
+        (caminho, criado).
+        """
+        dest = self.path_for(sha256)
+        if os.path.exists(dest):
+            os.unlink(src)
+            return dest, False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(src, dest)
+        return dest, True
+
+    def link(self, src: str, sha256: str) -> str:
+        """
+        Coloca no store uma cópia de `src` sem removê-lo (hard link quando
+        possível; senão cópia). Usado na migração do layout antigo.
+        """
+        dest = self.path_for(sha256)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.makedirs(self.tmp_dir, exist_ok=True)
+            tmp = os.path.join(self.tmp_dir, f"{sha256}.{os.getpid()}")
+            try:
+                os.link(src, tmp)
+            except OSError:
+                shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+        return dest
+
+    def delete(self, sha256: str) -> None:
+        """Apaga o conteúdo e o que foi derivado dele."""
+        for path in (self.path_for(sha256), self.thumbnail_path(sha256)):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
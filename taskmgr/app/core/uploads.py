@@ -0,0 +1,178 @@
+# app/core/uploads.py
+"""
+Upload multipart lido em streaming.
+
+Com `UploadFile`, o corpo inteiro é lido (e copiado para um arquivo
+temporário do Starlette) antes de a rota rodar, e `await file.read()` ainda
+traz o arquivo todo para a memória. Aqui o corpo do request é consumido em
+pedaços direto para um arquivo temporário no diretório de destino:
+
+- a memória por upload fica limitada a UPLOAD_CHUNK_SIZE;
+- escrita e SHA-256 de cada pedaço rodam no threadpool, fora do event loop;
+- um Content-Length acima de MAX_UPLOAD_BYTES é recusado (413) antes de ler
+  o corpo; sem Content-Length, o limite é conferido durante a leitura;
+- o temporário fica no mesmo sistema de arquivos do destino, então quem
+  chama pode movê-lo para o lugar final com os.replace (atômico).
+"""
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, NamedTuple, Optional
+
+import multipart
+from multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.exceptions import PayloadTooLargeError, ValidationError
+
+# folga para cabeçalhos e boundaries do multipart na checagem do Content-Length
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class StoredUpload(NamedTuple):
+    """Arquivo recebido: temporário em `path`, ainda por mover para o destino."""
+    path: str
+    filename: str
+    content_type: Optional[str]
+    size: int
+    sha256: str
+
+
+def safe_filename(name: Optional[str], default: str = "upload") -> str:
+    """Só o nome-base do arquivo enviado (sem diretórios, `..` ou NUL)."""
+    name = (name or "").replace("\x00", "").replace("\\", "/")
+    name = name.rsplit("/", 1)[-1].strip()
+    return default if name in ("", ".", "..") else name
+
+
+def _too_large(max_bytes: int) -> PayloadTooLargeError:
+    return PayloadTooLargeError(
+        "upload_too_large", f"Arquivo maior que o limite de {max_bytes} bytes."
+    )
+
+
+def check_content_length(request: Request, max_bytes: int) -> None:
+    """413 antes de ler o corpo, se o Content-Length já passa do limite."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes + MULTIPART_OVERHEAD:
+        raise _too_large(max_bytes)
+
+
+def _write_chunk(f: BinaryIO, hasher, data: bytes) -> None:
+    f.write(data)
+    hasher.update(data)
+
+
+def _discard(f: BinaryIO) -> None:
+    f.close()
+    os.unlink(f.name)
+
+
+class _FilePart:
+    """Estado do parser: cabeçalhos da parte atual e bytes ainda não escritos."""
+
+    def __init__(self, field: str, max_bytes: int):
+        self.field = field
+        self.max_bytes = max_bytes
+        self.header_field = b""
+        self.header_value = b""
+        self.headers = {}
+        self.receiving = False
+        self.found = False
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.pending = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        # só a primeira parte `field` que traz um arquivo; o resto é ignorado
+        self.receiving = not self.found and name == self.field and b"filename" in options
+        if self.receiving:
+            self.found = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            content_type = self.headers.get(b"content-type")
+            self.content_type = content_type.decode("latin-1") if content_type else None
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.receiving:
+            self.size += end - start
+            if self.size > self.max_bytes:
+                raise _too_large(self.max_bytes)
+            self.pending += data[start:end]
+
+    def on_part_end(self) -> None:
+        self.receiving = False
+
+
+async def receive_upload(
+    request: Request,
+    directory: str,
+    *,
+    field: str = "file",
+    max_bytes: int,
+    chunk_size: int,
+) -> StoredUpload:
+    """
+    Lê o arquivo do campo `field` de um corpo multipart/form-data para um
+    temporário em `directory`. Levanta PayloadTooLargeError (413) acima de
+    `max_bytes` e ValidationError se o corpo não trouxer o arquivo; em caso
+    de erro o temporário é apagado.
+    """
+    check_content_length(request, max_bytes)
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise ValidationError(
+            "invalid_upload", f"Envie o arquivo como multipart/form-data (campo '{field}')."
+        )
+
+    part = _FilePart(field, max_bytes)
+    parser = multipart.MultipartParser(options[b"boundary"], part.callbacks())
+    hasher = hashlib.sha256()
+    os.makedirs(directory, exist_ok=True)
+    f = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, dir=directory, prefix=".upload-", delete=False
+    )
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if len(part.pending) >= chunk_size:
+                data, part.pending = bytes(part.pending), bytearray()
+                await run_in_threadpool(_write_chunk, f, hasher, data)
+        parser.finalize()
+        if not part.found:
+            raise ValidationError("missing_file", f"Campo '{field}' com o arquivo não enviado.")
+        if part.pending:
+            await run_in_threadpool(_write_chunk, f, hasher, bytes(part.pending))
+        await run_in_threadpool(f.close)
+    except BaseException:
+        await run_in_threadpool(_discard, f)
+        raise
+    return StoredUpload(f.name, safe_filename(part.filename), part.content_type, part.size, hasher.hexdigest())
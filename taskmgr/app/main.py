@@ -1,25 +1,69 @@
 from fastapi import FastAPI
-from app.models.db import create_db_and_tables
-from app.api.v1 import health, users, projects, tasks, tags, attachments
+from sqlmodel import Session
+from app.core.config import settings
+from app.models.db import create_db_and_tables, engine, get_async_engine
+from app.models.sqlite_writer import stop_writers
+from app.repositories.tag_repo import TagRepo
+from app.services.attachment_jobs import start_job_runner, stop_job_runner
+from app.api.v1 import (
+    health, users, projects, projects_async, tasks, tasks_async, tags, attachments, metrics,
+)
 from app.core.logging_config import logger  # 👈 novo import
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.request_context import RequestIdMiddleware
 
-app = FastAPI(title="Task Manager API")
 
-
-@app.on_event("startup")
 def on_startup():
     logger.info("API iniciada (startup)")  # 👈 log de inicialização
     create_db_and_tables()
+    # aquece o dicionário de tags do processo (filtros e nomes sem join)
+    with Session(engine) as session:
+        snapshot = TagRepo(session).dictionary()
+    logger.info("Dicionário de tags carregado: %s tags", len(snapshot.names_by_id))
+    # pós-processamento dos anexos em processos separados; retoma a fila persistida
+    start_job_runner(engine)
 
 
-@app.on_event("shutdown")
 def on_shutdown():
     logger.info("API finalizada (shutdown)")  # 👈 log ao encerrar
+    # termina os jobs em andamento (eles gravam pelo escritor) antes de parar o escritor
+    stop_job_runner()
+    # confirma as escritas ainda na fila e fecha as conexões de escrita
+    stop_writers()
+
+
+async def dispose_async_engine():
+    await get_async_engine().dispose()
+
+
+def create_app(async_db: bool = settings.ASYNC_DB) -> FastAPI:
+    """
+    Monta a aplicação. Com async_db (Settings.ASYNC_DB) as rotas de tasks e
+    projetos são as versões `async def` sobre AsyncSession.
+    """
+    app = FastAPI(title="Task Manager API")
+    # id do request nos logs (LOG_JSON) e no header X-Request-ID
+    app.add_middleware(RequestIdMiddleware)
+    # consultas SQL por request (headers X-DB-Query-* com DEBUG)
+    app.add_middleware(QueryStatsMiddleware)
+    if settings.METRICS_ENABLED:
+        # latência/tamanhos por rota em GET /api/v1/metrics
+        app.add_middleware(MetricsMiddleware)
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
+    if async_db:
+        app.add_event_handler("shutdown", dispose_async_engine)
+        logger.info("Rotas de tasks/projetos no modo assíncrono (ASYNC_DB)")
+
+    app.include_router(health.router, prefix="/api/v1")
+    app.include_router(metrics.router, prefix="/api/v1")
+    app.include_router(users.router, prefix="/api/v1")
+    app.include_router((projects_async if async_db else projects).router, prefix="/api/v1")
+    app.include_router((tasks_async if async_db else tasks).router, prefix="/api/v1")
+    app.include_router(tags.router, prefix="/api/v1")
+    app.include_router(attachments.router, prefix="/api/v1")
+    return app
 
 
-app.include_router(health.router, prefix="/api/v1")
-app.include_router(users.router, prefix="/api/v1")
-app.include_router(projects.router, prefix="/api/v1")
-app.include_router(tasks.router, prefix="/api/v1")
-app.include_router(tags.router, prefix="/api/v1")
-app.include_router(attachments.router, prefix="/api/v1")
+app = create_app()
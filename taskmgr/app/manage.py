@@ -0,0 +1,108 @@
+# app/manage.py
+"""
+Comandos de manutenção do banco.
+
+Uso:
+    python -m app.manage migrate
+    python -m app.manage rebuild-search-index
+    python -m app.manage rebuild-stats [--project-id ID]
+    python -m app.manage migrate-attachments
+    python -m app.manage process-attachments
+"""
+import argparse
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.models import migrations
+from app.models.db import create_db_and_tables, engine
+from app.models.search import rebuild_search_index
+from app.repositories.attachment_repo import AttachmentRepo
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+from app.repositories.attachment_job_repo import AttachmentJobRepo
+from app.services.attachment_jobs import AttachmentJobRunner
+from app.services.attachment_service import AttachmentService
+
+
+def cmd_migrate(args) -> None:
+    create_db_and_tables()
+    with engine.connect() as conn:
+        version = migrations.current_version(conn)
+    logger.info("Schema na versão %s (última: %s)", version, migrations.LATEST_VERSION)
+
+
+def cmd_rebuild_search_index(args) -> None:
+    create_db_and_tables()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    logger.info("Índice de busca textual (task_fts) reconstruído")
+
+
+def cmd_rebuild_stats(args) -> None:
+    create_db_and_tables()
+    with Session(engine) as session:
+        ProjectRepo(session).rebuild_stats(args.project_id)
+        TaskRepo(session).rebuild_open_counts()
+    logger.info(
+        "Contadores project_stats (project_id=%s) e user_task_stats recalculados",
+        args.project_id,
+    )
+
+
+def cmd_migrate_attachments(args) -> None:
+    create_db_and_tables()
+    with Session(engine) as session:
+        counts = AttachmentService(AttachmentRepo(session)).migrate_storage()
+    logger.info(
+        "Anexos no armazenamento por conteúdo: %(migrated)s migrados "
+        "(%(deduplicated)s repetidos), %(missing)s sem arquivo",
+        counts,
+    )
+
+
+def cmd_process_attachments(args) -> None:
+    create_db_and_tables()
+    runner = AttachmentJobRunner(
+        engine,
+        max_workers=max(settings.ATTACHMENT_WORKERS, 1),
+        max_attempts=settings.ATTACHMENT_JOB_MAX_ATTEMPTS,
+    )
+    with Session(engine) as session:
+        AttachmentJobRepo(session).requeue_running()
+    try:
+        processed = runner.run_until_idle()
+    finally:
+        runner.stop()
+    with Session(engine) as session:
+        counts = AttachmentJobRepo(session).count_by_status()
+    logger.info("Pós-processamento de anexos: %s jobs rodados; fila: %s", processed, counts)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("migrate", help="cria tabelas e aplica migrações pendentes")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("rebuild-search-index", help="reconstrói o índice FTS5 das tasks")
+    p.set_defaults(func=cmd_rebuild_search_index)
+
+    p = sub.add_parser("rebuild-stats", help="recalcula os contadores de tasks (por projeto e abertas por usuário)")
+    p.add_argument("--project-id", type=int, default=None)
+    p.set_defaults(func=cmd_rebuild_stats)
+
+    p = sub.add_parser("migrate-attachments", help="move anexos antigos para o armazenamento por conteúdo (sha256)")
+    p.set_defaults(func=cmd_migrate_attachments)
+
+    p = sub.add_parser("process-attachments", help="roda a fila de pós-processamento de anexos até esvaziar (com a API parada)")
+    p.set_defaults(func=cmd_process_attachments)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,68 @@
 import os
+from functools import lru_cache
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel, create_engine, Session
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.models import migrations
+from app.models.sqlite_writer import configure_sqlite
 
 # Garante que a pasta de dados exista
 os.makedirs("./data", exist_ok=True)
 
-# Engine único da aplicação
-engine = create_engine(settings.DATABASE_URL, echo=False)
+# Engine único da aplicação (WAL: as leituras não esperam pelo escritor);
+# consultas contadas por request e lentas no log (app/core/query_stats.py)
+engine = instrument_engine(configure_sqlite(create_engine(settings.DATABASE_URL, echo=False)))
+
+# Drivers assíncronos equivalentes aos síncronos de DATABASE_URL
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """URL síncrona -> mesma base com o driver assíncrono (ex.: aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Sem driver assíncrono configurado para {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """
+    Engine assíncrono para a URL síncrona `url`.
+
+    O dialeto aiosqlite usa NullPool por padrão: cada request abriria uma
+    conexão (e uma thread) nova. Aqui as conexões ficam num pool fixo de
+    ASYNC_DB_POOL_SIZE; o engine precisa de dispose() no mesmo event loop
+    (as threads das conexões seguram o processo aberto).
+    """
+    return instrument_engine(create_async_engine(
+        async_database_url(url),
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=0,
+    ))
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine assíncrono sobre o mesmo banco de `engine`, criado no primeiro
+    uso (só quem liga ASYNC_DB precisa do aiosqlite instalado).
+    """
+    return create_async_db_engine(settings.DATABASE_URL)
 
 
 def create_db_and_tables():
-    """Cria todas as tabelas mapeadas pelo SQLModel."""
+    """
+    Cria todas as tabelas mapeadas pelo SQLModel e aplica as migrações
+    pendentes (índices, busca textual) em bancos já existentes.
+    """
     SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
 
 
 def get_session():
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import datetime, date
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 class User(SQLModel, table=True):
@@ -15,26 +16,77 @@ class Project(SQLModel, table=True):
     description: str = ""
 
 class Task(SQLModel, table=True):
+    __table_args__ = (
+        # tarefas abertas por responsável (count_open_by_user, filtros da listagem)
+        Index("ix_task_assignee_status", "assignee_id", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: str = ""
     status: str = "OPEN"   # OPEN, IN_PROGRESS, DONE
     priority: int = 3      # 1..5
     due_date: Optional[date] = None
-    project_id: int = Field(foreign_key="project.id")
+    project_id: int = Field(foreign_key="project.id", index=True)
     assignee_id: Optional[int] = Field(default=None, foreign_key="user.id")
 
 class Tag(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(index=True)
 
 class TaskTagLink(SQLModel, table=True):
     task_id: Optional[int] = Field(default=None, foreign_key="task.id", primary_key=True)
-    tag_id: Optional[int] = Field(default=None, foreign_key="tag.id", primary_key=True)
+    tag_id: Optional[int] = Field(default=None, foreign_key="tag.id", primary_key=True, index=True)
+
+class ProjectStats(SQLModel, table=True):
+    """Contador de tasks por projeto e status (mantido pelo TaskRepo)."""
+    __tablename__ = "project_stats"
+
+    project_id: int = Field(foreign_key="project.id", primary_key=True)
+    status: str = Field(primary_key=True)
+    task_count: int = 0
+
+class UserTaskStats(SQLModel, table=True):
+    """Contador de tasks abertas (status != DONE) por responsável."""
+    __tablename__ = "user_task_stats"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    open_count: int = 0
+
+class ChangeVersion(SQLModel, table=True):
+    """Versão de mudança por escopo (ex.: "tag"), para invalidar caches."""
+    __tablename__ = "change_version"
+
+    scope: str = Field(primary_key=True)
+    version: int = 0
 
 class Attachment(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    task_id: int = Field(foreign_key="task.id")
+    task_id: int = Field(foreign_key="task.id", index=True)
     filename: str
     filepath: str
+    size: Optional[int] = None      # bytes; None em anexos anteriores à migração 6
+    sha256: Optional[str] = Field(default=None, index=True)  # hex do conteúdo (chave no store)
+    content_type: Optional[str] = None
+    # pós-processamento (fila attachment_job): pending, processing, done, failed
+    processing_status: Optional[str] = None
+    mime_type: Optional[str] = None         # detectado pelo conteúdo
+    preview: Optional[str] = None           # início do texto, para arquivos de texto
+    thumbnail_path: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AttachmentJob(SQLModel, table=True):
+    """Pós-processamento pendente de um anexo (fila persistida, ver AttachmentJobRunner)."""
+    __tablename__ = "attachment_job"
+    __table_args__ = (
+        # próximos jobs a pegar: WHERE status = 'pending' ORDER BY id
+        Index("ix_attachment_job_status", "status", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    attachment_id: int = Field(foreign_key="attachment.id")
+    status: str = "pending"   # pending, running, done, failed
+    attempts: int = 0
+    error: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
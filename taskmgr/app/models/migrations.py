@@ -0,0 +1,148 @@
+# app/models/migrations.py
+"""
+Migrações versionadas do schema (SQLite).
+
+`create_all` só cria tabelas que ainda não existem: índices, colunas ou
+tabelas virtuais novas nunca chegam a um banco que já está em uso. Cada
+migração abaixo leva o banco de uma versão para a seguinte; a versão atual
+fica em `PRAGMA user_version`. As migrações são idempotentes, então também
+rodam sem efeito em bancos recém-criados pelo `create_all`.
+"""
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from app.core.logging_config import logger
+from app.models import search, versions
+
+
+def _create_indexes(conn: Connection, *names: str) -> None:
+    """Cria (se faltarem) índices declarados nos modelos, pelo nome."""
+    wanted = set(names)
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in wanted:
+                index.create(conn, checkfirst=True)
+                wanted.discard(index.name)
+    if wanted:
+        raise RuntimeError(f"Índices não declarados nos modelos: {sorted(wanted)}")
+
+
+def _add_columns(conn: Connection, table: str, columns: List[Tuple[str, str]]) -> None:
+    """ALTER TABLE ADD COLUMN das colunas (nome, tipo) que a tabela ainda não tem."""
+    existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+    for name, ddl_type in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}"))
+
+
+def _m001_search_index(conn: Connection) -> None:
+    search.ensure_search_index(conn)
+
+
+def _m002_filter_indexes(conn: Connection) -> None:
+    _create_indexes(
+        conn,
+        "ix_task_project_id",
+        "ix_task_assignee_status",
+        "ix_tag_name",
+        "ix_tasktaglink_tag_id",
+        "ix_attachment_task_id",
+    )
+    conn.execute(text("ANALYZE"))
+
+
+def _m003_project_stats(conn: Connection) -> None:
+    # a tabela project_stats já foi criada pelo create_all; aqui só o backfill
+    conn.execute(text("DELETE FROM project_stats"))
+    conn.execute(text(
+        "INSERT INTO project_stats (project_id, status, task_count) "
+        "SELECT project_id, status, count(*) FROM task GROUP BY project_id, status"
+    ))
+
+
+def _m004_user_open_counts(conn: Connection) -> None:
+    conn.execute(text("DELETE FROM user_task_stats"))
+    conn.execute(text(
+        "INSERT INTO user_task_stats (user_id, open_count) "
+        "SELECT assignee_id, count(*) FROM task "
+        "WHERE assignee_id IS NOT NULL AND status != 'DONE' GROUP BY assignee_id"
+    ))
+
+
+def _m005_change_versions(conn: Connection) -> None:
+    # change_version vem do create_all; faltam os triggers e a versão inicial
+    versions.ensure_version_triggers(conn)
+    versions.bump_version(conn, versions.TAG_SCOPE)
+
+
+def _m006_attachment_checksums(conn: Connection) -> None:
+    # anexos antigos ficam com NULL: tamanho e hash só existem para uploads novos
+    _add_columns(
+        conn,
+        "attachment",
+        [("size", "INTEGER"), ("sha256", "VARCHAR"), ("content_type", "VARCHAR")],
+    )
+
+
+def _m007_attachment_sha256_index(conn: Connection) -> None:
+    # contagem de referências a um arquivo do store (AttachmentRepo.count_by_sha256)
+    _create_indexes(conn, "ix_attachment_sha256")
+
+
+def _m008_attachment_processing(conn: Connection) -> None:
+    SQLModel.metadata.tables["attachment_job"].create(conn, checkfirst=True)
+    _add_columns(
+        conn,
+        "attachment",
+        [
+            ("processing_status", "VARCHAR"),
+            ("mime_type", "VARCHAR"),
+            ("preview", "VARCHAR"),
+            ("thumbnail_path", "VARCHAR"),
+        ],
+    )
+    _create_indexes(conn, "ix_attachment_job_status")
+
+
+# (versão, descrição, função) — sempre em ordem crescente; nunca reordenar.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "índice de busca textual task_fts", _m001_search_index),
+    (2, "índices secundários das colunas de filtro", _m002_filter_indexes),
+    (3, "contadores de tasks por projeto/status (project_stats)", _m003_project_stats),
+    (4, "contadores de tasks abertas por usuário (user_task_stats)", _m004_user_open_counts),
+    (5, "versões de mudança (change_version) e triggers da tabela tag", _m005_change_versions),
+    (6, "tamanho, sha256 e content-type dos anexos", _m006_attachment_checksums),
+    (7, "índice de attachment.sha256 (referências do armazenamento por conteúdo)", _m007_attachment_sha256_index),
+    (8, "pós-processamento de anexos (attachment_job e status)", _m008_attachment_processing),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar_one()
+
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Aplica as migrações pendentes, cada uma na sua própria transação.
+
+    Retorna as versões aplicadas (lista vazia se o banco já estava em dia).
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+
+    applied = []
+    for version, description, func in MIGRATIONS:
+        with engine.begin() as conn:
+            if current_version(conn) >= version:
+                continue
+            logger.info("Aplicando migração %s: %s", version, description)
+            func(conn)
+            # PRAGMA não aceita parâmetro; version é sempre um int da lista acima
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+        applied.append(version)
+    return applied
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Optional, List
-from datetime import date
-from pydantic import BaseModel, field_validator
+from typing import Literal, Optional, List, Union
+from datetime import date, datetime
+from pydantic import BaseModel, field_validator, model_validator
 
 class UserIn(BaseModel):
     name: str
@@ -45,6 +45,64 @@ class TaskOut(BaseModel):
     assignee_id: Optional[int]
     tags: List[str] = []
 
+class TaskPage(BaseModel):
+    items: List[TaskOut]
+    next_cursor: Optional[str] = None
+
+class BulkItemError(BaseModel):
+    code: str
+    message: str
+
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[BulkItemError] = None
+
+class BulkTaskResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+class TaskFilter(BaseModel):
+    status: Optional[str] = None
+    project_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    tag: Optional[Union[str, List[str]]] = None
+    tag_mode: Literal["any", "all"] = "any"
+    q: Optional[str] = None
+
+    def has_criteria(self) -> bool:
+        """tag_mode sozinho não restringe nada."""
+        return any((
+            self.status, self.project_id is not None, self.assignee_id is not None, self.tag, self.q,
+        ))
+
+class BulkStatusIn(BaseModel):
+    new_status: str
+    ids: Optional[List[int]] = None
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("informe exatamente um entre 'ids' e 'filter'")
+        if self.filter is not None and not self.filter.has_criteria():
+            # filtro vazio alteraria todas as tasks do banco
+            raise ValueError("'filter' precisa de pelo menos um critério")
+        return self
+
+class BulkStatusItem(BaseModel):
+    id: int
+    ok: bool
+    status: Optional[str] = None
+    error: Optional[BulkItemError] = None
+
+class BulkStatusResult(BaseModel):
+    updated: int
+    failed: int
+    results: List[BulkStatusItem]
+
 class TagIn(BaseModel):
     name: str
 
@@ -56,3 +114,11 @@ class AttachmentOut(BaseModel):
     task_id: int
     filename: str
     filepath: str
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
+    processing_status: Optional[str] = None
+    mime_type: Optional[str] = None
+    preview: Optional[str] = None
+    thumbnail_path: Optional[str] = None
+    created_at: Optional[datetime] = None
@@ -0,0 +1,104 @@
+# app/models/search.py
+"""
+Índice de busca textual (SQLite FTS5) sobre título e descrição das tasks.
+
+A tabela virtual `task_fts` usa a própria tabela `task` como conteúdo
+(external content) e é mantida em sincronia por triggers. Em bancos novos
+ela é criada junto com a tabela `task` (evento after_create); em bancos
+já existentes, `ensure_search_index` cria e popula o índice.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, Column, Float, Integer, MetaData, String, Table, event, text
+from sqlalchemy.engine import Connection
+
+from app.models.entities import Task
+
+# Metadata separado: o create_all do SQLModel não deve tentar criar a tabela virtual.
+task_fts = Table(
+    "task_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", String),
+    Column("description", String),
+    # coluna oculta do FTS5 com o score bm25 (menor = mais relevante)
+    Column("rank", Float),
+)
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS task_fts
+    USING fts5(title, description, content='task', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for _ddl in SEARCH_INDEX_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS task_fts").execute_if(dialect="sqlite"),
+)
+
+
+def has_search_index(conn: Connection) -> bool:
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_fts'")
+    ).first()
+    return row is not None
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    """Reconstrói o índice inteiro a partir da tabela `task`."""
+    conn.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+
+
+def ensure_search_index(conn: Connection) -> bool:
+    """
+    Garante que o índice e os triggers existam (bancos criados antes do FTS).
+
+    Retorna True se o índice precisou ser criado (e, portanto, populado).
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    created = not has_search_index(conn)
+    for ddl in SEARCH_INDEX_DDL:
+        conn.execute(text(ddl))
+    if created:
+        rebuild_search_index(conn)
+    return created
+
+
+def fts_match_query(q: str) -> Optional[str]:
+    """
+    Converte o texto livre do filtro `q` numa expressão MATCH segura.
+
+    Cada palavra vira um termo entre aspas com busca por prefixo
+    ("relat" encontra "relatório"); todos os termos precisam aparecer.
+    Retorna None se `q` não tiver nenhuma palavra.
+    """
+    terms = re.findall(r"\w+", q, flags=re.UNICODE)
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
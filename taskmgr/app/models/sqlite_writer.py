@@ -0,0 +1,243 @@
+# app/models/sqlite_writer.py
+"""
+Escrita serializada no SQLite: um único escritor por banco.
+
+O SQLite aceita uma transação de escrita por vez; com várias threads do
+threadpool (e vários workers) escrevendo ao mesmo tempo, as demais ficam em
+busy-wait e, passado o timeout, falham com "database is locked". Aqui as
+escritas dos requests viram jobs numa fila consumida por uma thread
+dedicada, dona da única conexão de escrita:
+
+- o banco fica em WAL (configure_sqlite): as leituras usam o pool normal do
+  engine e nunca esperam pelo escritor;
+- group commit: os jobs que já estão na fila quando o escritor acorda (até
+  SQLITE_WRITER_MAX_BATCH) rodam numa mesma transação BEGIN IMMEDIATE, cada
+  um em SAVEPOINTs (o session.commit() dos repositórios libera o savepoint;
+  um job que falha desfaz só o que ainda não tinha confirmado), e um único
+  COMMIT confirma o lote;
+- o request só recebe o resultado depois do COMMIT, e só então o cache de
+  respostas deste processo é invalidado.
+
+Rotas e serviços escrevem com run_write(session, fn): `fn(session)` roda no
+escritor quando SQLITE_WRITER_ENABLED e, caso contrário (ou em bancos em
+memória), direto na sessão do request.
+"""
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import defer_invalidation, invalidate_changed
+from app.core.config import settings
+from app.core.query_stats import instrument_engine, is_instrumented
+from app.core.logging_config import logger
+
+T = TypeVar("T")
+
+# chave em session.info: a sessão pertence ao escritor (run_write vira chamada direta)
+_WRITER_KEY = "sqlite_writer"
+
+# (fn, future, contexto de quem enfileirou: id do request nos logs etc.)
+_Job = Tuple[Callable[[Session], object], Future, contextvars.Context]
+
+
+def _is_file_sqlite(engine: Engine) -> bool:
+    url = engine.url
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _apply_pragmas(dbapi_connection, wal: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    if wal:
+        # persistente no arquivo; synchronous=NORMAL é seguro em WAL
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def configure_sqlite(engine: Engine) -> Engine:
+    """WAL, synchronous=NORMAL e busy_timeout em cada conexão nova de `engine`."""
+    if _is_file_sqlite(engine):
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            _apply_pragmas(dbapi_connection, settings.SQLITE_WAL)
+    return engine
+
+
+class SQLiteWriter:
+    """Thread escritora de um banco: fila de jobs, group commit, conexão própria."""
+
+    def __init__(self, engine: Engine, max_batch: int = 64):
+        self.engine = engine
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue[Optional[_Job]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.jobs = 0
+        self.batches = 0
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        """Enfileira `fn(session)`; o Future resolve depois do COMMIT do lote."""
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="sqlite-writer", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((fn, future, contextvars.copy_context()))
+        return future
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        return self.submit(fn).result()
+
+    def stop(self) -> None:
+        """Processa o que já está na fila, devolve a conexão e encerra a thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        return {"jobs": self.jobs, "batches": self.batches}
+
+    def _loop(self) -> None:
+        with self.engine.connect() as conn:
+            dbapi_connection = conn.connection.driver_connection
+            # transações explícitas (BEGIN IMMEDIATE/SAVEPOINT) em vez das
+            # implícitas do pysqlite, que não combinam com savepoints
+            dbapi_connection.isolation_level = None
+            _apply_pragmas(dbapi_connection, settings.SQLITE_WAL)
+            try:
+                stopping = False
+                while not stopping:
+                    job = self._queue.get()
+                    if job is None:
+                        break
+                    batch = [job]
+                    while len(batch) < self.max_batch:
+                        try:
+                            job = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if job is None:
+                            stopping = True
+                            break
+                        batch.append(job)
+                    self._run_batch(conn, batch)
+            finally:
+                # a conexão volta ao pool do engine no modo padrão
+                dbapi_connection.isolation_level = ""
+
+    def _run_batch(self, conn: Connection, batch: List[_Job]) -> None:
+        done: List[Tuple[Future, bool, object]] = []
+        changed: Set[str] = set()
+        try:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            for fn, future, ctx in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                with Session(
+                    bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False
+                ) as session:
+                    session.info[_WRITER_KEY] = self
+                    defer_invalidation(session, changed)
+                    try:
+                        result = ctx.run(fn, session)
+                        if session.in_transaction():
+                            session.commit()
+                    except Exception as exc:
+                        session.rollback()
+                        done.append((future, False, exc))
+                    else:
+                        done.append((future, True, result))
+            conn.commit()
+        except Exception as exc:
+            logger.exception("Falha no lote de escrita (%s jobs)", len(batch))
+            conn.rollback()
+            done = [(future, False, exc) for _, future, _ in batch if not future.cancelled()]
+        finally:
+            # mesmo num lote desfeito: invalidar a mais só custa um recálculo
+            if changed:
+                invalidate_changed(conn, changed)
+        self.jobs += len(done)
+        self.batches += 1
+        for future, ok, value in done:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+# um escritor por arquivo de banco (engines diferentes do mesmo arquivo o compartilham)
+_writers: Dict[str, SQLiteWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def writer_for(bind) -> Optional[SQLiteWriter]:
+    """Escritor do banco de `bind`; None se não for SQLite em arquivo."""
+    engine = bind.engine
+    if not _is_file_sqlite(engine):
+        return None
+    key = os.path.abspath(engine.url.database)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            if engine.dialect.is_async:
+                # o escritor é síncrono: mesmo arquivo pelo driver pysqlite
+                sync_engine = create_engine(engine.url.set(drivername="sqlite"))
+                if is_instrumented(engine):
+                    instrument_engine(sync_engine)
+                engine = sync_engine
+            writer = _writers[key] = SQLiteWriter(engine, settings.SQLITE_WRITER_MAX_BATCH)
+        return writer
+
+
+def stop_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop()
+
+
+def _writer_or_none(session: Session) -> Optional[SQLiteWriter]:
+    if not settings.SQLITE_WRITER_ENABLED or _WRITER_KEY in session.info:
+        return None
+    return writer_for(session.get_bind())
+
+
+def run_write(session: Session, fn: Callable[[Session], T]) -> T:
+    """
+    Executa a escrita `fn(session)` pelo escritor do banco de `session` e
+    devolve o resultado (ou levanta a exceção de `fn`) depois do COMMIT.
+    Os objetos devolvidos vêm carregados, mas de outra sessão.
+    """
+    writer = _writer_or_none(session)
+    if writer is None:
+        return fn(session)
+    if session.in_transaction():
+        # encerra o snapshot de leitura do request: a próxima leitura vê a escrita
+        session.commit()
+    return writer.run(fn)
+
+
+async def run_write_async(session: AsyncSession, fn: Callable[[Session], T]) -> T:
+    """run_write para AsyncSession: espera o escritor sem bloquear o event loop."""
+    writer = _writer_or_none(session.sync_session)
+    if writer is None:
+        return await session.run_sync(fn)
+    if session.in_transaction():
+        await session.commit()
+    return await asyncio.wrap_future(writer.submit(fn))
@@ -0,0 +1,80 @@
+# app/models/versions.py
+"""
+Versões de mudança por escopo (tabela `change_version`).
+
+Cada escopo ("tag", "task", "project:<id>", ...) tem um contador que cresce
+a cada escrita nos dados que ele cobre, na mesma transação da escrita.
+Caches em memória guardam a versão com que foram carregados e a comparam
+com a do banco (uma leitura por chave primária) para saber se ficaram
+velhos — inclusive quando quem escreveu foi outro processo; as ETags da API
+também são calculadas a partir dessas versões.
+
+O escopo "tag" é mantido por triggers na tabela tag; os demais são
+incrementados pelos repositórios (ver app.core.cache.mark_changed).
+
+O primeiro valor de um escopo é aleatório, e não 1: um banco recriado do
+zero não repete as versões do anterior, então um cache antigo nunca é
+confundido com um atual.
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import DDL, event, select, text
+
+from app.models.entities import ChangeVersion, Tag
+
+TAG_SCOPE = "tag"
+# escopos incrementados por triggers, e não pelos repositórios
+TRIGGER_SCOPES = frozenset({TAG_SCOPE})
+
+_BUMP_SQL = (
+    "INSERT INTO change_version (scope, version) "
+    "VALUES ({scope}, abs(random() / 1000000)) "
+    "ON CONFLICT(scope) DO UPDATE SET version = version + 1"
+)
+
+# A tabela tag é mantida em sincronia por triggers: qualquer escrita conta,
+# venha ela do TagRepo, de SQL manual ou de outro worker.
+TAG_VERSION_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tag_version_{name} AFTER {when} ON tag BEGIN
+        {_BUMP_SQL.format(scope="'tag'")};
+    END
+    """
+    for name, when in (("ai", "INSERT"), ("au", "UPDATE OF name"), ("ad", "DELETE"))
+]
+
+for _ddl in TAG_VERSION_DDL:
+    event.listen(Tag.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+
+def read_version(conn, scope: str) -> Optional[int]:
+    """Versão atual de `scope` (None se o escopo nunca mudou)."""
+    return conn.execute(
+        text("SELECT version FROM change_version WHERE scope = :scope"), {"scope": scope}
+    ).scalar()
+
+
+def read_versions(conn, scopes: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Versões de vários escopos numa consulta (None para os que nunca mudaram)."""
+    scopes = list(dict.fromkeys(scopes))
+    found = dict(
+        conn.execute(
+            select(ChangeVersion.scope, ChangeVersion.version).where(
+                ChangeVersion.scope.in_(scopes)
+            )
+        ).all()
+    )
+    return {scope: found.get(scope) for scope in scopes}
+
+
+def bump_version(conn, scope: str) -> None:
+    """Marca uma mudança em `scope` (na transação de `conn`)."""
+    conn.execute(text(_BUMP_SQL.format(scope=":scope")), {"scope": scope})
+
+
+def ensure_version_triggers(conn) -> None:
+    """Cria os triggers de versão em bancos que ainda não os têm."""
+    if conn.dialect.name != "sqlite":
+        return
+    for ddl in TAG_VERSION_DDL:
+        conn.execute(text(ddl))
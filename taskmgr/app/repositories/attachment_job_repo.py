@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from app.models.entities import Attachment, AttachmentJob
+
+class AttachmentJobRepo:
+    """Fila persistida de pós-processamento de anexos (tabela attachment_job)."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(self, attachment: Attachment) -> AttachmentJob:
+        """Marca o anexo como pendente e cria o job, na transação corrente (sem commit)."""
+        attachment.processing_status = "pending"
+        self.session.add(attachment)
+        self.session.flush()
+        job = AttachmentJob(attachment_id=attachment.id)
+        self.session.add(job)
+        return job
+
+    def claim(self, limit: int) -> List[Tuple[AttachmentJob, Attachment]]:
+        """Pega até `limit` jobs pendentes (mais antigos primeiro) e os marca como running."""
+        stmt = (
+            select(AttachmentJob, Attachment)
+            .join(Attachment, Attachment.id == AttachmentJob.attachment_id)
+            .where(AttachmentJob.status == "pending")
+            .order_by(AttachmentJob.id)
+            .limit(limit)
+        )
+        rows = self.session.exec(stmt).all()
+        now = datetime.utcnow()
+        for job, a in rows:
+            job.status = "running"
+            job.attempts += 1
+            job.updated_at = now
+            a.processing_status = "processing"
+            self.session.add(job)
+            self.session.add(a)
+        self.session.commit()
+        return rows
+
+    def finish(self, job_id: int, status: str, error: Optional[str] = None, **fields) -> None:
+        """
+        Encerra o job com `status` (done, failed ou pending para tentar de
+        novo) e grava no anexo o status correspondente e os `fields`.
+        """
+        job = self.session.get(AttachmentJob, job_id)
+        if job is None:
+            return
+        job.status = status
+        job.error = error
+        job.updated_at = datetime.utcnow()
+        self.session.add(job)
+        a = self.session.get(Attachment, job.attachment_id)
+        if a is not None:
+            a.processing_status = {"done": "done", "failed": "failed"}.get(status, "pending")
+            for name, value in fields.items():
+                setattr(a, name, value)
+            self.session.add(a)
+        self.session.commit()
+
+    def requeue_running(self) -> int:
+        """Devolve à fila os jobs que estavam rodando quando o processo parou."""
+        result = self.session.exec(
+            update(AttachmentJob)
+            .where(AttachmentJob.status == "running")
+            .values(status="pending", updated_at=datetime.utcnow())
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def delete_for_attachment(self, attachment_id: int) -> None:
+        for job in self.session.exec(
+            select(AttachmentJob).where(AttachmentJob.attachment_id == attachment_id)
+        ).all():
+            self.session.delete(job)
+
+    def count_by_status(self) -> Dict[str, int]:
+        stmt = select(AttachmentJob.status, func.count()).group_by(AttachmentJob.status)
+        return {status: count for status, count in self.session.exec(stmt).all()}
@@ -1,4 +1,5 @@
 from typing import Optional, List
+from sqlalchemy import func
 from sqlmodel import Session, select
 from app.models.entities import Attachment
 
@@ -17,3 +18,15 @@ class AttachmentRepo:
 
     def list_by_task(self, task_id: int) -> List[Attachment]:
         return self.session.exec(select(Attachment).where(Attachment.task_id == task_id)).all()
+
+    def list_all(self) -> List[Attachment]:
+        return self.session.exec(select(Attachment).order_by(Attachment.id)).all()
+
+    def delete(self, a: Attachment) -> None:
+        self.session.delete(a)
+        self.session.commit()
+
+    def count_by_sha256(self, sha256: str) -> int:
+        """Referências (linhas de Attachment) ao arquivo de conteúdo `sha256`."""
+        stmt = select(func.count()).select_from(Attachment).where(Attachment.sha256 == sha256)
+        return self.session.exec(stmt).one()
@@ -1,6 +1,12 @@
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, TypeVar
+from sqlalchemy import delete, func, insert
 from sqlmodel import Session, select
-from app.models.entities import Project, Task
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import ALL_SCOPE, mark_changed, project_scope
+from app.models.entities import Project, ProjectStats, Task
+from app.models.sqlite_writer import run_write_async
+
+T = TypeVar("T")
 
 class ProjectRepo:
     def __init__(self, session: Session):
@@ -8,6 +14,8 @@ class ProjectRepo:
 
     def create(self, p: Project) -> Project:
         self.session.add(p)
+        self.session.flush()
+        mark_changed(self.session, project_scope(p.id))
         self.session.commit()
         self.session.refresh(p)
         return p
@@ -18,9 +26,63 @@ class ProjectRepo:
     def list(self) -> List[Project]:
         return self.session.exec(select(Project)).all()
 
+    def status_counts(self, project_id: int) -> Dict[str, int]:
+        """
+        Quantidade de tasks por status, lida da tabela de contadores
+        project_stats (custo constante, independente do tamanho do projeto).
+        """
+        stmt = select(ProjectStats.status, ProjectStats.task_count).where(
+            ProjectStats.project_id == project_id, ProjectStats.task_count > 0
+        )
+        return {status: count for status, count in self.session.exec(stmt)}
+
     def progress(self, project_id: int) -> float:
-        tasks = self.session.exec(select(Task).where(Task.project_id == project_id)).all()
-        if not tasks:
+        counts = self.status_counts(project_id)
+        total = sum(counts.values())
+        if not total:
             return 0.0
-        done = sum(1 for t in tasks if t.status == "DONE")
-        return round((done / len(tasks)) * 100.0, 2)
+        done = counts.get("DONE", 0)
+        return round((done / total) * 100.0, 2)
+
+    def rebuild_stats(self, project_id: Optional[int] = None) -> None:
+        """
+        Recalcula os contadores de project_stats a partir da tabela task
+        (todos os projetos, ou só `project_id`). Serve para reparar contadores.
+        """
+        clear = delete(ProjectStats)
+        source = select(Task.project_id, Task.status, func.count()).group_by(
+            Task.project_id, Task.status
+        )
+        if project_id is not None:
+            clear = clear.where(ProjectStats.project_id == project_id)
+            source = source.where(Task.project_id == project_id)
+        mark_changed(self.session, ALL_SCOPE if project_id is None else project_scope(project_id))
+        self.session.execute(clear)
+        self.session.execute(
+            insert(ProjectStats).from_select(
+                ["project_id", "status", "task_count"], source
+            )
+        )
+        self.session.commit()
+
+
+class AsyncProjectRepo:
+    """ProjectRepo sobre AsyncSession (ver AsyncTaskRepo)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run(self, fn: Callable[[ProjectRepo], T]) -> T:
+        return await self.session.run_sync(lambda sync_session: fn(ProjectRepo(sync_session)))
+
+    async def create(self, p: Project) -> Project:
+        return await run_write_async(self.session, lambda sync_session: ProjectRepo(sync_session).create(p))
+
+    async def get(self, project_id: int) -> Optional[Project]:
+        return await self.run(lambda repo: repo.get(project_id))
+
+    async def status_counts(self, project_id: int) -> Dict[str, int]:
+        return await self.run(lambda repo: repo.status_counts(project_id))
+
+    async def progress(self, project_id: int) -> float:
+        return await self.run(lambda repo: repo.progress(project_id))
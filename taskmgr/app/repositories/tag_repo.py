@@ -1,6 +1,86 @@
-from typing import Optional, List
+import threading
+import weakref
+from typing import Dict, NamedTuple, Optional, List, Tuple
 from sqlmodel import Session, select
+from app.core.cache import TAGS_SCOPE, mark_changed
 from app.models.entities import Tag
+from app.models.versions import TAG_SCOPE, read_version
+
+# chave em session.info: snapshot já conferido contra o banco nesta sessão
+_CHECKED_KEY = "tag_dictionary_snapshot"
+
+
+class TagSnapshot(NamedTuple):
+    """Foto imutável das tags de um banco, na versão `version`."""
+    version: Optional[int]
+    ids_by_name: Dict[str, Tuple[int, ...]]
+    names_by_id: Dict[int, str]
+
+
+class TagDictionary:
+    """
+    Dicionário nome <-> id das tags de um banco, compartilhado pelo processo.
+
+    Guarda um TagSnapshot junto com a versão "tag" de change_version em que
+    foi lido. Antes de usar, confere-se a versão do banco (uma leitura por
+    chave primária); se outra escrita — de qualquer processo — mudou as
+    tags, o dicionário é recarregado inteiro (as tags são poucas).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshot: Optional[TagSnapshot] = None
+
+    def load(self, session: Session) -> TagSnapshot:
+        # versão e linhas lidas na mesma transação: a foto é consistente
+        version = read_version(session, TAG_SCOPE)
+        rows = session.execute(select(Tag.id, Tag.name).order_by(Tag.id)).all()
+        ids_by_name: Dict[str, Tuple[int, ...]] = {}
+        for tag_id, name in rows:
+            ids_by_name[name] = ids_by_name.get(name, ()) + (tag_id,)
+        snapshot = TagSnapshot(version, ids_by_name, {tag_id: name for tag_id, name in rows})
+        with self._lock:
+            self.snapshot = snapshot
+        return snapshot
+
+    def current(self, session: Session) -> TagSnapshot:
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != read_version(session, TAG_SCOPE):
+            snapshot = self.load(session)
+        return snapshot
+
+    def added(self, tag_id: int, name: str, version: Optional[int]) -> None:
+        """
+        Write-through de uma tag recém-criada. `version` é a versão lida na
+        própria transação do insert: se ela for a seguinte à do snapshot,
+        nenhuma outra escrita aconteceu no meio e basta acrescentar a tag;
+        caso contrário o snapshot é descartado e recarregado no próximo uso.
+        """
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot is None or snapshot.version is None or version != snapshot.version + 1:
+                self.snapshot = None
+                return
+            ids_by_name = dict(snapshot.ids_by_name)
+            ids_by_name[name] = ids_by_name.get(name, ()) + (tag_id,)
+            names_by_id = dict(snapshot.names_by_id)
+            names_by_id[tag_id] = name
+            self.snapshot = TagSnapshot(version, ids_by_name, names_by_id)
+
+
+# um dicionário por engine (banco da aplicação, bancos de teste...)
+_dictionaries: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_dictionaries_lock = threading.Lock()
+
+
+def tag_dictionary(bind) -> TagDictionary:
+    engine = bind.engine
+    with _dictionaries_lock:
+        dictionary = _dictionaries.get(engine)
+        if dictionary is None:
+            dictionary = _dictionaries[engine] = TagDictionary()
+        return dictionary
+
 
 class TagRepo:
     def __init__(self, session: Session):
@@ -8,8 +88,13 @@ class TagRepo:
 
     def create(self, t: Tag) -> Tag:
         self.session.add(t)
+        self.session.flush()
+        # ainda dentro da transação de escrita: a versão inclui este insert
+        version = read_version(self.session, TAG_SCOPE)
+        mark_changed(self.session, TAGS_SCOPE)
         self.session.commit()
         self.session.refresh(t)
+        tag_dictionary(self.session.get_bind()).added(t.id, t.name, version)
         return t
 
     def get(self, tag_id: int) -> Optional[Tag]:
@@ -17,3 +102,21 @@ class TagRepo:
 
     def list(self) -> List[Tag]:
         return self.session.exec(select(Tag)).all()
+
+    def dictionary(self, reload: bool = False) -> TagSnapshot:
+        """
+        Dicionário nome <-> id das tags, do cache do processo.
+
+        A versão é conferida no banco uma vez por sessão (por request);
+        reload=True força a releitura (ex.: id desconhecido no snapshot).
+        """
+        cache = tag_dictionary(self.session.get_bind())
+        checked = self.session.info.get(_CHECKED_KEY)
+        if reload:
+            snapshot = cache.load(self.session)
+        elif checked is not None and checked is cache.snapshot:
+            return checked
+        else:
+            snapshot = cache.current(self.session)
+        self.session.info[_CHECKED_KEY] = snapshot
+        return snapshot
@@ -1,86 +1,656 @@
 # app/repositories/task_repo.py
-from typing import List, Optional
+from collections import Counter
+from datetime import date
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union,
+)
+from sqlalchemy import (
+    and_, case, delete, distinct, false, func, insert, literal_column, or_, text, tuple_, update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
-from app.models.entities import Task, Tag, TaskTagLink
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import TASKS_SCOPE, mark_changed, project_scope
+from app.core.config import settings
+from app.core.exceptions import DomainError, ValidationError
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.entities import ProjectStats, Task, TaskTagLink, UserTaskStats
+from app.models.search import fts_match_query, task_fts
+from app.models.sqlite_writer import run_write_async
+from app.repositories.tag_repo import TagRepo
+
+T = TypeVar("T")
+
+# Colunas aceitas em order_by
+ORDERABLE_COLUMNS = {"due_date", "priority"}
+# Ordenação por relevância da busca textual (só faz sentido com `q`)
+RELEVANCE = "relevance"
+# Modos do filtro por várias tags: qualquer uma delas ou todas
+TAG_MODES = ("any", "all")
+
+# Colunas do caminho rápido da listagem (mesma ordem dos campos de TaskOut)
+TASK_ROW_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.due_date,
+    Task.project_id,
+    Task.assignee_id,
+)
+
+# Colunas devolvidas por iter_export_rows, na ordem
+EXPORT_COLUMNS = (
+    "id", "title", "description", "status", "priority",
+    "due_date", "project_id", "assignee_id", "tags",
+)
+
+# Quantidade máxima de ids por cláusula IN (abaixo do limite de
+# variáveis do SQLite, que é 999 em versões antigas).
+IN_CHUNK_SIZE = 900
+
+# maior rowid do SQLite; acima dele o próprio banco sorteia rowids livres
+MAX_ROWID = 2**63 - 1
+
+
+def _chunks(ids: List[int], size: int = IN_CHUNK_SIZE):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def _is_open(status: str) -> bool:
+    return status != "DONE"
+
+
+def _after_keyset(sort_col, order_by: Optional[str], key, last_id: int):
+    """Condição "depois de (key, last_id)" na ordem (sort_col, id)."""
+    if sort_col is None:
+        return Task.id > last_id
+    if key is None:
+        # no SQLite os NULLs vêm primeiro na ordem ascendente
+        return or_(and_(sort_col.is_(None), Task.id > last_id), sort_col.is_not(None))
+    try:
+        if order_by == "due_date":
+            key = date.fromisoformat(key)
+        elif order_by == RELEVANCE:
+            key = float(key)
+        else:
+            key = int(key)
+    except (TypeError, ValueError):
+        raise ValidationError("invalid_cursor", "Cursor de paginação inválido.")
+    return tuple_(sort_col, Task.id) > tuple_(key, last_id)
+
 
 class TaskRepo:
     def __init__(self, session: Session):
         self.session = session
 
     def create(self, task: Task, tag_ids: List[int]) -> Task:
+        """
+        Insere a task, suas tags e atualiza os contadores numa transação só.
+
+        Se a task nasce aberta com responsável, a vaga no limite
+        MAX_OPEN_TASKS_PER_USER é reservada antes do insert, num único
+        UPDATE condicional: dois requests concorrentes não conseguem passar
+        juntos do limite. Sem vaga, levanta DomainError("user_overload").
+        """
+        if _is_open(task.status) and task.assignee_id is not None:
+            limit = settings.MAX_OPEN_TASKS_PER_USER
+            if not self._reserve_open_slot(task.assignee_id, limit):
+                self.session.rollback()
+                raise DomainError(
+                    "user_overload",
+                    f"Usuário atingiu o limite de {limit} tarefas abertas.",
+                )
         self.session.add(task)
         self.session.flush()
         if tag_ids:
             for tid in tag_ids:
                 self.session.add(TaskTagLink(task_id=task.id, tag_id=tid))
+        self._bump_project_stats(task.project_id, task.status, 1)
         self.session.commit()
         self.session.refresh(task)
         return task
 
+    def bulk_create(self, items: List[Tuple[Task, List[int]]]) -> List[Optional[int]]:
+        """
+        Insere várias tasks (e seus TaskTagLink) numa única transação.
+
+        As tasks (com ids reservados a partir do maior id atual) e os links
+        vão cada um num único executemany; os contadores
+        são atualizados uma vez por projeto/status e por responsável (com
+        reserva atômica das vagas). Retorna, na ordem de `items`, o id
+        criado ou None para as tasks recusadas por falta de vaga no limite
+        de abertas do responsável (as primeiras do lote têm preferência).
+        """
+        if not items:
+            return []
+        limit = settings.MAX_OPEN_TASKS_PER_USER
+
+        wanted = Counter(
+            t.assignee_id for t, _ in items
+            if _is_open(t.status) and t.assignee_id is not None
+        )
+        granted = {uid: self._reserve_open_slots(uid, n, limit) for uid, n in wanted.items()}
+
+        accepted = []
+        for pos, (task, tag_ids) in enumerate(items):
+            uid = task.assignee_id
+            if _is_open(task.status) and uid is not None:
+                if granted[uid] == 0:
+                    continue
+                granted[uid] -= 1
+            accepted.append(pos)
+
+        ids: List[Optional[int]] = [None] * len(items)
+        if accepted:
+            rows = [items[pos][0].model_dump(exclude={"id"}) for pos in accepted]
+            table = Task.__table__
+            # Os ids são reservados aqui, com o lock de escrita já tomado:
+            # ninguém insere entre o max(id) e o executemany, e os ids do lote
+            # são os que nós gravamos (não uma suposição sobre o SQLite).
+            self._lock_for_write()
+            first_id = self.session.execute(select(func.coalesce(func.max(Task.id), 0))).scalar_one() + 1
+            if first_id + len(rows) - 1 <= MAX_ROWID:
+                new_ids = range(first_id, first_id + len(rows))
+                for row, task_id in zip(rows, new_ids):
+                    row["id"] = task_id
+                self.session.execute(insert(table), rows)
+            else:
+                # sem espaço acima do maior id: o SQLite escolhe, lemos um a um
+                new_ids = [
+                    self.session.execute(insert(table).returning(table.c.id), row).scalar_one()
+                    for row in rows
+                ]
+
+            links = []
+            stats = Counter()
+            for pos, task_id in zip(accepted, new_ids):
+                task, tag_ids = items[pos]
+                ids[pos] = task_id
+                links.extend({"task_id": task_id, "tag_id": tid} for tid in dict.fromkeys(tag_ids or []))
+                stats[(task.project_id, task.status)] += 1
+            if links:
+                self.session.execute(insert(TaskTagLink.__table__), links)
+            for (project_id, status), n in stats.items():
+                self._bump_project_stats(project_id, status, n)
+
+        self.session.commit()
+        return ids
+
     def get(self, task_id: int) -> Optional[Task]:
         return self.session.get(Task, task_id)
 
     def update_status(self, task_id: int, new_status: str) -> Task:
         task = self.get(task_id)
+        if task.status != new_status:
+            self._bump_project_stats(task.project_id, task.status, -1)
+            self._bump_project_stats(task.project_id, new_status, 1)
+            if task.assignee_id is not None and _is_open(task.status) != _is_open(new_status):
+                self._bump_open_count(task.assignee_id, 1 if _is_open(new_status) else -1)
         task.status = new_status
         self.session.add(task)
         self.session.commit()
         self.session.refresh(task)
         return task
 
+    def _lock_for_write(self) -> None:
+        """
+        Abre a transação de escrita já com o lock de escrita do SQLite
+        (RESERVED), com um UPDATE que não altera nada. Leituras feitas depois
+        disso ficam válidas até o commit: nenhum outro escritor entra no meio.
+        """
+        self.session.execute(text("UPDATE task SET status = status WHERE 0"))
+
+    def status_snapshot(
+        self,
+        *,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> List[tuple]:
+        """
+        Inicia uma troca de status em lote: trava a escrita e lê, numa
+        consulta (por bloco de ids), (id, project_id, assignee_id, status) das
+        tasks alvo — dadas por `ids` ou pelos filtros de list_with_filters.
+        Por filtro, com `limit` lê no máximo limit + 1 linhas: quem chama
+        sabe que passou do limite sem carregar o conjunto todo.
+        A transação continua aberta: termine com apply_status_change.
+        """
+        self._lock_for_write()
+        cols = (Task.id, Task.project_id, Task.assignee_id, Task.status)
+        if ids is None:
+            stmt = self._apply_filters(select(*cols), **(filters or {})).order_by(Task.id)
+            if limit is not None:
+                stmt = stmt.limit(limit + 1)
+            return [tuple(r) for r in self.session.execute(stmt)]
+        rows = []
+        for chunk in _chunks(list(dict.fromkeys(ids))):
+            stmt = select(*cols).where(Task.id.in_(chunk))
+            rows.extend(tuple(r) for r in self.session.execute(stmt))
+        return rows
+
+    def apply_status_change(self, rows: List[tuple], new_status: str) -> None:
+        """
+        Aplica `new_status` às tasks de `rows` (tuplas de status_snapshot) com
+        um UPDATE por conjunto de ids, ajusta os contadores agrupados e faz
+        o commit da transação aberta por status_snapshot.
+        """
+        project_delta = Counter()
+        user_delta = Counter()
+        for _, project_id, assignee_id, old_status in rows:
+            if old_status == new_status:
+                continue
+            project_delta[(project_id, old_status)] -= 1
+            project_delta[(project_id, new_status)] += 1
+            if assignee_id is not None and _is_open(old_status) != _is_open(new_status):
+                user_delta[assignee_id] += 1 if _is_open(new_status) else -1
+
+        ids = [r[0] for r in rows if r[3] != new_status]
+        for chunk in _chunks(ids):
+            self.session.execute(
+                update(Task)
+                .where(Task.id.in_(chunk))
+                .values(status=new_status)
+                .execution_options(synchronize_session=False)
+            )
+        for (project_id, status), delta in project_delta.items():
+            if delta:
+                self._bump_project_stats(project_id, status, delta)
+        for user_id, delta in user_delta.items():
+            if delta:
+                self._bump_open_count(user_id, delta)
+        self.session.commit()
+
+    def _bump_project_stats(self, project_id: int, status: str, delta: int) -> None:
+        """
+        Soma `delta` ao contador (projeto, status), na transação corrente.
+        Toda escrita de task passa por aqui, então é também onde o projeto e
+        as listagens são marcados para invalidação do cache de respostas.
+        """
+        mark_changed(self.session, project_scope(project_id), TASKS_SCOPE)
+        stmt = sqlite_insert(ProjectStats).values(
+            project_id=project_id, status=status, task_count=delta
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectStats.project_id, ProjectStats.status],
+            set_={"task_count": ProjectStats.task_count + delta},
+        )
+        self.session.execute(stmt)
+
+    def _reserve_open_slot(self, user_id: int, limit: int) -> bool:
+        """
+        Incrementa o contador de abertas do usuário só se ainda estiver
+        abaixo de `limit` (checagem e incremento no mesmo statement).
+        Retorna False se o limite já foi atingido.
+        """
+        if limit < 1:
+            return False
+        stmt = sqlite_insert(UserTaskStats).values(user_id=user_id, open_count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserTaskStats.user_id],
+            set_={"open_count": UserTaskStats.open_count + 1},
+            where=UserTaskStats.open_count < limit,
+        )
+        return self.session.execute(stmt).rowcount == 1
+
+    def _reserve_open_slots(self, user_id: int, wanted: int, limit: int) -> int:
+        """
+        Reserva até `wanted` vagas de abertas para o usuário, sem passar de
+        `limit`. Retorna quantas vagas foram reservadas.
+
+        O primeiro statement já é uma escrita, o que garante o lock de escrita
+        do SQLite até o commit: a leitura do contador logo depois não pode ser
+        alterada por outro escritor antes do incremento.
+        """
+        self.session.execute(
+            sqlite_insert(UserTaskStats)
+            .values(user_id=user_id, open_count=0)
+            .on_conflict_do_nothing(index_elements=[UserTaskStats.user_id])
+        )
+        current = self.count_open_by_user(user_id)
+        free = max(limit - current, 0)
+        granted = min(wanted, free)
+        if granted:
+            self._bump_open_count(user_id, granted)
+        return granted
+
+    def open_counts_for_users(self, user_ids: Iterable[int]) -> Dict[int, int]:
+        """Tasks abertas de vários usuários de uma vez (lidas do contador)."""
+        ids = list(dict.fromkeys(user_ids))
+        counts = {uid: 0 for uid in ids}
+        for chunk in _chunks(ids):
+            stmt = select(UserTaskStats.user_id, UserTaskStats.open_count).where(
+                UserTaskStats.user_id.in_(chunk)
+            )
+            counts.update(dict(self.session.exec(stmt).all()))
+        return counts
+
+    def _bump_open_count(self, user_id: int, delta: int) -> None:
+        stmt = sqlite_insert(UserTaskStats).values(user_id=user_id, open_count=max(delta, 0))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserTaskStats.user_id],
+            set_={"open_count": func.max(UserTaskStats.open_count + delta, 0)},
+        )
+        self.session.execute(stmt)
+
     def count_open_by_user(self, user_id: int) -> int:
-        stmt = select(Task).where(Task.assignee_id == user_id, Task.status != "DONE")
-        return len(self.session.exec(stmt).all())
+        """Tasks abertas do usuário, lidas do contador (custo constante)."""
+        stmt = select(UserTaskStats.open_count).where(UserTaskStats.user_id == user_id)
+        return self.session.exec(stmt).first() or 0
 
-    def list_with_filters(
+    def rebuild_open_counts(self, user_id: Optional[int] = None) -> None:
+        """Recalcula user_task_stats a partir da tabela task (reparo)."""
+        clear = delete(UserTaskStats)
+        source = (
+            select(Task.assignee_id, func.count())
+            .where(Task.assignee_id.is_not(None), Task.status != "DONE")
+            .group_by(Task.assignee_id)
+        )
+        if user_id is not None:
+            clear = clear.where(UserTaskStats.user_id == user_id)
+            source = source.where(Task.assignee_id == user_id)
+        self.session.execute(clear)
+        self.session.execute(
+            insert(UserTaskStats).from_select(["user_id", "open_count"], source)
+        )
+        self.session.commit()
+
+    def archive_candidates(self, project_id: int, limit: int = 1) -> List[tuple]:
+        """
+        Linhas (id, priority, status) das tasks do projeto que podem impedir
+        o arquivamento, no máximo `limit`.
+
+        A regra oficial é `blocks_archive` (app/services/project_service.py),
+        que decide sobre estas linhas. O WHERE abaixo é só uma cópia dela em
+        SQL para a consulta parar nas primeiras linhas: quem mudar a regra
+        muda os dois (test_can_archive confere que concordam).
+        """
+        stmt = (
+            select(Task.id, Task.priority, Task.status)
+            .where(
+                Task.project_id == project_id,
+                Task.priority <= 2,
+                Task.status != "DONE",
+            )
+            .limit(limit)
+        )
+        return list(self.session.exec(stmt))
+
+    def _apply_filters(
         self,
+        stmt,
         *,
-            status: Optional[str]=None,
-            project_id: Optional[int]=None,
-            assignee_id: Optional[int]=None,
-            tag: Optional[str]=None,
-            q: Optional[str]=None,
-            order_by: Optional[str]=None
-    ) -> List[Task]:
-        # base
-        stmt = select(Task)
+        status: Optional[str] = None,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+        tag: Union[str, Sequence[str], None] = None,
+        tag_mode: str = "any",
+        q: Optional[str] = None,
+    ):
+        if tag:
+            stmt = stmt.where(self._tag_filter(tag, tag_mode))
         if status:
             stmt = stmt.where(Task.status == status)
-        if project_id:
+        if project_id is not None:
             stmt = stmt.where(Task.project_id == project_id)
         if assignee_id is not None:
             stmt = stmt.where(Task.assignee_id == assignee_id)
         if q:
-            stmt = stmt.where(Task.title.contains(q))
-        if order_by in {"due_date", "priority"}:
-            stmt = stmt.order_by(getattr(Task, order_by))
+            stmt = self._apply_text_search(stmt, q)
+        return stmt
 
-        # filtro por tag via join na tabela de ligação
-        if tag:
-            stmt = (
-                select(Task)
-                .join(TaskTagLink, TaskTagLink.task_id == Task.id)
-                .join(Tag, Tag.id == TaskTagLink.tag_id)
-                .where(Tag.name == tag)
+    def _tag_filter(self, tag: Union[str, Sequence[str]], tag_mode: str):
+        """
+        Condição das tasks que têm alguma (`any`) ou todas (`all`) as tags
+        de `tag`, como semi-join (Task.id IN subconsulta): uma task com
+        várias tags que casam aparece uma vez só, sem DISTINCT. Os nomes
+        viram ids pelo dicionário de tags, sem join com a tabela `tag`.
+        """
+        if tag_mode not in TAG_MODES:
+            raise ValidationError("invalid_tag_mode", "tag_mode deve ser 'any' ou 'all'.")
+        names = [tag] if isinstance(tag, str) else list(dict.fromkeys(tag))
+        ids_by_name = TagRepo(self.session).dictionary().ids_by_name
+        matches = [ids_by_name.get(name, ()) for name in names]
+        tag_ids = [tag_id for ids in matches for tag_id in ids]
+        if not tag_ids or (tag_mode == "all" and not all(matches)):
+            return false()
+
+        stmt = select(TaskTagLink.task_id).where(TaskTagLink.tag_id.in_(tag_ids))
+        if tag_mode == "all" and len(names) > 1:
+            # conta nomes distintos por task; como nomes podem se repetir
+            # em tags diferentes, cada id é mapeado para o nome que cobre
+            key = TaskTagLink.tag_id
+            if len(tag_ids) > len(names):
+                key = case(
+                    {tag_id: i for i, ids in enumerate(matches) for tag_id in ids},
+                    value=TaskTagLink.tag_id,
+                )
+            stmt = stmt.group_by(TaskTagLink.task_id).having(
+                func.count(distinct(key)) == len(names)
             )
-            if status:
-                stmt = stmt.where(Task.status == status)
-            if project_id:
-                stmt = stmt.where(Task.project_id == project_id)
-            if assignee_id is not None:
-                stmt = stmt.where(Task.assignee_id == assignee_id)
-            if q:
-                stmt = stmt.where(Task.title.contains(q))
-            if order_by in {"due_date", "priority"}:
-                stmt = stmt.order_by(getattr(Task, order_by))
+        return Task.id.in_(stmt)
+
+    def _tag_names_by_id(self, tag_ids: Iterable[int]) -> Dict[int, str]:
+        """Nomes das tags pelo dicionário; relê o banco se faltar algum id."""
+        repo = TagRepo(self.session)
+        names = repo.dictionary().names_by_id
+        if any(tag_id not in names for tag_id in tag_ids):
+            names = repo.dictionary(reload=True).names_by_id
+        return names
+
+    def _uses_fts(self) -> bool:
+        return self.session.get_bind().dialect.name == "sqlite"
+
+    def _apply_text_search(self, stmt, q: str):
+        """Filtro `q`: MATCH no índice FTS5 (título e descrição)."""
+        if not self._uses_fts():
+            return stmt.where(or_(Task.title.contains(q), Task.description.contains(q)))
+        match = fts_match_query(q)
+        if match is None:
+            return stmt.where(false())
+        return stmt.join(task_fts, task_fts.c.rowid == Task.id).where(
+            literal_column("task_fts").op("MATCH")(match)
+        )
+
+    def _sort_expr(self, order_by: Optional[str], q: Optional[str]):
+        """Expressão de ordenação para order_by, ou None (ordem por id)."""
+        if order_by in ORDERABLE_COLUMNS:
+            return getattr(Task, order_by)
+        if order_by == RELEVANCE and q and self._uses_fts() and fts_match_query(q):
+            return task_fts.c.rank
+        return None
 
+    def list_with_filters(
+        self,
+        *,
+            status: Optional[str]=None,
+            project_id: Optional[int]=None,
+            assignee_id: Optional[int]=None,
+            tag: Union[str, Sequence[str], None]=None,
+            tag_mode: str="any",
+            q: Optional[str]=None,
+            order_by: Optional[str]=None,
+            as_rows: bool=False
+    ) -> List[Task]:
+        """
+        Lista tasks com filtros. Com as_rows=True devolve tuplas com as
+        colunas de TASK_ROW_COLUMNS em vez de objetos Task (sem ORM).
+        `tag` aceita um nome ou uma lista; com várias tags, `tag_mode`
+        decide se a task precisa de qualquer uma (`any`) ou de todas (`all`).
+        """
+        stmt = self._apply_filters(
+            select(*TASK_ROW_COLUMNS) if as_rows else select(Task),
+            status=status,
+            project_id=project_id,
+            assignee_id=assignee_id,
+            tag=tag,
+            tag_mode=tag_mode,
+            q=q,
+        )
+        sort_expr = self._sort_expr(order_by, q)
+        if sort_expr is not None:
+            stmt = stmt.order_by(sort_expr, Task.id)
+        if as_rows:
+            return [tuple(row) for row in self.session.execute(stmt)]
         return self.session.exec(stmt).all()
 
+    def list_page(
+        self,
+        *,
+        limit: int,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        as_rows: bool = False,
+        **filters,
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        Paginação keyset (por cursor) sobre os mesmos filtros de list_with_filters.
+
+        A ordenação é sempre (coluna de ordenação, id), e a página seguinte
+        começa logo depois da última linha da anterior, sem OFFSET: o custo
+        de uma página profunda é o mesmo da primeira.
+        Retorna (tasks da página, cursor da próxima página ou None); com
+        as_rows=True as tasks vêm como tuplas de TASK_ROW_COLUMNS.
+        """
+        sort_expr = self._sort_expr(order_by, filters.get("q"))
+        if sort_expr is None:
+            order_by = None
+
+        target = TASK_ROW_COLUMNS if as_rows else (Task,)
+        extra = (sort_expr,) if sort_expr is not None else ()
+        stmt = self._apply_filters(select(*target, *extra), **filters)
+        if cursor:
+            key, last_id = decode_cursor(cursor, order_by)
+            stmt = stmt.where(_after_keyset(sort_expr, order_by, key, last_id))
+
+        # busca uma linha a mais só para saber se existe próxima página
+        stmt = stmt.order_by(*extra, Task.id).limit(limit + 1)
+        rows = self.session.execute(stmt).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            last_id = last[0] if as_rows else last[0].id
+            key = last[-1] if extra else None
+            next_cursor = encode_cursor(order_by, key, last_id)
+
+        if as_rows:
+            width = len(target)
+            return [tuple(row[:width]) for row in rows], next_cursor
+        return [row[0] for row in rows], next_cursor
+
+    def iter_export_rows(self, *, batch_size: int = 1000, **filters) -> Iterator[tuple]:
+        """
+        Percorre as tasks filtradas em streaming, para exportação.
+
+        Seleciona só colunas (sem montar objetos Task nem encher o identity
+        map) e busca as linhas em lotes de `batch_size` (yield_per), então a
+        memória não cresce com o tamanho do resultado. Os ids das tags vêm
+        agregados numa subconsulta correlacionada e viram nomes pelo
+        dicionário de tags; cada linha segue EXPORT_COLUMNS, com `tags` já
+        como lista.
+        """
+        tags = (
+            select(func.group_concat(TaskTagLink.tag_id))
+            .where(TaskTagLink.task_id == Task.id)
+            .scalar_subquery()
+        )
+        stmt = self._apply_filters(
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.status,
+                Task.priority,
+                Task.due_date,
+                Task.project_id,
+                Task.assignee_id,
+                tags,
+            ),
+            **filters,
+        ).order_by(Task.id)
+        names = TagRepo(self.session).dictionary().names_by_id
+        result = self.session.execute(stmt.execution_options(yield_per=batch_size))
+        for row in result:
+            tag_ids = [int(t) for t in row[-1].split(",")] if row[-1] else []
+            if any(t not in names for t in tag_ids):
+                names = self._tag_names_by_id(tag_ids)
+            yield (*row[:-1], [names[t] for t in tag_ids if t in names])
+
     # utilitário para montar lista de nomes de tags de uma task
     def tag_names_for_task(self, task_id: int) -> List[str]:
         stmt = (
-            select(Tag.name)
-            .join(TaskTagLink, TaskTagLink.tag_id == Tag.id)
+            select(TaskTagLink.tag_id)
             .where(TaskTagLink.task_id == task_id)
+            .order_by(TaskTagLink.tag_id)
         )
-        return [row[0] for row in self.session.exec(stmt)]
+        tag_ids = list(self.session.exec(stmt))
+        names = self._tag_names_by_id(tag_ids)
+        return [names[t] for t in tag_ids if t in names]
+
+    def tag_names_for_tasks(self, task_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """
+        Carrega os nomes das tags de várias tasks de uma vez.
+
+        Faz uma única consulta agrupada por bloco de ids (IN_CHUNK_SIZE),
+        em vez de uma consulta por task, só na tabela de ligação: os nomes
+        vêm do dicionário de tags. Tasks sem tags aparecem com lista vazia.
+        """
+        ids = list(dict.fromkeys(task_ids))
+        links: List[Tuple[int, int]] = []
+        for chunk in _chunks(ids):
+            stmt = (
+                select(TaskTagLink.task_id, TaskTagLink.tag_id)
+                .where(TaskTagLink.task_id.in_(chunk))
+                .order_by(TaskTagLink.task_id, TaskTagLink.tag_id)
+            )
+            links.extend(self.session.exec(stmt))
+        tag_names = self._tag_names_by_id({tag_id for _, tag_id in links}) if links else {}
+        names: Dict[int, List[str]] = {tid: [] for tid in ids}
+        for task_id, tag_id in links:
+            if tag_id in tag_names:
+                names[task_id].append(tag_names[tag_id])
+        return names
+
+
+class AsyncTaskRepo:
+    """
+    TaskRepo sobre AsyncSession (rotas assíncronas, ASYNC_DB).
+
+    As consultas são as mesmas do TaskRepo, executadas com
+    AsyncSession.run_sync: o I/O passa pelo driver assíncrono (aiosqlite)
+    e o request não ocupa uma thread do threadpool enquanto espera o banco.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run(self, fn: Callable[[TaskRepo], T]) -> T:
+        """Executa `fn(TaskRepo)` na sessão síncrona por trás da AsyncSession."""
+        return await self.session.run_sync(lambda sync_session: fn(TaskRepo(sync_session)))
+
+    async def write(self, fn: Callable[[TaskRepo], T]) -> T:
+        """Como run, para escritas: passa pelo escritor do SQLite (run_write_async)."""
+        return await run_write_async(self.session, lambda sync_session: fn(TaskRepo(sync_session)))
+
+    async def get(self, task_id: int) -> Optional[Task]:
+        return await self.run(lambda repo: repo.get(task_id))
+
+    async def list_with_filters(self, **kwargs) -> List[Task]:
+        return await self.run(lambda repo: repo.list_with_filters(**kwargs))
+
+    async def list_page(self, **kwargs) -> Tuple[List[Task], Optional[str]]:
+        return await self.run(lambda repo: repo.list_page(**kwargs))
+
+    async def tag_names_for_tasks(self, task_ids: Iterable[int]) -> Dict[int, List[str]]:
+        task_ids = list(task_ids)
+        return await self.run(lambda repo: repo.tag_names_for_tasks(task_ids))
+
+    async def archive_candidates(self, project_id: int, limit: int = 1) -> List[tuple]:
+        return await self.run(lambda repo: repo.archive_candidates(project_id, limit))
+
+    async def count_open_by_user(self, user_id: int) -> int:
+        return await self.run(lambda repo: repo.count_open_by_user(user_id))
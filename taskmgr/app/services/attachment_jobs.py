@@ -0,0 +1,207 @@
+# app/services/attachment_jobs.py
+"""
+Runner do pós-processamento de anexos (verificar checksum, detectar o
+tipo, prévia de texto / miniatura), fora do request de upload.
+
+- A fila é a tabela attachment_job: AttachmentService.save cria o job na
+  mesma transação do anexo, então nada se perde se o processo cair; no
+  start() os jobs que estavam "running" voltam para "pending".
+- Uma thread despachante pega jobs pendentes só quando há processo livre
+  (no máximo ATTACHMENT_WORKERS em andamento: o resto espera no banco, não
+  na memória) e os entrega a um ProcessPoolExecutor; o trabalho pesado
+  (hash, Pillow) não disputa o GIL com a API.
+- Os resultados voltam ao banco pelo escritor (run_write). Exceção no
+  processo (ex.: arquivo ainda não visível) é tentada de novo até
+  ATTACHMENT_JOB_MAX_ATTEMPTS; checksum divergente é falha definitiva.
+
+Um runner por banco: com vários workers da API, deixe ATTACHMENT_WORKERS=0
+em todos menos um (ou rode `python -m app.manage process-attachments`).
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.storage import THUMBNAIL_SUFFIX, BlobStore
+from app.models.sqlite_writer import run_write
+from app.repositories.attachment_job_repo import AttachmentJobRepo
+from app.services.attachment_processing import process_attachment
+
+
+class _Claimed(NamedTuple):
+    job_id: int
+    attempts: int
+    path: str
+    sha256: Optional[str]
+    thumbnail_path: str
+
+
+class AttachmentJobRunner:
+    def __init__(
+        self,
+        engine: Engine,
+        max_workers: int = 2,
+        poll_seconds: float = 2.0,
+        max_attempts: int = 3,
+    ):
+        self.engine = engine
+        self.max_workers = max_workers
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._inflight: Dict[int, Future] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- ciclo de vida ----
+
+    def start(self) -> None:
+        requeued = self._write(lambda s: AttachmentJobRepo(s).requeue_running())
+        if requeued:
+            logger.info("Pós-processamento de anexos: %s jobs interrompidos voltaram à fila", requeued)
+        self._thread = threading.Thread(target=self._loop, name="attachment-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Para de pegar jobs e espera os que estão em andamento terminarem."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def notify(self) -> None:
+        """Há job novo: acorda o despachante sem esperar o próximo poll."""
+        self._wake.set()
+
+    def run_until_idle(self) -> int:
+        """Processa a fila no chamador até ela esvaziar (testes e manage). Devolve os jobs rodados."""
+        total = 0
+        while True:
+            dispatched = self._dispatch()
+            with self._idle:
+                self._idle.wait_for(lambda: not self._inflight)
+            if not dispatched:
+                return total
+            total += dispatched
+
+    # ---- despacho ----
+
+    def _write(self, fn):
+        with Session(self.engine) as session:
+            return run_write(session, fn)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: um fork com as threads da API (escritor, threadpool) vivas não é seguro
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _claim(self, session: Session, limit: int) -> List[_Claimed]:
+        store = BlobStore(settings.FILE_STORAGE_DIR)
+        claimed = []
+        for job, a in AttachmentJobRepo(session).claim(limit):
+            thumb = store.thumbnail_path(a.sha256) if a.sha256 else a.filepath + THUMBNAIL_SUFFIX
+            claimed.append(_Claimed(job.id, job.attempts, a.filepath, a.sha256, thumb))
+        return claimed
+
+    def _dispatch(self) -> int:
+        with self._lock:
+            free = self.max_workers - len(self._inflight)
+        if free <= 0:
+            return 0
+        claimed = self._write(lambda s: self._claim(s, free))
+        for job in claimed:
+            future = self._executor().submit(process_attachment, job.path, job.sha256, job.thumbnail_path)
+            with self._lock:
+                self._inflight[job.job_id] = future
+            future.add_done_callback(lambda f, job=job: self._done(job, f))
+        return len(claimed)
+
+    def _done(self, job: _Claimed, future: Future) -> None:
+        try:
+            self._record(job, future)
+        except Exception:
+            logger.exception("Pós-processamento de anexos: falha ao gravar o job %s", job.job_id)
+        finally:
+            with self._idle:
+                self._inflight.pop(job.job_id, None)
+                self._idle.notify_all()
+            self._wake.set()
+
+    def _record(self, job: _Claimed, future: Future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            if isinstance(exc, BrokenProcessPool):
+                # um processo morreu (ex.: OOM); o próximo despacho cria outro pool
+                self._pool = None
+            retry = job.attempts < self.max_attempts
+            logger.warning(
+                "Pós-processamento do job %s falhou (tentativa %s): %r", job.job_id, job.attempts, exc
+            )
+            status = "pending" if retry else "failed"
+            self._write(lambda s: AttachmentJobRepo(s).finish(job.job_id, status, error=repr(exc)))
+            return
+        result = future.result()
+        if result["error"]:
+            logger.warning("Pós-processamento do job %s: %s", job.job_id, result["error"])
+            self._write(lambda s: AttachmentJobRepo(s).finish(job.job_id, "failed", error=result["error"]))
+            return
+        fields = {k: result[k] for k in ("mime_type", "preview", "thumbnail_path")}
+        self._write(lambda s: AttachmentJobRepo(s).finish(job.job_id, "done", **fields))
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                self._dispatch()
+            except Exception:
+                logger.exception("Pós-processamento de anexos: erro ao despachar jobs")
+            self._wake.wait(self.poll_seconds)
+        with self._idle:
+            self._idle.wait_for(lambda: not self._inflight)
+
+
+# runner do processo da API (main.on_startup / on_shutdown)
+_runner: Optional[AttachmentJobRunner] = None
+
+
+def start_job_runner(engine: Engine) -> Optional[AttachmentJobRunner]:
+    global _runner
+    if settings.ATTACHMENT_WORKERS <= 0 or _runner is not None:
+        return _runner
+    _runner = AttachmentJobRunner(
+        engine,
+        max_workers=settings.ATTACHMENT_WORKERS,
+        poll_seconds=settings.ATTACHMENT_JOB_POLL_SECONDS,
+        max_attempts=settings.ATTACHMENT_JOB_MAX_ATTEMPTS,
+    )
+    _runner.start()
+    logger.info("Pós-processamento de anexos: até %s processos", settings.ATTACHMENT_WORKERS)
+    return _runner
+
+
+def stop_job_runner() -> None:
+    global _runner
+    if _runner is not None:
+        _runner.stop()
+        _runner = None
+
+
+def notify_job_runner() -> None:
+    if _runner is not None:
+        _runner.notify()
@@ -0,0 +1,103 @@
+# app/services/attachment_processing.py
+"""
+Pós-processamento de um anexo: roda nos processos do pool do
+AttachmentJobRunner, fora do processo da API.
+
+Só usa a biblioteca padrão (o módulo é importado em cada processo novo do
+pool); miniaturas de imagens dependem do Pillow, opcional: sem ele, as
+imagens ficam só com o tipo detectado.
+"""
+import codecs
+import hashlib
+import os
+from typing import Dict, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional
+    Image = None
+
+# bytes lidos do início do arquivo para detectar o tipo e montar a prévia
+HEAD_BYTES = 8192
+PREVIEW_CHARS = 500
+THUMBNAIL_SIZE = (256, 256)
+
+# (assinatura no início do arquivo, tipo)
+MAGIC_NUMBERS = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+]
+
+
+def _decode_text(head: bytes) -> Optional[str]:
+    """Texto do início do arquivo se ele parece UTF-8 legível; senão None."""
+    if b"\x00" in head:
+        return None
+    try:
+        # final=False: um caractere cortado no fim de `head` não é erro
+        text = codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return None
+    control = sum(1 for c in text if ord(c) < 32 and c not in "\t\n\r\f")
+    return text if control <= len(text) // 100 else None
+
+
+def sniff_mime(head: bytes) -> str:
+    """Tipo do conteúdo pelos primeiros bytes (não confia no Content-Type do upload)."""
+    for signature, mime in MAGIC_NUMBERS:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if _decode_text(head) is not None:
+        return "text/plain"
+    return "application/octet-stream"
+
+
+def _make_thumbnail(path: str, thumbnail_path: str) -> bool:
+    with Image.open(path) as img:
+        img.thumbnail(THUMBNAIL_SIZE)
+        if img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA")
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        tmp = f"{thumbnail_path}.{os.getpid()}.tmp"
+        img.save(tmp, format="PNG")
+    os.replace(tmp, thumbnail_path)
+    return True
+
+
+def process_attachment(path: str, sha256: Optional[str], thumbnail_path: str) -> Dict[str, object]:
+    """
+    Confere o SHA-256 do arquivo, detecta o tipo e extrai a prévia de
+    texto ou a miniatura (imagens, se houver Pillow). Devolve o resultado
+    como dict; `error` preenchido indica falha definitiva (não adianta
+    tentar de novo). Exceções (ex.: arquivo sumiu) contam como falha
+    temporária para o runner.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+        hasher.update(head)
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    if sha256 and hasher.hexdigest() != sha256:
+        return {"error": "checksum_mismatch"}
+
+    mime = sniff_mime(head)
+    result: Dict[str, object] = {"error": None, "mime_type": mime, "preview": None, "thumbnail_path": None}
+    if mime == "text/plain":
+        result["preview"] = (_decode_text(head) or "")[:PREVIEW_CHARS]
+    elif mime.startswith("image/") and Image is not None:
+        try:
+            if _make_thumbnail(path, thumbnail_path):
+                result["thumbnail_path"] = thumbnail_path
+        except (OSError, ValueError):
+            # imagem que o Pillow não abre: fica sem miniatura
+            pass
+    return result
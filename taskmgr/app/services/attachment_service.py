@@ -1,17 +1,151 @@
 import os
-from fastapi import UploadFile
-from app.models.entities import Attachment
+from typing import Dict, List, Optional
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from app.core.exceptions import NotFoundError
+from app.core.logging_config import logger
+from app.core.storage import BlobStore, file_sha256
+from app.core.uploads import receive_upload
+from app.models.entities import Attachment, Task
+from app.models.sqlite_writer import run_write
+from app.repositories.attachment_job_repo import AttachmentJobRepo
 from app.repositories.attachment_repo import AttachmentRepo
+from app.services.attachment_jobs import notify_job_runner
 from app.core.config import settings
 
+# linhas por commit na migração do layout antigo
+MIGRATE_BATCH_SIZE = 100
+
 class AttachmentService:
     def __init__(self, repo: AttachmentRepo):
         self.repo = repo
-        os.makedirs(settings.FILE_STORAGE_DIR, exist_ok=True)
-
-    async def save(self, task_id: int, file: UploadFile) -> Attachment:
-        dest = os.path.join(settings.FILE_STORAGE_DIR, file.filename)
-        with open(dest, "wb") as f:
-            f.write(await file.read())
-        a = Attachment(task_id=task_id, filename=file.filename, filepath=dest)
-        return self.repo.create(a)
+        self.store = BlobStore(settings.FILE_STORAGE_DIR)
+        os.makedirs(self.store.tmp_dir, exist_ok=True)
+
+    async def save(self, task_id: int, request: Request) -> Attachment:
+        """
+        Recebe o upload em streaming (app.core.uploads) e grava o anexo.
+
+        O arquivo chega num temporário do store, com tamanho e SHA-256
+        calculados durante a leitura, e então é movido (os.replace, atômico)
+        para o caminho do seu hash; se o mesmo conteúdo já existe, o
+        temporário é descartado e o anexo novo aponta para o arquivo existente.
+        O pós-processamento (app.services.attachment_jobs) entra na fila na
+        mesma transação e roda depois, fora do request.
+        """
+        session = self.repo.session
+        if await run_in_threadpool(session.get, Task, task_id) is None:
+            raise NotFoundError("not_found", "Task inexistente.")
+        upload = await receive_upload(
+            request,
+            self.store.tmp_dir,
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
+        a = Attachment(
+            task_id=task_id,
+            filename=upload.filename,
+            filepath=self.store.path_for(upload.sha256),
+            size=upload.size,
+            sha256=upload.sha256,
+            content_type=upload.content_type,
+        )
+
+        def _store_and_insert(s) -> Attachment:
+            # no escritor, serializado com delete(): o arquivo não some entre o put e o insert
+            self.store.put(upload.path, upload.sha256)
+            AttachmentJobRepo(s).enqueue(a)
+            return AttachmentRepo(s).create(a)
+
+        try:
+            saved = await run_in_threadpool(run_write, session, _store_and_insert)
+        except Exception:
+            # insert ou COMMIT do lote falhou depois do put: sem linha, o arquivo fica órfão
+            session.rollback()
+            await run_in_threadpool(self._discard_blob, upload.sha256)
+            raise
+        finally:
+            if os.path.exists(upload.path):
+                os.unlink(upload.path)
+        notify_job_runner()
+        return saved
+
+    def delete(self, attachment_id: int) -> None:
+        """Remove o anexo; o arquivo só é apagado junto com a última referência."""
+
+        def _delete(s) -> Optional[str]:
+            repo = AttachmentRepo(s)
+            a = repo.get(attachment_id)
+            if a is None:
+                raise NotFoundError("not_found", "Anexo inexistente.")
+            AttachmentJobRepo(s).delete_for_attachment(a.id)
+            repo.delete(a)
+            if a.sha256 and repo.count_by_sha256(a.sha256) == 0:
+                return a.sha256
+            return None
+
+        sha256 = run_write(self.repo.session, _delete)
+        # só depois do COMMIT: se o lote fosse desfeito, a linha voltaria sem o arquivo
+        if sha256:
+            self._discard_blob(sha256)
+
+    def _discard_blob(self, sha256: str) -> None:
+        """
+        Apaga o arquivo de `sha256` se nenhum anexo confirmado aponta para
+        ele. Roda no escritor, serializado com os put+insert de save(): um
+        upload do mesmo conteúdo entre o COMMIT e a limpeza é visto aqui.
+        """
+
+        def _purge(s) -> None:
+            if AttachmentRepo(s).count_by_sha256(sha256) == 0:
+                self.store.delete(sha256)
+
+        try:
+            run_write(self.repo.session, _purge)
+        except Exception:
+            # limpeza é best-effort: um arquivo órfão ocupa espaço, mas não quebra nada
+            logger.exception("Falha ao remover o arquivo sem referências %s", sha256)
+
+    def migrate_storage(self) -> Dict[str, int]:
+        """
+        Leva os anexos do layout antigo (FILE_STORAGE_DIR/<nome original>)
+        para o armazenamento por conteúdo: calcula hash e tamanho, coloca o
+        arquivo no store e atualiza a linha. Os arquivos antigos só são
+        apagados depois do commit do lote, então rodar de novo após uma
+        interrupção continua de onde parou. Anexos cujo arquivo sumiu ficam
+        como estão (contados em "missing").
+        """
+        counts = {"migrated": 0, "deduplicated": 0, "missing": 0}
+        hashed: Dict[str, tuple] = {}   # caminho antigo -> (sha256, tamanho)
+        pending: List[str] = []
+
+        def _flush() -> None:
+            self.repo.session.commit()
+            for path in pending:
+                if os.path.exists(path) and not self.store.contains_path(path):
+                    os.unlink(path)
+            pending.clear()
+
+        for a in self.repo.list_all():
+            if a.sha256 and self.store.contains_path(a.filepath):
+                continue
+            src = a.filepath
+            if src not in hashed:
+                if not os.path.exists(src):
+                    logger.warning("Anexo %s: arquivo %s não encontrado", a.id, src)
+                    counts["missing"] += 1
+                    continue
+                sha256, size = file_sha256(src)
+                if self.store.exists(sha256):
+                    counts["deduplicated"] += 1
+                self.store.link(src, sha256)
+                hashed[src] = (sha256, size)
+                pending.append(src)
+            a.sha256, a.size = hashed[src]
+            a.filepath = self.store.path_for(a.sha256)
+            self.repo.session.add(a)
+            counts["migrated"] += 1
+            if counts["migrated"] % MIGRATE_BATCH_SIZE == 0:
+                _flush()
+        _flush()
+        return counts
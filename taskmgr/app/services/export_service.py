@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+from app.core.logging_config import logger
+from app.repositories.task_repo import EXPORT_COLUMNS, TaskRepo
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class TaskExportService:
+    """Gera o export de tasks em pedaços de texto, sem materializar o resultado."""
+
+    def __init__(self, repo: TaskRepo, chunk_rows: int = 500):
+        self.repo = repo
+        self.chunk_rows = chunk_rows
+
+    def stream(self, fmt: str, **filters) -> Iterator[str]:
+        logger.info("Exportando tasks: format=%s, filtros=%s", fmt, filters)
+        rows = self.repo.iter_export_rows(**filters)
+        if fmt == "csv":
+            yield from self._csv_chunks(rows)
+        else:
+            yield from self._ndjson_chunks(rows)
+
+    def _ndjson_chunks(self, rows) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            item = dict(zip(EXPORT_COLUMNS, row))
+            if item["due_date"] is not None:
+                item["due_date"] = item["due_date"].isoformat()
+            lines.append(json.dumps(item, ensure_ascii=False))
+            if len(lines) >= self.chunk_rows:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    def _csv_chunks(self, rows) -> Iterator[str]:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_COLUMNS)
+        pending = 0
+        for row in rows:
+            *cols, tags = row
+            writer.writerow([*cols, "|".join(tags)])
+            pending += 1
+            if pending >= self.chunk_rows:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+                pending = 0
+        yield buf.getvalue()
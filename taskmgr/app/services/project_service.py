@@ -1,9 +1,21 @@
-from types import SimpleNamespace
-from typing import Iterable
+from app.repositories.project_repo import AsyncProjectRepo, ProjectRepo
+from app.repositories.task_repo import AsyncTaskRepo, TaskRepo
+from app.core.logging_config import get_logger
 
-from app.repositories.project_repo import ProjectRepo
-from app.repositories.task_repo import TaskRepo
-from app.core.logging_config import logger
+logger = get_logger("projects")
+
+# Quantos ids de tarefas bloqueantes são buscados para o log
+BLOCKING_IDS_IN_LOG = 5
+
+
+def blocks_archive(task) -> bool:
+    """
+    Regra: tarefa crítica (prioridade <= 2) não concluída impede o arquivamento.
+
+    É a fonte da regra; TaskRepo.archive_candidates repete o filtro em SQL
+    só para limitar a consulta.
+    """
+    return task.priority <= 2 and task.status != "DONE"
 
 
 class ProjectService:
@@ -14,12 +26,10 @@ class ProjectService:
     def can_archive(self, project_id: int) -> bool:
         logger.info("Verificando se projeto id=%s pode ser arquivado", project_id)
 
-        tasks = self.tasks.list_with_filters(project_id=project_id)
-
-        blocking_tasks = [
-            t for t in tasks
-            if t.priority <= 2 and t.status != "DONE"
-        ]
+        # O repositório devolve só as primeiras candidatas (consulta limitada);
+        # a regra é aplicada aqui.
+        candidates = self.tasks.archive_candidates(project_id, limit=BLOCKING_IDS_IN_LOG)
+        blocking_tasks = [t for t in candidates if blocks_archive(t)]
 
         if blocking_tasks:
             # Nem todo objeto de teste tem atributo id, então usamos getattr.
@@ -33,3 +43,16 @@ class ProjectService:
 
         logger.info("Projeto %s pode ser arquivado", project_id)
         return True
+
+
+class AsyncProjectService:
+    """ProjectService para as rotas assíncronas (ver AsyncTaskService)."""
+
+    def __init__(self, projects: AsyncProjectRepo, tasks: AsyncTaskRepo):
+        self.projects = projects
+        self.tasks = tasks
+
+    async def can_archive(self, project_id: int) -> bool:
+        return await self.tasks.run(
+            lambda tasks: ProjectService(ProjectRepo(tasks.session), tasks).can_archive(project_id)
+        )
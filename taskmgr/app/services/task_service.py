@@ -1,9 +1,13 @@
+from collections import Counter
 from datetime import date
+from typing import List, Optional, Tuple, Union
 from app.core.config import settings
 from app.core.exceptions import DomainError, ValidationError, NotFoundError
-from app.core.logging_config import logger  # 👈 novo import
+from app.core.logging_config import get_logger
 from app.models.entities import Task
-from app.repositories.task_repo import TaskRepo
+from app.repositories.task_repo import AsyncTaskRepo, TaskRepo
+
+logger = get_logger("tasks")
 
 
 class TaskService:
@@ -53,6 +57,61 @@ class TaskService:
         logger.info("Tarefa criada com sucesso: id=%s", task.id)
         return task
 
+    def create_tasks_bulk(
+        self, items: List[Tuple[Task, List[int]]]
+    ) -> List[Union[int, DomainError]]:
+        """
+        Cria várias tarefas aplicando as mesmas regras de create_task.
+
+        O limite de abertas por usuário é calculado sobre o lote inteiro
+        (abertas atuais + abertas do lote, na ordem do lote). Retorna, para
+        cada item, o id criado ou o DomainError que o impediu.
+        """
+        logger.info("Criando %s tarefas em lote", len(items))
+        results: List[Optional[Union[int, DomainError]]] = [None] * len(items)
+        limit = settings.MAX_OPEN_TASKS_PER_USER
+        today = date.today()
+
+        assignees = {
+            t.assignee_id for t, _ in items
+            if t.assignee_id is not None and t.status != "DONE"
+        }
+        open_counts = self.repo.open_counts_for_users(assignees) if assignees else {}
+        batch_open = Counter()
+
+        accepted = []
+        for i, (data, tag_ids) in enumerate(items):
+            # Regra: data de vencimento não pode estar no passado
+            if data.due_date and data.due_date < today:
+                results[i] = ValidationError(
+                    "due_date_past",
+                    "A data de vencimento não pode estar no passado.",
+                )
+                continue
+            # Regra: limite de tarefas abertas por usuário (considerando o lote)
+            uid = data.assignee_id
+            if uid is not None and data.status != "DONE":
+                open_count = open_counts.get(uid, 0) + batch_open[uid]
+                if open_count >= limit:
+                    results[i] = _user_overload(open_count, limit)
+                    continue
+                batch_open[uid] += 1
+            accepted.append(i)
+
+        ids = self.repo.bulk_create([items[i] for i in accepted])
+        for i, task_id in zip(accepted, ids):
+            # None: vaga tomada por outra requisição concorrente entre a
+            # checagem acima e o insert (o repo reserva as vagas atomicamente)
+            results[i] = task_id if task_id is not None else _user_overload(limit, limit)
+
+        failed = sum(1 for r in results if isinstance(r, DomainError))
+        logger.info(
+            "Lote de tarefas processado: criadas=%s, recusadas=%s",
+            len(results) - failed,
+            failed,
+        )
+        return results
+
     def update_status(self, task_id: int, new_status: str) -> Task:
         logger.info(
             "Alterando status da task id=%s para %s",
@@ -87,3 +146,100 @@ class TaskService:
             updated.status,
         )
         return updated
+
+
+    def update_status_bulk(
+        self,
+        new_status: str,
+        *,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[Tuple[int, Union[str, DomainError]]]:
+        """
+        Altera o status de várias tarefas (por ids ou por filtro).
+
+        Lê o conjunto alvo numa consulta, aplica a regra "não pode DONE sem
+        responsável" a todos de uma vez e grava as permitidas com um UPDATE
+        por conjunto. Retorna (id, novo status ou DomainError) por tarefa,
+        na ordem dos ids pedidos (ou do id, quando por filtro). Um filtro que
+        pega mais de MAX_BULK_ITEMS tarefas é recusado inteiro (bulk_too_large).
+        """
+        logger.info(
+            "Alterando status em lote para %s: ids=%s, filtros=%s",
+            new_status,
+            None if ids is None else len(ids),
+            filters,
+        )
+        limit = settings.MAX_BULK_ITEMS
+        rows = self.repo.status_snapshot(ids=ids, filters=filters, limit=limit)
+        if ids is None and len(rows) > limit:
+            # mesmo limite (e código) da lista de ids, checada na rota
+            raise ValidationError("bulk_too_large", f"Máximo de {limit} tarefas por lote.")
+        found = {r[0]: r for r in rows}
+
+        outcomes: List[Tuple[int, Union[str, DomainError]]] = []
+        allowed = []
+        targets = list(dict.fromkeys(ids)) if ids is not None else [r[0] for r in rows]
+        for task_id in targets:
+            row = found.get(task_id)
+            if row is None:
+                outcomes.append((task_id, NotFoundError("not_found", "Task inexistente.")))
+                continue
+            # Regra: não pode DONE sem responsável
+            if new_status == "DONE" and not row[2]:
+                outcomes.append((task_id, ValidationError(
+                    "no_assignee",
+                    "Tarefa não pode ser concluída sem responsável.",
+                )))
+                continue
+            allowed.append(row)
+            outcomes.append((task_id, new_status))
+
+        self.repo.apply_status_change(allowed, new_status)
+
+        failed = sum(1 for _, r in outcomes if isinstance(r, DomainError))
+        logger.info(
+            "Status em lote aplicado: alteradas=%s, recusadas=%s",
+            len(outcomes) - failed,
+            failed,
+        )
+        return outcomes
+
+
+def _user_overload(open_count: int, limit: int) -> DomainError:
+    return DomainError(
+        "user_overload",
+        f"Usuário já possui {open_count} tarefas abertas (limite {limit}).",
+    )
+
+
+class AsyncTaskService:
+    """
+    TaskService para as rotas assíncronas: as mesmas regras, executadas
+    sobre a sessão síncrona por trás da AsyncSession (AsyncTaskRepo.run).
+    """
+
+    def __init__(self, repo: AsyncTaskRepo):
+        self.repo = repo
+
+    async def create_task(self, data: Task, tag_ids) -> Task:
+        return await self.repo.write(lambda repo: TaskService(repo).create_task(data, tag_ids))
+
+    async def create_tasks_bulk(
+        self, items: List[Tuple[Task, List[int]]]
+    ) -> List[Union[int, DomainError]]:
+        return await self.repo.write(lambda repo: TaskService(repo).create_tasks_bulk(items))
+
+    async def update_status(self, task_id: int, new_status: str) -> Task:
+        return await self.repo.write(lambda repo: TaskService(repo).update_status(task_id, new_status))
+
+    async def update_status_bulk(
+        self,
+        new_status: str,
+        *,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[Tuple[int, Union[str, DomainError]]]:
+        return await self.repo.write(
+            lambda repo: TaskService(repo).update_status_bulk(new_status, ids=ids, filters=filters)
+        )
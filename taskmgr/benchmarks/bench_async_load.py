@@ -0,0 +1,125 @@
+"""
+Benchmark: latência sob carga, rotas síncronas x assíncronas (ASYNC_DB).
+
+Sobe as duas versões da aplicação no mesmo processo (httpx + ASGI, sem rede)
+sobre o mesmo banco SQLite temporário e dispara `--clients` clientes
+concorrentes, cada um fazendo `--requests` leituras (listagem paginada de
+tasks e progresso do projeto). As rotas síncronas disputam as threads do
+threadpool do FastAPI; as assíncronas não ocupam thread esperando o banco.
+O cache de respostas fica desligado (a não ser com --cache) para medir o
+caminho até o banco.
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_async_load
+    python -m benchmarks.bench_async_load --clients 500 --requests 4 --tasks 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import deps
+from app.core.config import settings
+from app.main import create_app
+from app.models import migrations
+from app.models.db import create_async_db_engine
+from app.models.entities import Project, Task
+
+PROJECTS = 10
+
+
+def seed(url: str, n_tasks: int) -> None:
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add_all(Project(id=i, name=f"P{i}") for i in range(1, PROJECTS + 1))
+        s.add_all(
+            Task(title=f"Tarefa {i}", priority=(i % 5) + 1, project_id=(i % PROJECTS) + 1)
+            for i in range(n_tasks)
+        )
+        s.commit()
+    engine.dispose()
+
+
+def build_app(url: str, async_db: bool):
+    app = create_app(async_db=async_db)
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    async_engine = create_async_db_engine(url)
+
+    def _session():
+        with Session(engine) as session:
+            yield session
+
+    async def _async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[deps.get_session] = _session
+    app.dependency_overrides[deps.get_async_session] = _async_session
+    return app, async_engine
+
+
+async def run_load(url: str, async_db: bool, clients: int, requests: int) -> dict:
+    app, async_engine = build_app(url, async_db)
+    latencies = []
+
+    async def _client(ac: AsyncClient, n: int):
+        project_id = (n % PROJECTS) + 1
+        for i in range(requests):
+            if i % 2:
+                url = f"/api/v1/projects/{project_id}/progress"
+            else:
+                url = f"/api/v1/tasks?project_id={project_id}&limit=50"
+            t0 = time.perf_counter()
+            resp = await ac.get(url)
+            latencies.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.text
+
+    async with AsyncClient(app=app, base_url="http://bench") as ac:
+        await ac.get("/api/v1/tasks?limit=1")  # aquece conexões e caches de processo
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client(ac, n) for n in range(clients)))
+        elapsed = time.perf_counter() - t0
+    await async_engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4, help="requests por cliente")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--cache", action="store_true", help="mantém o cache de respostas ligado")
+    args = parser.parse_args(argv)
+
+    settings.RESPONSE_CACHE_ENABLED = args.cache
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(url, args.tasks)
+
+        print(f"{args.clients} clientes x {args.requests} requests, {args.tasks} tasks")
+        print(f"{'modo':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'req/s':>8}")
+        for mode, async_db in (("sync", False), ("async", True)):
+            result = asyncio.run(run_load(url, async_db, args.clients, args.requests))
+            print(
+                f"{mode:>8} {result['p50']:>9.1f} {result['p95']:>9.1f} "
+                f"{result['p99']:>9.1f} {result['rps']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
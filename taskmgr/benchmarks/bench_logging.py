@@ -0,0 +1,127 @@
+"""
+Benchmark: vazão de requests com o logging desligado x ligado.
+
+Cada modo sobe a aplicação (httpx + ASGI, sem rede) sobre um banco SQLite
+novo e dispara `--clients` clientes concorrentes, cada um fazendo
+`--requests` requests que alternam criar uma task (várias linhas INFO do
+TaskService) e listar tasks. Os logs vão para um arquivo rotativo de
+`--max-bytes` no diretório temporário (o console fica de fora para não
+medir o terminal).
+
+Modos:
+- `off`: LOG_LEVEL=WARNING, nenhuma linha escrita;
+- `sync`: handlers direto no logger, escrita e rotação na thread do request;
+- `queue`: QueueHandler + listener (padrão da aplicação);
+- `queue+json`: idem, em JSON com request_id;
+- `queue+amostra`: idem, mantendo 10% das linhas INFO de taskmgr.tasks.
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --clients 100 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from httpx import AsyncClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import deps
+from app.core.config import settings
+from app.core.logging_config import configure_logging, stop_logging
+from app.main import create_app
+from app.models import migrations
+from app.models.entities import Project
+from app.models.sqlite_writer import configure_sqlite, stop_writers
+
+PROJECTS = 10
+MODES = {
+    # nome: argumentos de configure_logging
+    "off": dict(level="WARNING", use_queue=False),
+    "sync": dict(level="INFO", use_queue=False),
+    "queue": dict(level="INFO", use_queue=True),
+    "queue+json": dict(level="INFO", use_queue=True, json_format=True),
+    "queue+amostra": dict(level="INFO", use_queue=True, sampling={"taskmgr.tasks": 0.1}),
+}
+
+
+def build_app(url: str):
+    engine = configure_sqlite(create_engine(url, connect_args={"check_same_thread": False}))
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add_all(Project(id=i, name=f"P{i}") for i in range(1, PROJECTS + 1))
+        s.commit()
+
+    def _session():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app(async_db=False)
+    app.dependency_overrides[deps.get_session] = _session
+    return app, engine
+
+
+async def run_load(app, clients: int, requests: int) -> dict:
+    latencies = []
+
+    async def _client(ac: AsyncClient, n: int):
+        project_id = (n % PROJECTS) + 1
+        for i in range(requests):
+            t0 = time.perf_counter()
+            if i % 2:
+                resp = await ac.get(f"/api/v1/tasks?project_id={project_id}&limit=20")
+            else:
+                resp = await ac.post("/api/v1/tasks", json={"title": f"T{n}-{i}", "project_id": project_id})
+            latencies.append(time.perf_counter() - t0)
+            assert resp.status_code < 300, resp.text
+
+    async with AsyncClient(app=app, base_url="http://bench") as ac:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client(ac, n) for n in range(clients)))
+        elapsed = time.perf_counter() - t0
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {"p50": quantiles[49] * 1000, "p99": quantiles[98] * 1000, "rps": len(latencies) / elapsed}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="requests por cliente")
+    parser.add_argument("--max-bytes", type=int, default=200_000, help="tamanho para rotação do log")
+    args = parser.parse_args(argv)
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    print(f"{args.clients} clientes x {args.requests} requests (metade criando tasks)")
+    print(f"{'modo':>14} {'p50 (ms)':>9} {'p99 (ms)':>9} {'req/s':>8} {'linhas':>8}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode, kwargs in MODES.items():
+                log_path = os.path.join(tmp, f"{mode}.log")
+                handler = RotatingFileHandler(log_path, maxBytes=args.max_bytes, backupCount=3, encoding="utf-8")
+                configure_logging(handlers=[handler], **kwargs)
+                app, engine = build_app(f"sqlite:///{os.path.join(tmp, mode + '.db')}")
+                result = asyncio.run(run_load(app, args.clients, args.requests))
+                stop_logging()
+                stop_writers()
+                engine.dispose()
+                lines = 0
+                for name in os.listdir(tmp):
+                    if name.startswith(f"{mode}.log"):
+                        with open(os.path.join(tmp, name), encoding="utf-8") as f:
+                            lines += sum(1 for _ in f)
+                print(
+                    f"{mode:>14} {result['p50']:>9.1f} {result['p99']:>9.1f} "
+                    f"{result['rps']:>8.0f} {lines:>8}"
+                )
+    finally:
+        configure_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: custo do MetricsMiddleware por request.
+
+Chama a aplicação ASGI diretamente (sem servidor nem cliente HTTP, que
+esconderiam microssegundos no ruído) `--requests` vezes, com e sem o
+middleware, em dois cenários:
+
+- `asgi vazio`: app mínimo que só responde 200 — isola o custo do
+  middleware (tempo e bytes medidos, busca da série, histograma);
+- `GET /health`: a aplicação FastAPI completa, para comparar com o custo
+  de um request real.
+
+A diferença entre as colunas é o overhead por request (alvo: poucos µs).
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_metrics
+    python -m benchmarks.bench_metrics --requests 100000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.metrics import Metrics, MetricsMiddleware
+from app.main import create_app
+
+BODY = b'{"status":"ok"}'
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-length", b"%d" % len(BODY))]})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept", b"*/*")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+
+async def per_request_us(app, path: str, n: int) -> float:
+    for _ in range(min(n, 1000)):  # aquecimento
+        await app(_scope(path), _receive, _send)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await app(_scope(path), _receive, _send)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    settings.METRICS_ENABLED = False
+    plain_app = create_app(async_db=False)
+    # o registro do benchmark não mistura números com o do processo
+    registry = Metrics()
+
+    print(f"{args.requests} requests por medição (µs por request)")
+    print(f"{'cenário':>12} {'sem':>8} {'com':>8} {'overhead':>9}")
+    for label, app, path in (
+        ("asgi vazio", empty_app, "/"),
+        ("GET /health", plain_app, "/api/v1/health"),
+    ):
+        without = asyncio.run(per_request_us(app, path, args.requests))
+        with_metrics = asyncio.run(per_request_us(MetricsMiddleware(app, registry), path, args.requests))
+        print(f"{label:>12} {without:>8.2f} {with_metrics:>8.2f} {with_metrics - without:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
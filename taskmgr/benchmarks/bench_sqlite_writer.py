@@ -0,0 +1,149 @@
+"""
+Benchmark: carga mista de leituras e escritas no SQLite.
+
+Compara três configurações sobre um banco novo em cada rodada:
+
+- `delete`: journal padrão (rollback journal), cada thread escreve direto;
+- `wal`: WAL, cada thread ainda escreve direto (disputa pelo lock de escrita);
+- `escritor`: WAL + escritor único com group commit (run_write).
+
+`--threads` threads (como o threadpool do FastAPI) repetem `--ops`
+operações: com probabilidade `--writes` criam uma task (TaskRepo.create,
+com contadores e versões), senão leem uma página de tasks do projeto.
+Mostra p50/p99 de leitura e de escrita, operações por segundo e quantas
+escritas falharam com "database is locked".
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_sqlite_writer
+    python -m benchmarks.bench_sqlite_writer --threads 64 --ops 200 --writes 0.5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.config import settings
+from app.models import migrations
+from app.models.entities import Project, Task
+from app.models.sqlite_writer import configure_sqlite, run_write, stop_writers
+from app.repositories.task_repo import TaskRepo
+
+PROJECTS = 10
+MODES = {
+    # nome: (SQLITE_WAL, SQLITE_WRITER_ENABLED)
+    "delete": (False, False),
+    "wal": (True, False),
+    "escritor": (True, True),
+}
+
+
+def seed(engine, n_tasks: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add_all(Project(id=i, name=f"P{i}") for i in range(1, PROJECTS + 1))
+        s.add_all(
+            Task(title=f"Tarefa {i}", priority=(i % 5) + 1, project_id=(i % PROJECTS) + 1)
+            for i in range(n_tasks)
+        )
+        s.commit()
+
+
+def run_mode(path: str, wal: bool, writer: bool, args) -> dict:
+    settings.SQLITE_WAL = wal
+    settings.SQLITE_WRITER_ENABLED = writer
+    engine = configure_sqlite(
+        create_engine(f"sqlite:///{path}", pool_size=args.threads, max_overflow=0)
+    )
+    seed(engine, args.tasks)
+
+    reads, writes = [], []
+    locked = 0
+    lock = threading.Lock()
+    start = threading.Barrier(args.threads)
+
+    def _worker(n: int):
+        nonlocal locked
+        rnd = random.Random(n)
+        my_reads, my_writes, my_locked = [], [], 0
+        start.wait()
+        for _ in range(args.ops):
+            project_id = rnd.randint(1, PROJECTS)
+            t0 = time.perf_counter()
+            with Session(engine) as session:
+                if rnd.random() < args.writes:
+                    task = Task(title="nova", priority=3, project_id=project_id)
+                    try:
+                        run_write(session, lambda s: TaskRepo(s).create(task, []))
+                    except OperationalError:
+                        my_locked += 1
+                        continue
+                    my_writes.append(time.perf_counter() - t0)
+                else:
+                    TaskRepo(session).list_page(limit=50, project_id=project_id, as_rows=True)
+                    my_reads.append(time.perf_counter() - t0)
+        with lock:
+            reads.extend(my_reads)
+            writes.extend(my_writes)
+            locked += my_locked
+
+    threads = [threading.Thread(target=_worker, args=(n,)) for n in range(args.threads)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stop_writers()
+    engine.dispose()
+
+    return {
+        "read_p50": _quantile(reads, 50),
+        "read_p99": _quantile(reads, 99),
+        "write_p50": _quantile(writes, 50),
+        "write_p99": _quantile(writes, 99),
+        "ops": (len(reads) + len(writes)) / elapsed,
+        "locked": locked,
+    }
+
+
+def _quantile(samples, q: int) -> float:
+    if len(samples) < 2:
+        return float("nan")
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=100, help="operações por thread")
+    parser.add_argument("--writes", type=float, default=0.2, help="fração de escritas")
+    parser.add_argument("--tasks", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    # leituras direto no banco (o cache de respostas não entra aqui)
+    print(
+        f"{args.threads} threads x {args.ops} operações, "
+        f"{args.writes:.0%} escritas, {args.tasks} tasks"
+    )
+    print(
+        f"{'modo':>9} {'leit p50':>9} {'leit p99':>9} {'escr p50':>9} "
+        f"{'escr p99':>9} {'ops/s':>7} {'locked':>7}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, (wal, writer) in MODES.items():
+            r = run_mode(os.path.join(tmp, f"{mode}.db"), wal, writer, args)
+            print(
+                f"{mode:>9} {r['read_p50']:>9.2f} {r['read_p99']:>9.2f} {r['write_p50']:>9.2f} "
+                f"{r['write_p99']:>9.2f} {r['ops']:>7.0f} {r['locked']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
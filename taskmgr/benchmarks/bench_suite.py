@@ -0,0 +1,279 @@
+"""
+Benchmark: suíte reprodutível das operações principais sobre uma massa grande.
+
+A massa vem de benchmarks.dataset (projetos, tasks, tags e usuários
+parametrizáveis, semente fixa, responsáveis e tags com cauda longa) e fica
+em cache; cada execução trabalha numa cópia, então criações e uploads não
+alteram a massa e duas execuções com os mesmos parâmetros medem o mesmo banco.
+
+Operações medidas (cada uma: 1 aquecimento + até `--repeat` repetições,
+no mínimo 3, dentro de `--max-seconds`):
+
+- TaskRepo.list_with_filters (as_rows) com cada filtro: status, projeto,
+  responsável (o mais carregado e um típico), tag (frequente e rara),
+  várias tags (`all`) e busca textual;
+- TaskRepo.list_page (primeira página de 50) com os mesmos filtros;
+- ProjectRepo.progress, ProjectService.can_archive, TaskRepo.count_open_by_user;
+- criação de task (TaskService pelo escritor, run_write);
+- upload de anexo (POST /attachments na aplicação, sem servidor).
+
+Mostra mínimo, mediana, p95 e média em ms, linhas devolvidas e consultas
+SQL por chamada. `--output` grava tudo em JSON (com spec da massa, commit,
+versões de Python/SQLite); `--compare` compara com um JSON anterior pela
+mediana e sai com código 1 se alguma operação piorou mais que `--threshold`
+(e mais que `--min-delta-ms`, para não acusar ruído em operações de µs).
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --compare baseline.json --threshold 0.2
+    python -m benchmarks.bench_suite --tasks 100000 --projects 100 --only list
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from app.core.config import settings
+from app.core.deps import get_session as api_get_session
+from app.core.logging_config import configure_logging
+from app.core.query_stats import QUERY_COUNT_HEADER, instrument_engine, track_queries
+from app.main import create_app
+from app.models.db import get_session
+from app.models.entities import Task
+from app.models.sqlite_writer import configure_sqlite, run_write, stop_writers
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from benchmarks.dataset import DatasetSpec, add_spec_arguments, ensure_dataset, spec_from_args
+
+PAGE_SIZE = 50
+MIN_RUNS = 3
+
+
+def _filters(spec: DatasetSpec) -> Dict[str, dict]:
+    """Filtros medidos; ids escolhidos pela forma das distribuições da massa."""
+    return {
+        "status": {"status": "IN_PROGRESS"},
+        "project": {"project_id": 1},
+        "assignee_heavy": {"assignee_id": 1},               # topo da cauda de Zipf
+        "assignee_typical": {"assignee_id": max(1, spec.users // 10)},
+        "tag_common": {"tag": "tag001"},
+        "tag_rare": {"tag": f"tag{spec.tags:03d}"},
+        "tag_all": {"tag": ["tag001", "tag002"], "tag_mode": "all"},
+        "q": {"q": "deploy"},
+        "project_status": {"project_id": 1, "status": "OPEN"},
+    }
+
+
+def _time(fn: Callable[[], Tuple[int, int]], repeat: int, max_seconds: float) -> dict:
+    rows, _ = fn()  # aquecimento (cache de páginas do SQLite, statements compilados)
+    samples: List[float] = []
+    queries: List[int] = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < repeat and (len(samples) < MIN_RUNS or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        rows, count = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+        queries.append(count)
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+        "mean_ms": statistics.fmean(samples),
+        "rows": rows,
+        "queries": max(queries),
+    }
+
+
+def _benchmarks(engine, spec: DatasetSpec, storage_dir: str, upload_bytes: int) -> Dict[str, Callable]:
+    """nome -> função que executa a operação uma vez e devolve (linhas, consultas SQL)."""
+    def reading(op: Callable[[Session], object]) -> Callable[[], Tuple[int, int]]:
+        def run() -> Tuple[int, int]:
+            with track_queries() as stats, Session(engine) as s:
+                result = op(s)
+            # listas contam as linhas; valores únicos (progresso, contador) contam 1
+            return (len(result) if isinstance(result, list) else 1), stats.count
+        return run
+
+    benches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+    for name, filters in _filters(spec).items():
+        benches[f"list.{name}"] = reading(
+            lambda s, f=filters: TaskRepo(s).list_with_filters(as_rows=True, **f)
+        )
+        benches[f"page.{name}"] = reading(
+            lambda s, f=filters: TaskRepo(s).list_page(limit=PAGE_SIZE, as_rows=True, **f)[0]
+        )
+    benches["project.progress"] = reading(lambda s: ProjectRepo(s).progress(1))
+    benches["project.can_archive"] = reading(
+        lambda s: ProjectService(ProjectRepo(s), TaskRepo(s)).can_archive(1)
+    )
+    benches["user.count_open"] = reading(lambda s: TaskRepo(s).count_open_by_user(1))
+
+    counter = iter(range(1, 1 << 62))
+
+    def create_task() -> Tuple[int, int]:
+        with track_queries() as stats, Session(engine) as s:
+            run_write(s, lambda ws: TaskService(TaskRepo(ws)).create_task(
+                Task(title=f"Bench {next(counter)}", priority=3, project_id=1), []
+            ))
+        return 1, stats.count
+    benches["task.create"] = create_task
+
+    app = create_app(async_db=False)
+
+    def bench_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = bench_session
+    app.dependency_overrides[api_get_session] = bench_session
+    # sem `with`: não roda o startup (criação de tabelas no banco padrão, processador de anexos)
+    client = TestClient(app)
+    payload = os.urandom(upload_bytes)
+    settings.FILE_STORAGE_DIR = storage_dir
+
+    def upload() -> Tuple[int, int]:
+        resp = client.post(
+            "/api/v1/attachments",
+            params={"task_id": 1},
+            files={"file": (f"bench-{next(counter)}.bin", payload, "application/octet-stream")},
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(f"upload falhou: {resp.status_code} {resp.text}")
+        # o request roda no contexto do TestClient: a contagem vem do header (DEBUG)
+        return 1, int(resp.headers[QUERY_COUNT_HEADER])
+    benches["attachment.upload"] = upload
+    return benches
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(__file__), timeout=10,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def _meta(spec: DatasetSpec, args) -> dict:
+    return {
+        "dataset": spec._asdict(),
+        "repeat": args.repeat,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(spec: DatasetSpec, args) -> Dict[str, dict]:
+    source = ensure_dataset(spec, rebuild=args.rebuild)
+    workdir = tempfile.mkdtemp(prefix="taskmgr-bench-")
+    path = os.path.join(workdir, "bench.db")
+    shutil.copyfile(source, path)
+    engine = instrument_engine(configure_sqlite(create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )))
+    results: Dict[str, dict] = {}
+    try:
+        benches = _benchmarks(engine, spec, os.path.join(workdir, "files"), args.upload_kb * 1024)
+        for name, fn in benches.items():
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            results[name] = _time(fn, args.repeat, args.max_seconds)
+            r = results[name]
+            print(
+                f"{name:>24} {r['min_ms']:>9.2f} {r['median_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+                f"{r['mean_ms']:>9.2f} {r['runs']:>5} {r['rows']:>8} {r['queries']:>4}",
+                flush=True,
+            )
+    finally:
+        stop_writers()
+        engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Imprime a comparação pela mediana e devolve as operações que regrediram."""
+    if baseline.get("meta", {}).get("dataset") != current["meta"]["dataset"]:
+        print("AVISO: a massa de dados do baseline é diferente da atual; comparação pouco útil")
+    print(f"\ncomparação com o baseline (commit {baseline.get('meta', {}).get('commit')}), mediana em ms")
+    print(f"{'operação':>24} {'antes':>9} {'agora':>9} {'variação':>9}  situação")
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:>24} {'-':>9} {now['median_ms']:>9.2f} {'-':>9}  nova")
+            continue
+        old, new = before["median_ms"], now["median_ms"]
+        change = (new - old) / old if old else 0.0
+        if change > threshold and new - old > min_delta_ms:
+            status = "REGREDIU"
+            regressions.append(name)
+        elif change < -threshold and old - new > min_delta_ms:
+            status = "melhorou"
+        else:
+            status = "ok"
+        print(f"{name:>24} {old:>9.2f} {new:>9.2f} {change:>+8.0%}  {status}")
+    return regressions
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20, help="repetições por operação (mínimo 3)")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="tempo máximo por operação")
+    parser.add_argument("--upload-kb", type=int, default=256)
+    parser.add_argument("--only", nargs="*", help="prefixos de operações (ex.: list page task.create)")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior (baseline)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora relativa tolerada (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="piora absoluta mínima para acusar")
+    args = parser.parse_args(argv)
+
+    # só o que é medido: sem logs de INFO por chamada nem EXPLAIN de consultas lentas
+    configure_logging("WARNING", use_queue=False)
+    settings.SQL_SLOW_QUERY_MS = 0
+    settings.DEBUG = True   # X-DB-Query-Count nas respostas (consultas do upload)
+    settings.RESPONSE_CACHE_ENABLED = False
+    settings.METRICS_ENABLED = False
+
+    spec = spec_from_args(args)
+    print(f"massa {spec.key}; tempos em ms")
+    print(f"{'operação':>24} {'mín':>9} {'mediana':>9} {'p95':>9} {'média':>9} {'runs':>5} {'linhas':>8} {'sql':>4}")
+    current = {"meta": _meta(spec, args), "results": run_suite(spec, args)}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"\nresultados em {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} operação(ões) acima do limite: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
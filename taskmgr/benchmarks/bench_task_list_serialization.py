@@ -0,0 +1,87 @@
+"""
+Benchmark: serialização da listagem de tasks (caminho pydantic x caminho rápido).
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.bench_task_list_serialization
+    python -m benchmarks.bench_task_list_serialization --sizes 1000 10000 --repeat 5
+"""
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.responses import JSONResponse
+
+from app.core.responses import encode_task_list
+from app.models import db  # noqa: F401 - registra índice FTS e modelos
+from app.models.entities import Project, Tag, Task, TaskTagLink
+from app.models.schemas import TaskOut
+from app.repositories.task_repo import TaskRepo
+
+
+def seed(n: int):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add_all(Tag(id=i, name=f"tag{i}") for i in range(1, 6))
+        s.add_all(
+            Task(id=i, title=f"Tarefa {i}", description="descrição " * 5,
+                 priority=(i % 5) + 1, project_id=1)
+            for i in range(1, n + 1)
+        )
+        s.add_all(TaskTagLink(task_id=i, tag_id=(i % 5) + 1) for i in range(1, n + 1, 2))
+        s.commit()
+    return engine
+
+
+def pydantic_path(session: Session) -> bytes:
+    repo = TaskRepo(session)
+    tasks = repo.list_with_filters(project_id=1)
+    tags = repo.tag_names_for_tasks(t.id for t in tasks)
+    out = [
+        TaskOut(
+            id=t.id, title=t.title, description=t.description, status=t.status,
+            priority=t.priority, due_date=t.due_date, project_id=t.project_id,
+            assignee_id=t.assignee_id, tags=tags[t.id],
+        )
+        for t in tasks
+    ]
+    return JSONResponse(jsonable_encoder(out)).body
+
+
+def fast_path(session: Session) -> bytes:
+    repo = TaskRepo(session)
+    rows = repo.list_with_filters(project_id=1, as_rows=True)
+    tags = repo.tag_names_for_tasks(r[0] for r in rows)
+    return encode_task_list(rows, tags)
+
+
+def best_of(fn, engine, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with Session(engine) as s:  # sessão nova: identity map vazio, como numa request
+            t0 = time.perf_counter()
+            fn(s)
+            best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'linhas':>8} {'pydantic (ms)':>14} {'rápido (ms)':>12} {'ganho':>7}")
+    for n in args.sizes:
+        engine = seed(n)
+        with Session(engine) as s:
+            assert pydantic_path(s) == fast_path(s)
+        slow = best_of(pydantic_path, engine, args.repeat)
+        fast = best_of(fast_path, engine, args.repeat)
+        print(f"{n:>8} {slow * 1000:>14.1f} {fast * 1000:>12.1f} {slow / fast:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
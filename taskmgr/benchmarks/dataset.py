@@ -0,0 +1,204 @@
+"""
+Massa de dados sintética e reprodutível para os benchmarks.
+
+Com a mesma DatasetSpec (tamanhos + semente) o banco gerado é sempre o
+mesmo. Distribuições pensadas para parecer uso real, não tabela uniforme:
+
+- responsáveis com cauda longa (Zipf, expoente ASSIGNEE_SKEW): poucos
+  usuários concentram muitas tasks, a maioria tem poucas; ~30% sem responsável;
+- tags também por Zipf: algumas tags aparecem em boa parte das tasks;
+  cada task tem de 0 a 3 tags;
+- status ~50% OPEN, 20% IN_PROGRESS, 30% DONE; prioridade 1..5;
+- títulos com palavras de um vocabulário pequeno, para a busca textual.
+
+As tasks entram por INSERT direto no SQLite, sem o trigger de inserção do
+índice FTS (inserir linha a linha no FTS domina o tempo de carga); no fim o
+índice é reconstruído de uma vez, o trigger volta, e os contadores
+(project_stats, user_task_stats) são recalculados pelos próprios repositórios. O banco fica em cache em
+benchmarks/.data/, com nome derivado da spec e da versão do schema.
+
+Uso (a partir da pasta taskmgr):
+    python -m benchmarks.dataset --tasks 1000000      # só gera (ou reaproveita)
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import List, NamedTuple
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import migrations, search
+from app.models import db  # noqa: F401 - registra modelos, índice FTS e triggers
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".data")
+CHUNK = 50_000
+
+ASSIGNEE_SKEW = 1.1
+TAG_SKEW = 1.0
+UNASSIGNED = 0.3
+STATUSES = ["OPEN", "IN_PROGRESS", "DONE"]
+STATUS_WEIGHTS = [0.5, 0.2, 0.3]
+TAGS_PER_TASK = [0, 1, 1, 2, 3]
+VOCABULARY = [
+    "relatório", "cliente", "deploy", "revisão", "orçamento", "contrato", "reunião",
+    "migração", "bug", "layout", "pagamento", "cadastro", "suporte", "backup",
+    "integração", "fatura", "auditoria", "treinamento", "estoque", "entrega",
+]
+
+
+class DatasetSpec(NamedTuple):
+    projects: int = 1000
+    tasks: int = 1_000_000
+    tags: int = 200
+    users: int = 5000
+    seed: int = 42
+
+    @property
+    def key(self) -> str:
+        return (
+            f"p{self.projects}-t{self.tasks}-g{self.tags}-u{self.users}"
+            f"-s{self.seed}-v{migrations.LATEST_VERSION}"
+        )
+
+
+def _zipf_cum_weights(n: int, skew: float) -> List[float]:
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def _task_rows(spec: DatasetSpec, rnd: random.Random):
+    """(tasks, links) em pedaços de CHUNK tasks."""
+    users = range(1, spec.users + 1)
+    user_weights = _zipf_cum_weights(spec.users, ASSIGNEE_SKEW)
+    tags = range(1, spec.tags + 1)
+    tag_weights = _zipf_cum_weights(spec.tags, TAG_SKEW)
+    today = date(2025, 1, 1)
+
+    for start in range(1, spec.tasks + 1, CHUNK):
+        ids = range(start, min(start + CHUNK, spec.tasks + 1))
+        n = len(ids)
+        statuses = rnd.choices(STATUSES, STATUS_WEIGHTS, k=n)
+        assignees = rnd.choices(users, cum_weights=user_weights, k=n)
+        words = rnd.choices(VOCABULARY, k=2 * n)
+        tasks, links = [], []
+        for i, task_id in enumerate(ids):
+            assignee = assignees[i] if rnd.random() >= UNASSIGNED else None
+            due = today + timedelta(days=rnd.randint(-90, 180)) if rnd.random() < 0.6 else None
+            tasks.append((
+                task_id,
+                f"{words[2 * i].capitalize()} {task_id}",
+                f"Tarefa sobre {words[2 * i]} e {words[2 * i + 1]}",
+                statuses[i],
+                rnd.randint(1, 5),
+                due.isoformat() if due else None,
+                rnd.randint(1, spec.projects),
+                assignee,
+            ))
+            k = rnd.choice(TAGS_PER_TASK)
+            if k:
+                for tag_id in set(rnd.choices(tags, cum_weights=tag_weights, k=k)):
+                    links.append((task_id, tag_id))
+        yield tasks, links
+
+
+def build_dataset(path: str, spec: DatasetSpec, *, verbose: bool = True) -> None:
+    """Gera o banco de `spec` em `path` (sobrescreve)."""
+    if os.path.exists(path):
+        os.unlink(path)
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with engine.begin() as c:
+        c.exec_driver_sql("DROP TRIGGER task_fts_ai")
+    engine.dispose()
+
+    rnd = random.Random(spec.seed)
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(path)
+    # carga única num arquivo temporário: sem fsync e com cache grande para os índices
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-262144")
+    with conn:
+        conn.executemany(
+            "INSERT INTO user (id, name, email) VALUES (?, ?, ?)",
+            ((i, f"Usuário {i}", f"user{i}@example.com") for i in range(1, spec.users + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO project (id, name, description) VALUES (?, ?, '')",
+            ((i, f"Projeto {i}") for i in range(1, spec.projects + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO tag (id, name) VALUES (?, ?)",
+            ((i, f"tag{i:03d}") for i in range(1, spec.tags + 1)),
+        )
+    done = 0
+    for tasks, links in _task_rows(spec, rnd):
+        with conn:
+            conn.executemany(
+                "INSERT INTO task (id, title, description, status, priority, due_date, "
+                "project_id, assignee_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                tasks,
+            )
+            conn.executemany("INSERT INTO tasktaglink (task_id, tag_id) VALUES (?, ?)", links)
+        done += len(tasks)
+        if verbose:
+            print(f"  {done}/{spec.tasks} tasks ({time.perf_counter() - t0:.0f}s)", flush=True)
+    conn.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as c:
+        search.ensure_search_index(c)   # recria o trigger removido acima
+        search.rebuild_search_index(c)
+    with Session(engine) as session:
+        ProjectRepo(session).rebuild_stats()
+        TaskRepo(session).rebuild_open_counts()
+    with engine.begin() as c:
+        c.exec_driver_sql("ANALYZE")
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+
+
+def ensure_dataset(spec: DatasetSpec, *, rebuild: bool = False, verbose: bool = True) -> str:
+    """Caminho do banco de `spec` no cache; gera se não existir (ou com rebuild)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"taskmgr-{spec.key}.db")
+    if rebuild or not os.path.exists(path):
+        if verbose:
+            print(f"Gerando massa de dados {spec.key} em {path}")
+        tmp = path + ".building"
+        build_dataset(tmp, spec, verbose=verbose)
+        # só o banco completo entra no cache (uma geração interrompida não é reaproveitada)
+        os.replace(tmp, path)
+    return path
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--tags", type=int, default=defaults.tags)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--rebuild", action="store_true", help="gera a massa de novo mesmo se houver cache")
+
+
+def spec_from_args(args) -> DatasetSpec:
+    return DatasetSpec(args.projects, args.tasks, args.tags, args.users, args.seed)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    print(ensure_dataset(spec_from_args(args), rebuild=args.rebuild))
+
+
+if __name__ == "__main__":
+    main()
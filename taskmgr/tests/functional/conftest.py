@@ -0,0 +1,12 @@
+import pytest
+
+from app.models.db import create_db_and_tables
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _database_schema():
+    """
+    Os testes funcionais usam o banco configurado em DATABASE_URL sem disparar
+    o startup da aplicação; garantimos aqui o mesmo schema que o startup cria.
+    """
+    create_db_and_tables()
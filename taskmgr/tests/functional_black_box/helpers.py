@@ -49,6 +49,10 @@ class FakeTaskRepo:
             return list(self.tasks.values())
         return [t for t in self.tasks.values() if t.project_id == project_id]
 
+    def archive_candidates(self, project_id: int, limit: int = 1):
+        # sem pré-filtro: a regra é do ProjectService
+        return self.list_with_filters(project_id=project_id)
+
 
 class FakeProjectRepo:
     def __init__(self):
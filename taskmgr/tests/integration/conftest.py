@@ -5,6 +5,10 @@ from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, Session, create_engine
 
 from app.main import app
+from app.core.config import settings
+from app.core.query_stats import QUERY_COUNT_HEADER, instrument_engine
+from app.core.cache import response_cache
+from app.core.deps import get_session as api_get_session  # dependência usada pelas rotas
 from app.models.db import get_session  # se o nome/arquivo forem diferentes, ajuste aqui
 from app.models import entities  # importa os modelos para registrar as tabelas (não remover)
 
@@ -12,16 +16,18 @@ from app.models import entities  # importa os modelos para registrar as tabelas
 # Usamos um banco SQLite separado só para os testes de integração
 TEST_DB_URL = "sqlite:///./test_integration.db"
 
-engine = create_engine(
+engine = instrument_engine(create_engine(
     TEST_DB_URL,
     connect_args={"check_same_thread": False},
-)
+))
 
 
 def _reset_database() -> None:
     """Dropa e recria todas as tabelas no banco de teste."""
     SQLModel.metadata.drop_all(engine)
     SQLModel.metadata.create_all(engine)
+    # o banco foi recriado por fora dos repositórios: nada em cache vale mais
+    response_cache.clear()
 
 
 def get_test_session():
@@ -38,6 +44,7 @@ def setup_app():
     """
     _reset_database()
     app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[api_get_session] = get_test_session
     yield
     app.dependency_overrides.clear()
     SQLModel.metadata.drop_all(engine)
@@ -51,3 +58,36 @@ def client(setup_app):
     _reset_database()
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def db_session(client):
+    """
+    Session direta no banco de teste (instrumentado), para chamar os
+    repositórios dentro de track_queries; o banco é o mesmo do `client`.
+    """
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    """
+    Confere que um request fez no máximo N consultas SQL (headers do modo DEBUG):
+
+        query_budget(client.get("/api/v1/tasks"), 3)
+
+    Devolve a contagem, para comparar requests (ex.: a mesma página com 5 e com 50 itens).
+    """
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    def _check(response, max_queries: int) -> int:
+        count = int(response.headers[QUERY_COUNT_HEADER])
+        request = response.request
+        assert count <= max_queries, (
+            f"{request.method} {request.url.path}: {count} consultas SQL "
+            f"(orçamento: {max_queries})"
+        )
+        return count
+
+    return _check
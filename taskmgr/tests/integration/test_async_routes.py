@@ -0,0 +1,134 @@
+# tests/integration/test_async_routes.py
+
+import asyncio
+import inspect
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import deps
+from app.main import create_app
+from app.models import migrations
+from app.models.db import async_database_url
+from app.models.entities import Task
+from app.repositories.task_repo import TaskRepo
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    # NullPool (padrão do aiosqlite): o TestClient abre um event loop por request
+    return engine, create_async_engine(async_database_url(url))
+
+
+@pytest.fixture
+def async_app(engines):
+    engine, async_engine = engines
+    app = create_app(async_db=True)
+
+    def _session():
+        with Session(engine) as session:
+            yield session
+
+    async def _async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[deps.get_session] = _session
+    app.dependency_overrides[deps.get_async_session] = _async_session
+    return app
+
+
+@pytest.fixture
+def client(async_app):
+    # sem o context manager: o startup (banco da aplicação) não roda
+    return TestClient(async_app)
+
+
+def test_task_and_project_routes_are_coroutines(async_app):
+    endpoints = {
+        (route.path, method): route.endpoint
+        for route in async_app.routes if hasattr(route, "methods")
+        for method in route.methods
+    }
+    for key in [
+        ("/api/v1/tasks", "GET"),
+        ("/api/v1/tasks", "POST"),
+        ("/api/v1/tasks/{task_id}/status", "PATCH"),
+        ("/api/v1/projects/{project_id}/progress", "GET"),
+        ("/api/v1/projects/{project_id}/can-archive", "GET"),
+    ]:
+        assert inspect.iscoroutinefunction(endpoints[key]), key
+
+
+def test_async_routes_behave_like_sync_ones(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    user = client.post("/api/v1/users", json={"name": "Ana", "email": "ana@x"}).json()
+    tag = client.post("/api/v1/tags", json={"name": "urgent"}).json()
+    created = client.post(
+        "/api/v1/tasks",
+        json={"title": "A", "project_id": project["id"], "priority": 1,
+              "assignee_id": user["id"], "tag_ids": [tag["id"]]},
+    )
+    assert created.status_code == 200
+    assert created.json()["tags"] == ["urgent"]
+    bulk = client.post("/api/v1/tasks/bulk", json=[{"title": "B", "project_id": project["id"]}])
+    assert bulk.json()["created"] == 1
+
+    listed = client.get("/api/v1/tasks", params={"tag": "urgent"}).json()
+    assert [t["title"] for t in listed] == ["A"]
+    page = client.get("/api/v1/tasks", params={"project_id": project["id"], "limit": 1}).json()
+    assert len(page["items"]) == 1 and page["next_cursor"]
+    assert client.get("/api/v1/tasks", params={"cursor": "x", "limit": 1}).status_code == 422
+
+    pid = project["id"]
+    assert client.get(f"/api/v1/projects/{pid}/can-archive").json() == {"can_archive": False}
+    task_id = created.json()["id"]
+    assert client.patch(f"/api/v1/tasks/{task_id}/status", params={"new_status": "DONE"}).status_code == 200
+    assert client.patch("/api/v1/tasks/999/status", params={"new_status": "DONE"}).status_code == 404
+    assert client.get(f"/api/v1/projects/{pid}/progress").json() == {"progress": 50.0}
+    assert client.get(f"/api/v1/projects/{pid}/can-archive").json() == {"can_archive": True}
+    assert client.get(f"/api/v1/projects/{pid}/stats").json()["by_status"] == {"DONE": 1, "OPEN": 1}
+
+    resp = client.patch("/api/v1/tasks/bulk/status", json={"new_status": "DONE", "filter": {"project_id": pid}})
+    assert resp.json()["failed"] == 1  # a task sem responsável
+    export = client.get("/api/v1/tasks/export", params={"format": "csv"})
+    assert export.status_code == 200 and "urgent" in export.text
+
+
+def test_etag_round_trip(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    url = f"/api/v1/projects/{project['id']}/progress"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_sync_writes_are_seen_by_async_reads(client, engines):
+    engine, _ = engines
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    assert client.get("/api/v1/tasks").json() == []
+    with Session(engine) as s:
+        TaskRepo(s).create(Task(title="S", project_id=project["id"]), [])
+    assert [t["title"] for t in client.get("/api/v1/tasks").json()] == ["S"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests(async_app):
+    async with AsyncClient(app=async_app, base_url="http://test") as ac:
+        project = (await ac.post("/api/v1/projects", json={"name": "P"})).json()
+        writes = [
+            ac.post("/api/v1/tasks", json={"title": f"T{i}", "project_id": project["id"]})
+            for i in range(20)
+        ]
+        assert all(r.status_code == 200 for r in await asyncio.gather(*writes))
+        reads = [ac.get("/api/v1/tasks", params={"project_id": project["id"]}) for _ in range(50)]
+        responses = await asyncio.gather(*reads)
+    assert all(r.status_code == 200 for r in responses)
+    assert len(responses[-1].json()) == 20
@@ -0,0 +1,127 @@
+# tests/integration/test_attachment_download.py
+
+import hashlib
+import os
+
+import pytest
+
+from app.core.config import settings
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def task_id(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    return client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"]}).json()["id"]
+
+
+@pytest.fixture
+def attachment(client, storage, task_id):
+    resp = client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        files={"file": ("dados.bin", CONTENT, "application/octet-stream")},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _url(attachment):
+    return f"/api/v1/attachments/{attachment['id']}"
+
+
+def test_full_download_with_validators(client, attachment):
+    resp = client.get(_url(attachment))
+
+    assert resp.status_code == 200
+    assert resp.content == CONTENT
+    assert resp.headers["content-type"] == "application/octet-stream"
+    assert resp.headers["etag"] == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["content-length"] == str(len(CONTENT))
+    assert 'filename="dados.bin"' in resp.headers["content-disposition"]
+    assert "last-modified" in resp.headers
+
+
+def test_head_returns_headers_only(client, attachment):
+    resp = client.head(_url(attachment))
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp.headers["content-length"] == str(len(CONTENT))
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [("bytes=0-99", 0, 99), ("bytes=10000-", 10000, 10239), ("bytes=-40", 10200, 10239), ("bytes=10200-99999", 10200, 10239)],
+)
+def test_range_returns_partial_content(client, attachment, header, start, end):
+    resp = client.get(_url(attachment), headers={"Range": header})
+
+    assert resp.status_code == 206
+    assert resp.content == CONTENT[start:end + 1]
+    assert resp.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert resp.headers["content-length"] == str(end - start + 1)
+
+
+def test_unsatisfiable_range(client, attachment):
+    resp = client.get(_url(attachment), headers={"Range": "bytes=20000-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_multiple_ranges_and_stale_if_range_get_the_whole_file(client, attachment):
+    resp = client.get(_url(attachment), headers={"Range": "bytes=0-1,5-6"})
+    assert resp.status_code == 200 and resp.content == CONTENT
+
+    resp = client.get(_url(attachment), headers={"Range": "bytes=0-1", "If-Range": '"outra"'})
+    assert resp.status_code == 200 and resp.content == CONTENT
+
+    etag = client.head(_url(attachment)).headers["etag"]
+    resp = client.get(_url(attachment), headers={"Range": "bytes=0-1", "If-Range": etag})
+    assert resp.status_code == 206 and resp.content == CONTENT[:2]
+
+
+def test_conditional_requests(client, attachment):
+    first = client.get(_url(attachment))
+
+    resp = client.get(_url(attachment), headers={"If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    resp = client.get(_url(attachment), headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert resp.status_code == 304
+
+    resp = client.get(_url(attachment), headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert resp.status_code == 200
+
+
+def test_missing_attachment_or_file(client, attachment):
+    assert client.get("/api/v1/attachments/999999").status_code == 404
+    os.unlink(attachment["filepath"])
+    resp = client.get(_url(attachment))
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["code"] == "file_missing"
+
+
+def test_list_task_attachments(client, storage, task_id, attachment):
+    client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        files={"file": ("b.txt", b"texto", "text/plain")},
+    )
+
+    resp = client.get(f"/api/v1/tasks/{task_id}/attachments")
+
+    assert resp.status_code == 200
+    items = resp.json()
+    assert [i["filename"] for i in items] == ["dados.bin", "b.txt"]
+    assert items[0]["size"] == len(CONTENT)
+    assert items[1]["content_type"] == "text/plain"
+    assert client.get("/api/v1/tasks/999999/attachments").status_code == 404
@@ -0,0 +1,137 @@
+# tests/integration/test_attachment_jobs.py
+
+import os
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine, select
+
+from app.core.config import settings
+from app.models import migrations
+from app.models.entities import AttachmentJob
+from app.repositories.attachment_job_repo import AttachmentJobRepo
+from app.services.attachment_jobs import AttachmentJobRunner
+from app.services import attachment_processing
+
+engine = create_engine("sqlite:///./test_integration.db")
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def task_id(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    return client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"]}).json()["id"]
+
+
+def _upload(client, task_id, content, filename="nota.txt"):
+    resp = client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        files={"file": (filename, content, "application/octet-stream")},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _attachments(client, task_id):
+    return {a["id"]: a for a in client.get(f"/api/v1/tasks/{task_id}/attachments").json()}
+
+
+def _jobs():
+    with Session(engine) as s:
+        return s.exec(select(AttachmentJob).order_by(AttachmentJob.id)).all()
+
+
+def test_upload_enqueues_and_runner_fills_metadata(client, storage, task_id):
+    text_att = _upload(client, task_id, "relatório de março\nlinha 2".encode())
+    image_att = _upload(client, task_id, PNG_HEADER, filename="foto.png")
+
+    assert text_att["processing_status"] == "pending"
+    assert [j.status for j in _jobs()] == ["pending", "pending"]
+
+    assert AttachmentJobRunner(engine, max_workers=2).run_until_idle() == 2
+
+    rows = _attachments(client, task_id)
+    assert rows[text_att["id"]]["processing_status"] == "done"
+    assert rows[text_att["id"]]["mime_type"] == "text/plain"
+    assert rows[text_att["id"]]["preview"] == "relatório de março\nlinha 2"
+    assert rows[image_att["id"]]["mime_type"] == "image/png"
+    assert rows[image_att["id"]]["preview"] is None
+    if attachment_processing.Image is None:
+        assert rows[image_att["id"]]["thumbnail_path"] is None
+    assert [(j.status, j.attempts) for j in _jobs()] == [("done", 1), ("done", 1)]
+
+
+def test_checksum_mismatch_fails_without_retry(client, storage, task_id):
+    att = _upload(client, task_id, b"original")
+    with open(att["filepath"], "wb") as f:
+        f.write(b"corrompido")
+
+    assert AttachmentJobRunner(engine, max_workers=1).run_until_idle() == 1
+
+    assert _attachments(client, task_id)[att["id"]]["processing_status"] == "failed"
+    [job] = _jobs()
+    assert (job.status, job.attempts, job.error) == ("failed", 1, "checksum_mismatch")
+
+
+def test_errors_in_the_worker_are_retried_up_to_max_attempts(client, storage, task_id):
+    att = _upload(client, task_id, b"vai sumir")
+    os.unlink(att["filepath"])
+
+    assert AttachmentJobRunner(engine, max_workers=1, max_attempts=2).run_until_idle() == 2
+
+    [job] = _jobs()
+    assert (job.status, job.attempts) == ("failed", 2)
+    assert "FileNotFoundError" in job.error
+
+
+def test_started_runner_resumes_jobs_interrupted_by_a_restart(client, storage, task_id):
+    att = _upload(client, task_id, b"interrompido")
+    with Session(engine) as s:
+        # o processo anterior pegou o job e caiu no meio
+        AttachmentJobRepo(s).claim(10)
+    assert _jobs()[0].status == "running"
+
+    runner = AttachmentJobRunner(engine, max_workers=1, poll_seconds=0.05)
+    runner.start()
+    try:
+        deadline = time.monotonic() + 30
+        while _jobs()[0].status != "done" and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+    assert _jobs()[0].status == "done"
+    assert _attachments(client, task_id)[att["id"]]["processing_status"] == "done"
+
+
+def test_deleting_an_attachment_drops_its_jobs(client, storage, task_id):
+    att = _upload(client, task_id, b"x")
+
+    assert client.delete(f"/api/v1/attachments/{att['id']}").status_code == 204
+    assert _jobs() == []
+
+
+def test_migration_adds_processing_columns_and_job_table(tmp_path):
+    db = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with db.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE attachment (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, "
+            "filename VARCHAR NOT NULL, filepath VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+            "size INTEGER, sha256 VARCHAR, content_type VARCHAR)"
+        ))
+        conn.execute(text("PRAGMA user_version = 7"))
+
+    assert migrations.migrate(db) == list(range(8, migrations.LATEST_VERSION + 1))
+    with db.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(attachment)"))}
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(attachment_job)"))}
+    assert {"processing_status", "mime_type", "preview", "thumbnail_path"} <= columns
+    assert "ix_attachment_job_status" in indexes
@@ -0,0 +1,150 @@
+# tests/integration/test_attachment_storage.py
+
+import os
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.config import settings
+from app.core.storage import BlobStore, file_sha256
+from app.models.entities import Attachment
+from app.repositories.attachment_repo import AttachmentRepo
+from app.services.attachment_service import AttachmentService
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    root = tmp_path / "files"
+    monkeypatch.setattr(settings, "FILE_STORAGE_DIR", str(root))
+    return root
+
+
+@pytest.fixture
+def task_id(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    return client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"]}).json()["id"]
+
+
+def _upload(client, task_id, content, filename):
+    resp = client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        files={"file": (filename, content, "text/plain")},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_path_is_sharded_by_hash(tmp_path):
+    store = BlobStore(str(tmp_path))
+    sha = "ab" * 32
+    assert store.path_for(sha) == os.path.join(str(tmp_path), "ab", "ab", sha)
+    assert store.contains_path(store.path_for(sha))
+    assert not store.contains_path(os.path.join(str(tmp_path), "nota.txt"))
+
+
+def test_identical_uploads_share_one_file_and_same_names_do_not_collide(client, storage, task_id):
+    a = _upload(client, task_id, b"mesmo conteudo", "a.txt")
+    b = _upload(client, task_id, b"mesmo conteudo", "b.txt")
+    c = _upload(client, task_id, b"outro conteudo", "a.txt")
+
+    assert a["filepath"] == b["filepath"]
+    assert a["filepath"] != c["filepath"]
+    with open(a["filepath"], "rb") as f:
+        assert f.read() == b"mesmo conteudo"
+    with open(c["filepath"], "rb") as f:
+        assert f.read() == b"outro conteudo"
+
+
+def test_file_is_removed_with_the_last_reference(client, storage, task_id):
+    a = _upload(client, task_id, b"compartilhado", "a.txt")
+    b = _upload(client, task_id, b"compartilhado", "b.txt")
+
+    assert client.delete(f"/api/v1/attachments/{a['id']}").status_code == 204
+    assert os.path.exists(b["filepath"])
+    assert client.delete(f"/api/v1/attachments/{b['id']}").status_code == 204
+    assert not os.path.exists(b["filepath"])
+    assert client.delete(f"/api/v1/attachments/{b['id']}").status_code == 404
+
+
+def test_file_is_deleted_only_after_the_row_is_committed(client, storage, task_id, monkeypatch):
+    a = _upload(client, task_id, b"sozinho", "a.txt")
+    engine = create_engine("sqlite:///./test_integration.db")
+    seen = []
+    original = BlobStore.delete
+
+    def _delete(self, sha256):
+        # outra conexão: só enxerga o que já foi confirmado
+        with Session(engine) as s:
+            seen.append(s.get(Attachment, a["id"]))
+        original(self, sha256)
+
+    monkeypatch.setattr(BlobStore, "delete", _delete)
+    assert client.delete(f"/api/v1/attachments/{a['id']}").status_code == 204
+    engine.dispose()
+
+    assert seen == [None]
+    assert not os.path.exists(a["filepath"])
+
+
+def test_failed_insert_does_not_leave_an_orphan_file(client, storage, task_id, monkeypatch):
+    kept = _upload(client, task_id, b"ja existia", "a.txt")
+
+    def _fail(self, a):
+        raise RuntimeError("insert falhou")
+
+    monkeypatch.setattr(AttachmentRepo, "create", _fail)
+    for content in (b"novo conteudo", b"ja existia"):
+        with pytest.raises(RuntimeError):
+            client.post(
+                "/api/v1/attachments",
+                params={"task_id": task_id},
+                files={"file": ("b.txt", content, "text/plain")},
+            )
+
+    tmp_dir = BlobStore(str(storage)).tmp_dir
+    blobs = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(storage)
+        if not root.startswith(tmp_dir)
+        for name in names
+    ]
+    # o arquivo novo foi descartado; o que já tinha referência continua
+    assert blobs == [kept["filepath"]]
+
+
+def test_migrate_storage_moves_legacy_files(tmp_path, storage):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    SQLModel.metadata.create_all(engine)
+    os.makedirs(storage)
+    # layout antigo: FILE_STORAGE_DIR/<nome>, sem hash nem tamanho
+    for name, content in [("a.txt", b"igual"), ("b.txt", b"igual"), ("c.txt", b"diferente")]:
+        (storage / name).write_bytes(content)
+    with Session(engine) as s:
+        s.add_all([
+            Attachment(task_id=1, filename="a.txt", filepath=str(storage / "a.txt")),
+            Attachment(task_id=1, filename="b.txt", filepath=str(storage / "b.txt")),
+            # dois anexos com o mesmo nome apontavam para o mesmo arquivo
+            Attachment(task_id=2, filename="c.txt", filepath=str(storage / "c.txt")),
+            Attachment(task_id=3, filename="c.txt", filepath=str(storage / "c.txt")),
+            Attachment(task_id=3, filename="sumiu.txt", filepath=str(storage / "sumiu.txt")),
+        ])
+        s.commit()
+
+        counts = AttachmentService(AttachmentRepo(s)).migrate_storage()
+        assert counts == {"migrated": 4, "deduplicated": 1, "missing": 1}
+
+        store = BlobStore(str(storage))
+        rows = s.exec(select(Attachment).order_by(Attachment.id)).all()
+        for row in rows[:4]:
+            assert store.contains_path(row.filepath)
+            assert file_sha256(row.filepath) == (row.sha256, row.size)
+        assert rows[0].filepath == rows[1].filepath
+        assert rows[2].filepath == rows[3].filepath
+        assert rows[4].sha256 is None
+
+        # os arquivos antigos saíram; rodar de novo não faz nada
+        assert not any(p.is_file() for p in storage.iterdir())
+        assert AttachmentService(AttachmentRepo(s)).migrate_storage() == {
+            "migrated": 0, "deduplicated": 0, "missing": 1,
+        }
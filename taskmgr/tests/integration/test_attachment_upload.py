@@ -0,0 +1,128 @@
+# tests/integration/test_attachment_upload.py
+
+import hashlib
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.uploads import safe_filename
+from app.models import migrations
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def task_id(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    return client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"]}).json()["id"]
+
+
+def _files(root):
+    return sorted(
+        os.path.relpath(os.path.join(d, name), root)
+        for d, _, names in os.walk(root) for name in names
+    )
+
+
+def _upload(client, task_id, content, filename="nota.txt", **kwargs):
+    return client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        files={"file": (filename, content, "text/plain")},
+        **kwargs,
+    )
+
+
+def test_upload_streams_file_in_chunks_with_size_and_sha256(client, storage, task_id, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 1024)
+    content = os.urandom(10_000) + b"fim"
+
+    resp = _upload(client, task_id, content)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["task_id"] == task_id
+    assert body["filename"] == "nota.txt"
+    assert body["size"] == len(content)
+    assert body["sha256"] == hashlib.sha256(content).hexdigest()
+    with open(body["filepath"], "rb") as f:
+        assert f.read() == content
+    # só o arquivo no store; nada de temporário esquecido
+    sha = body["sha256"]
+    assert _files(storage) == [os.path.join(sha[:2], sha[2:4], sha)]
+
+
+def test_upload_keeps_only_the_base_name(client, storage, task_id):
+    resp = _upload(client, task_id, b"x", filename="../../etc/passwd")
+
+    assert resp.status_code == 200
+    assert resp.json()["filename"] == "passwd"
+    assert resp.json()["filepath"].startswith(str(storage))
+
+
+def test_oversized_upload_is_rejected_and_cleaned_up(client, storage, task_id, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1000)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 100)
+
+    resp = _upload(client, task_id, b"a" * 1001)
+
+    assert resp.status_code == 413
+    assert resp.json()["detail"]["code"] == "upload_too_large"
+    assert _files(storage) == []
+
+
+def test_content_length_over_the_limit_is_rejected_before_reading(client, storage, task_id, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1000)
+
+    def _body():
+        yield b"--x\r\n"
+
+    resp = client.post(
+        "/api/v1/attachments",
+        params={"task_id": task_id},
+        content=_body(),
+        headers={"content-type": "multipart/form-data; boundary=x", "content-length": str(10**9)},
+    )
+
+    assert resp.status_code == 413
+    assert _files(storage) == []
+
+
+def test_upload_errors(client, storage, task_id):
+    assert _upload(client, 999_999, b"x").status_code == 404
+
+    resp = client.post("/api/v1/attachments", params={"task_id": task_id}, data={"other": "1"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] in ("invalid_upload", "missing_file")
+    assert _files(storage) == []
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("a.txt", "a.txt"), ("dir/a.txt", "a.txt"), ("C:\\x\\a.txt", "a.txt"), ("..", "upload"), ("", "upload")],
+)
+def test_safe_filename(name, expected):
+    assert safe_filename(name) == expected
+
+
+def test_migration_adds_checksum_columns_to_existing_attachments(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # tabela como era antes da versão 6 do schema, com um anexo antigo
+        conn.execute(text(
+            "CREATE TABLE attachment (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, "
+            "filename VARCHAR NOT NULL, filepath VARCHAR NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+        conn.execute(text("INSERT INTO attachment VALUES (1, 1, 'a.txt', 'x/a.txt', '2024-01-01')"))
+        conn.execute(text("PRAGMA user_version = 5"))
+
+    assert migrations.migrate(engine) == list(range(6, migrations.LATEST_VERSION + 1))
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT filename, size, sha256, content_type FROM attachment")).one()
+    assert tuple(row) == ("a.txt", None, None, None)
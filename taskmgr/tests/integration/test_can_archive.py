@@ -0,0 +1,52 @@
+# tests/integration/test_can_archive.py
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.query_stats import instrument_engine, track_queries
+from app.models.entities import Project, Task
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+from app.services.project_service import ProjectService, blocks_archive
+
+
+def _engine(tmp_path, tasks):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add_all([Project(id=1, name="P"), Project(id=2, name="Q")])
+        s.add_all(tasks)
+        s.commit()
+    return engine
+
+
+def test_archive_candidates_prefilters_by_rule_and_limit(tmp_path):
+    tasks = [
+        Task(id=1, title="a", project_id=1, priority=1, status="DONE"),
+        Task(id=2, title="b", project_id=1, priority=3, status="OPEN"),
+        Task(id=3, title="c", project_id=1, priority=2, status="IN_PROGRESS"),
+        Task(id=4, title="d", project_id=1, priority=1, status="OPEN"),
+        Task(id=5, title="e", project_id=2, priority=1, status="OPEN"),
+    ]
+    # o filtro em SQL tem de concordar com a regra do serviço
+    expected = sorted(t.id for t in tasks if t.project_id == 1 and blocks_archive(t))
+    engine = _engine(tmp_path, tasks)
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        assert sorted([t.id for t in repo.archive_candidates(1, limit=10)]) == expected == [3, 4]
+        assert len(repo.archive_candidates(1)) == 1
+        assert [t.id for t in repo.archive_candidates(2, limit=10)] == [5]
+        assert repo.archive_candidates(3, limit=10) == []
+
+
+def test_can_archive_runs_a_single_limited_query(tmp_path):
+    tasks = [Task(title=f"t{i}", project_id=1, priority=1) for i in range(50)]
+    engine = instrument_engine(_engine(tmp_path, tasks))
+
+    with track_queries(record_statements=True) as stats, Session(engine) as s:
+        svc = ProjectService(ProjectRepo(s), TaskRepo(s))
+        assert svc.can_archive(1) is False
+        assert svc.can_archive(2) is True
+
+    statements = [st for st, _ in stats.statements]
+    assert len(statements) == 2
+    assert all("LIMIT" in st for st in statements)
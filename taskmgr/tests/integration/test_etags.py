@@ -0,0 +1,108 @@
+# tests/integration/test_etags.py
+
+from sqlalchemy import create_engine, text
+
+from app.models import versions
+
+# conexão direta ao banco dos testes de integração (como outro processo)
+engine = create_engine("sqlite:///./test_integration.db")
+
+
+def _setup(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    user = client.post("/api/v1/users", json={"name": "Ana", "email": "ana@x"}).json()
+    task = client.post(
+        "/api/v1/tasks",
+        json={"title": "A", "project_id": project["id"], "assignee_id": user["id"]},
+    ).json()
+    client.post("/api/v1/tasks", json={"title": "B", "project_id": project["id"]})
+    return project, task
+
+
+def _urls(project_id):
+    return [
+        f"/api/v1/projects/{project_id}/progress",
+        f"/api/v1/projects/{project_id}/can-archive",
+        f"/api/v1/tasks?project_id={project_id}",
+        "/api/v1/tasks?status=OPEN&limit=1",
+    ]
+
+
+def test_matching_if_none_match_gets_304_with_a_single_version_lookup(client, query_budget):
+    project, _ = _setup(client)
+    for url in _urls(project["id"]):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304, url
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+        # só a leitura da versão (change_version), nada da consulta da rota
+        assert query_budget(resp, 1) == 1
+
+
+def test_etag_changes_after_a_write(client):
+    project, task = _setup(client)
+    urls = _urls(project["id"])
+    etags = {url: client.get(url).headers["etag"] for url in urls}
+
+    client.patch(f"/api/v1/tasks/{task['id']}/status", params={"new_status": "DONE"})
+
+    for url in urls:
+        resp = client.get(url, headers={"If-None-Match": etags[url]})
+        assert resp.status_code == 200, url
+        assert resp.headers["etag"] != etags[url]
+    assert client.get(urls[0]).json() == {"progress": 50.0}
+
+
+def test_writes_elsewhere_keep_the_project_etag(client):
+    project, _ = _setup(client)
+    url = f"/api/v1/projects/{project['id']}/progress"
+    etag = client.get(url).headers["etag"]
+    other = client.post("/api/v1/projects", json={"name": "Q"}).json()
+    client.post("/api/v1/tasks", json={"title": "X", "project_id": other["id"]})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_if_none_match_lists_weak_tags_and_wildcard(client):
+    project, _ = _setup(client)
+    url = f"/api/v1/projects/{project['id']}/progress"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"x"'}).status_code == 200
+
+
+def test_different_parameters_have_different_etags(client):
+    _setup(client)
+    a = client.get("/api/v1/tasks", params={"status": "OPEN"}).headers["etag"]
+    b = client.get("/api/v1/tasks", params={"status": "DONE"}).headers["etag"]
+    assert a != b
+
+
+def test_write_by_another_worker_is_not_served_from_cache(client):
+    project, _ = _setup(client)
+    url = f"/api/v1/projects/{project['id']}/progress"
+    assert client.get(url).json() == {"progress": 0.0}
+
+    # outro processo: escreve direto no banco, sem passar pelo cache deste
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE project_stats SET status = 'DONE' WHERE project_id = :p AND status = 'OPEN'"),
+            {"p": project["id"]},
+        )
+        versions.bump_version(conn, f"project:{project['id']}")
+
+    assert client.get(url).json() == {"progress": 100.0}
+
+
+def test_versions_only_grow(client):
+    project, task = _setup(client)
+    scope = f"project:{project['id']}"
+    with engine.connect() as conn:
+        before = versions.read_version(conn, scope)
+    client.patch(f"/api/v1/tasks/{task['id']}/status", params={"new_status": "IN_PROGRESS"})
+    with engine.connect() as conn:
+        assert versions.read_version(conn, scope) == before + 1
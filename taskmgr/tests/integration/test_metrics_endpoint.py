@@ -0,0 +1,43 @@
+# tests/integration/test_metrics_endpoint.py
+
+import asyncio
+
+import pytest
+
+from app.api.v1.metrics import get_metrics
+from app.core.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_metrics_endpoint_reports_routes_by_template_and_status(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    client.get(f"/api/v1/projects/{project['id']}/progress")
+    client.get("/api/v1/tasks/999999/attachments")
+    client.get("/nao-existe")
+
+    resp = client.get("/api/v1/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    name = "taskmgr_http_request_duration_seconds_count"
+    assert f'{name}{{method="GET",route="/api/v1/projects/{{project_id}}/progress",status="200"}} 1' in text
+    assert f'{name}{{method="GET",route="/api/v1/tasks/{{task_id}}/attachments",status="404"}} 1' in text
+    assert f'{name}{{method="GET",route="<unmatched>",status="404"}} 1' in text
+    # o próprio scrape está em andamento enquanto o texto é gerado
+    assert "taskmgr_http_requests_in_flight 1" in text
+
+    created = [line for line in text.splitlines()
+               if line.startswith('taskmgr_http_request_size_bytes_sum{method="POST",route="/api/v1/projects"')]
+    assert created and int(created[0].rsplit(" ", 1)[1]) > 0
+
+
+def test_metrics_endpoint_renders_on_the_event_loop():
+    # no threadpool a leitura correria junto com o middleware (registro sem lock)
+    assert asyncio.iscoroutinefunction(get_metrics)
@@ -0,0 +1,135 @@
+# tests/integration/test_open_task_limit.py
+
+import threading
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.config import settings
+from app.core.exceptions import DomainError
+from app.core.query_stats import instrument_engine, track_queries
+from app.models import migrations
+from app.models.entities import Project, Task, User
+from app.repositories.task_repo import TaskRepo
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = instrument_engine(create_engine(
+        f"sqlite:///{tmp_path / 'limit.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    ))
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add_all([User(id=1, name="Ana", email="a@x"), User(id=2, name="Bia", email="b@x")])
+        s.commit()
+    return engine
+
+
+def _open_tasks(session, user_id):
+    return session.exec(
+        select(func.count()).select_from(Task).where(
+            Task.assignee_id == user_id, Task.status != "DONE"
+        )
+    ).one()
+
+
+def test_counter_follows_creates_and_status_changes(engine, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 3)
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        t1 = repo.create(Task(title="a", project_id=1, assignee_id=1), [])
+        repo.create(Task(title="b", project_id=1, assignee_id=1), [])
+        repo.create(Task(title="c", project_id=1, assignee_id=1, status="DONE"), [])
+        assert repo.count_open_by_user(1) == 2
+
+        repo.update_status(t1.id, "IN_PROGRESS")
+        assert repo.count_open_by_user(1) == 2
+        repo.update_status(t1.id, "DONE")
+        assert repo.count_open_by_user(1) == 1
+        repo.update_status(t1.id, "OPEN")
+        assert repo.count_open_by_user(1) == 2
+        assert repo.count_open_by_user(2) == 0
+
+
+def test_count_open_by_user_is_a_single_key_lookup(engine, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 100)
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        for i in range(20):
+            repo.create(Task(title=f"t{i}", project_id=1, assignee_id=1), [])
+
+        with track_queries(record_statements=True) as stats:
+            assert repo.count_open_by_user(1) == 20
+        statements = [st for st, _ in stats.statements]
+        assert len(statements) == 1
+        assert "user_task_stats" in statements[0]
+
+
+def test_repo_refuses_insert_past_the_limit(engine, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 1)
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        repo.create(Task(title="a", project_id=1, assignee_id=1), [])
+        with pytest.raises(DomainError) as exc:
+            repo.create(Task(title="b", project_id=1, assignee_id=1), [])
+        assert exc.value.code == "user_overload"
+        # tarefas já concluídas não contam para o limite
+        repo.create(Task(title="c", project_id=1, assignee_id=1, status="DONE"), [])
+        assert _open_tasks(s, 1) == 1
+        assert repo.count_open_by_user(1) == 1
+
+
+def test_rebuild_open_counts(engine, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 10)
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        repo.create(Task(title="a", project_id=1, assignee_id=1), [])
+        s.add(Task(title="fora do repo", project_id=1, assignee_id=1))
+        s.commit()
+        assert repo.count_open_by_user(1) == 1
+        repo.rebuild_open_counts()
+        assert repo.count_open_by_user(1) == 2
+
+
+@pytest.mark.parametrize("limit,threads,per_thread", [(5, 8, 4), (1, 10, 2)])
+def test_concurrent_creates_never_overshoot_the_limit(engine, monkeypatch, limit, threads, per_thread):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", limit)
+    start = threading.Barrier(threads)
+    results = {"ok": 0, "overload": 0, "other": []}
+    lock = threading.Lock()
+
+    def worker(n):
+        start.wait()
+        for i in range(per_thread):
+            with Session(engine) as s:
+                svc = TaskService(TaskRepo(s))
+                try:
+                    svc.create_task(Task(title=f"t{n}-{i}", project_id=1, assignee_id=1), [])
+                    outcome = "ok"
+                except DomainError as e:
+                    outcome = "overload" if e.code == "user_overload" else e.code
+                except Exception as e:  # noqa: BLE001 - registrado e verificado abaixo
+                    outcome = repr(e)
+            with lock:
+                if outcome in ("ok", "overload"):
+                    results[outcome] += 1
+                else:
+                    results["other"].append(outcome)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    assert results["other"] == []
+    assert results["ok"] == limit
+    assert results["overload"] == threads * per_thread - limit
+    with Session(engine) as s:
+        assert _open_tasks(s, 1) == limit
+        assert TaskRepo(s).count_open_by_user(1) == limit
@@ -0,0 +1,101 @@
+# tests/integration/test_project_stats.py
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.query_stats import instrument_engine, track_queries
+from app.models import migrations
+from app.models.entities import Project, ProjectStats, Task, User
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+
+
+def _engine(tmp_path):
+    engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'stats.db'}"))
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    return engine
+
+
+def _stats(session, project_id):
+    rows = session.exec(
+        select(ProjectStats.status, ProjectStats.task_count).where(
+            ProjectStats.project_id == project_id
+        )
+    )
+    return {status: count for status, count in rows if count}
+
+
+def test_counters_follow_create_and_status_changes(tmp_path):
+    engine = _engine(tmp_path)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add(User(id=1, name="Ana", email="a@x"))
+        s.commit()
+        repo = TaskRepo(s)
+        t1 = repo.create(Task(title="a", project_id=1, assignee_id=1), [])
+        repo.create(Task(title="b", project_id=1), [])
+        repo.create(Task(title="c", project_id=1, status="DONE"), [])
+        assert _stats(s, 1) == {"OPEN": 2, "DONE": 1}
+
+        repo.update_status(t1.id, "IN_PROGRESS")
+        assert _stats(s, 1) == {"OPEN": 1, "IN_PROGRESS": 1, "DONE": 1}
+
+        repo.update_status(t1.id, "DONE")
+        repo.update_status(t1.id, "DONE")  # sem mudança, sem contagem dupla
+        assert _stats(s, 1) == {"OPEN": 1, "DONE": 2}
+        assert ProjectRepo(s).progress(1) == 66.67
+
+
+def test_progress_reads_counters_in_constant_queries(tmp_path):
+    engine = _engine(tmp_path)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.commit()
+        repo = TaskRepo(s)
+        for i in range(30):
+            repo.create(Task(title=f"t{i}", project_id=1, status="DONE" if i % 3 == 0 else "OPEN"), [])
+
+        with track_queries(record_statements=True) as stats:
+            assert ProjectRepo(s).progress(1) == 33.33
+
+        statements = [st for st, _ in stats.statements]
+        assert len(statements) == 1
+        assert "project_stats" in statements[0]
+        assert "FROM task" not in statements[0]
+
+
+def test_rebuild_stats_repairs_drifted_counters(tmp_path):
+    engine = _engine(tmp_path)
+    with Session(engine) as s:
+        s.add_all([Project(id=1, name="P"), Project(id=2, name="Q")])
+        s.commit()
+        repo = TaskRepo(s)
+        repo.create(Task(title="a", project_id=1, status="DONE"), [])
+        repo.create(Task(title="b", project_id=1), [])
+        repo.create(Task(title="c", project_id=2), [])
+        # escrita fora do repo: contadores ficam defasados
+        s.add(Task(title="d", project_id=1, status="DONE"))
+        s.commit()
+        assert ProjectRepo(s).progress(1) == 50.0
+
+        ProjectRepo(s).rebuild_stats(project_id=1)
+        assert _stats(s, 1) == {"DONE": 2, "OPEN": 1}
+        assert _stats(s, 2) == {"OPEN": 1}
+
+        ProjectRepo(s).rebuild_stats()
+        assert _stats(s, 1) == {"DONE": 2, "OPEN": 1}
+        assert _stats(s, 2) == {"OPEN": 1}
+
+
+def test_stats_endpoint(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    client.post("/api/v1/tasks", json={"title": "a", "project_id": p["id"], "status": "DONE"})
+    client.post("/api/v1/tasks", json={"title": "b", "project_id": p["id"]})
+
+    body = client.get(f"/api/v1/projects/{p['id']}/stats").json()
+    assert body == {
+        "project_id": p["id"],
+        "total": 2,
+        "by_status": {"DONE": 1, "OPEN": 1},
+        "progress": 50.0,
+    }
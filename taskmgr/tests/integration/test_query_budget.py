@@ -0,0 +1,66 @@
+# tests/integration/test_query_budget.py
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def project_with_tasks(client):
+    """Projeto com 30 tasks, cada uma com duas tags."""
+    tag_ids = [client.post("/api/v1/tags", json={"name": name}).json()["id"] for name in ("a", "b")]
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    for i in range(30):
+        client.post("/api/v1/tasks", json={"title": f"T{i}", "project_id": project["id"], "tag_ids": tag_ids})
+    return project["id"]
+
+
+@pytest.fixture
+def no_response_cache(monkeypatch):
+    # mede o caminho até o banco, não o cache de respostas
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+
+
+def test_task_list_queries_do_not_grow_with_page_size(client, query_budget, project_with_tasks, no_response_cache):
+    small = query_budget(client.get("/api/v1/tasks", params={"limit": 5}), 4)
+    large = query_budget(client.get("/api/v1/tasks", params={"limit": 30}), 4)
+
+    # tags de todas as tasks da página numa consulta só, não uma por task
+    assert small == large
+    body = client.get("/api/v1/tasks", params={"limit": 30}).json()
+    assert all(sorted(t["tags"]) == ["a", "b"] for t in body["items"])
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        ("/api/v1/tasks?project_id={project_id}&limit=30", 4),
+        ("/api/v1/tasks?q=T1&limit=30", 4),
+        ("/api/v1/projects/{project_id}/progress", 2),
+        ("/api/v1/projects/{project_id}/stats", 1),
+        ("/api/v1/tasks/1/attachments", 2),
+    ],
+)
+def test_read_endpoints_stay_within_budget(client, query_budget, project_with_tasks, no_response_cache, path, budget):
+    resp = client.get(path.format(project_id=project_with_tasks))
+
+    assert resp.status_code == 200
+    query_budget(resp, budget)
+
+
+def test_create_task_stays_within_budget(client, query_budget, project_with_tasks):
+    tag_id = client.post("/api/v1/tags", json={"name": "c"}).json()["id"]
+    resp = client.post("/api/v1/tasks", json={"title": "nova", "project_id": project_with_tasks, "tag_ids": [tag_id]})
+
+    assert resp.status_code == 200
+    # inclui as escritas feitas pelo escritor do SQLite (contexto do request)
+    assert query_budget(resp, 12) > 3
+
+
+def test_headers_only_in_debug_mode(client, project_with_tasks, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+    assert "x-db-query-count" not in client.get("/api/v1/tasks").headers
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    resp = client.get("/api/v1/tasks")
+    assert float(resp.headers["x-db-query-time-ms"]) >= 0
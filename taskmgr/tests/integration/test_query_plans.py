@@ -0,0 +1,116 @@
+# tests/integration/test_query_plans.py
+
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.query_stats import instrument_engine, track_queries
+from app.models import migrations
+from app.models.entities import Attachment, Project, Tag, Task, User
+from app.repositories.attachment_repo import AttachmentRepo
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.tag_repo import TagRepo
+from app.repositories.task_repo import TaskRepo
+
+FILTER_INDEXES = {
+    "ix_task_project_id",
+    "ix_task_assignee_status",
+    "ix_tag_name",
+    "ix_tasktaglink_tag_id",
+    "ix_attachment_task_id",
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'plans.db'}"))
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add(User(id=1, name="Ana", email="ana@x.com"))
+        s.add(Tag(id=1, name="urgent"))
+        s.add(Tag(id=2, name="bug"))
+        s.commit()
+        TaskRepo(s).create(Task(title="T", project_id=1, assignee_id=1), [1, 2])
+        s.add(Attachment(task_id=1, filename="a.txt", filepath="/tmp/a.txt"))
+        s.commit()
+    return engine
+
+
+def full_scans(engine, statement, parameters):
+    """Linhas do EXPLAIN QUERY PLAN que varrem uma tabela inteira sem índice."""
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    details = [row[-1] for row in plan]
+    return [
+        d for d in details
+        if re.match(r"SCAN \w+", d) and "USING" not in d and "VIRTUAL TABLE" not in d
+    ]
+
+
+REPO_QUERIES = {
+    "list_by_project": lambda s: TaskRepo(s).list_with_filters(project_id=1),
+    "list_by_assignee_status": lambda s: TaskRepo(s).list_with_filters(assignee_id=1, status="OPEN"),
+    "list_by_tag": lambda s: TaskRepo(s).list_with_filters(tag="urgent"),
+    "list_by_any_tag": lambda s: TaskRepo(s).list_with_filters(tag=["urgent", "bug"]),
+    "list_by_all_tags": lambda s: TaskRepo(s).list_with_filters(
+        tag=["urgent", "bug"], tag_mode="all", order_by="priority"
+    ),
+    "list_by_text": lambda s: TaskRepo(s).list_with_filters(q="T"),
+    "page_by_project": lambda s: TaskRepo(s).list_page(project_id=1, limit=10),
+    "archive_candidates": lambda s: TaskRepo(s).archive_candidates(1, limit=5),
+    "count_open_by_user": lambda s: TaskRepo(s).count_open_by_user(1),
+    "tag_names_for_task": lambda s: TaskRepo(s).tag_names_for_task(1),
+    "tag_names_for_tasks": lambda s: TaskRepo(s).tag_names_for_tasks([1]),
+    "project_progress": lambda s: ProjectRepo(s).progress(1),
+    "attachments_by_task": lambda s: AttachmentRepo(s).list_by_task(1),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REPO_QUERIES))
+def test_repo_query_uses_an_index(engine, name):
+    with Session(engine) as s:
+        # o dicionário de tags lê a tabela inteira de propósito, uma vez só
+        TagRepo(s).dictionary()
+        with track_queries(record_statements=True) as stats:
+            REPO_QUERIES[name](s)
+
+    statements = [(st, p) for st, p in stats.statements if st.lstrip().upper().startswith("SELECT")]
+    assert statements, f"{name} não executou nenhum SELECT"
+    for statement, parameters in statements:
+        assert full_scans(engine, statement, parameters) == [], statement
+
+
+def _index_names(conn):
+    rows = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+    return {r[0] for r in rows}
+
+
+def test_migration_adds_indexes_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # simula um banco criado antes dos índices (versão 1 do schema)
+        for name in FILTER_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("PRAGMA user_version = 1"))
+
+    assert migrations.migrate(engine) == list(range(2, migrations.LATEST_VERSION + 1))
+    with engine.connect() as conn:
+        assert FILTER_INDEXES <= _index_names(conn)
+        assert migrations.current_version(conn) == migrations.LATEST_VERSION
+
+    # rodar de novo não faz nada
+    assert migrations.migrate(engine) == []
+
+
+def test_fresh_database_is_stamped_with_latest_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.LATEST_VERSION
+        assert FILTER_INDEXES <= _index_names(conn)
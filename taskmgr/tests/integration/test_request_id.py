@@ -0,0 +1,48 @@
+# tests/integration/test_request_id.py
+
+import io
+import json
+import logging
+
+import pytest
+
+from app.core.logging_config import configure_logging, stop_logging
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    configure_logging("INFO", use_queue=True, json_format=True, handlers=[logging.StreamHandler(stream)])
+    yield stream
+    configure_logging()
+
+
+def test_response_carries_a_generated_request_id(client):
+    a = client.get("/api/v1/projects").headers["x-request-id"]
+    b = client.get("/api/v1/projects").headers["x-request-id"]
+
+    assert len(a) == 32 and a != b
+
+
+def test_valid_incoming_request_id_is_kept_and_invalid_one_replaced(client):
+    kept = client.get("/api/v1/projects", headers={"X-Request-ID": "proxy-123.a_b"})
+    replaced = client.get("/api/v1/projects", headers={"X-Request-ID": "x" * 65})
+
+    assert kept.headers["x-request-id"] == "proxy-123.a_b"
+    assert replaced.headers["x-request-id"] != "x" * 65
+
+
+def test_service_logs_of_a_sync_route_carry_the_request_id(client, log_stream):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    resp = client.post(
+        "/api/v1/tasks",
+        json={"title": "T", "project_id": project["id"]},
+        headers={"X-Request-ID": "req-criar-task"},
+    )
+    assert resp.status_code in (200, 201)
+    stop_logging()
+
+    entries = [json.loads(line) for line in log_stream.getvalue().splitlines()]
+    created = [e for e in entries if e["message"].startswith("Tarefa criada")]
+    assert created and all(e["request_id"] == "req-criar-task" for e in created)
+    assert created[0]["logger"] == "taskmgr.tasks"
@@ -0,0 +1,100 @@
+# tests/integration/test_response_cache.py
+
+import pytest
+
+from app.core.config import settings
+
+
+def _stats(client):
+    return client.get("/api/v1/health/cache").json()
+
+
+def _project_with_tasks(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    user = client.post("/api/v1/users", json={"name": "Ana", "email": "ana@x"}).json()
+    task = client.post(
+        "/api/v1/tasks",
+        json={"title": "A", "project_id": project["id"], "priority": 1, "assignee_id": user["id"]},
+    ).json()
+    client.post("/api/v1/tasks", json={"title": "B", "project_id": project["id"]})
+    return project, task
+
+
+def test_repeated_reads_are_served_from_cache(client):
+    project, _ = _project_with_tasks(client)
+    before = _stats(client)
+    for _ in range(3):
+        client.get(f"/api/v1/projects/{project['id']}/progress")
+        client.get("/api/v1/tasks", params={"project_id": project["id"], "status": "OPEN"})
+    after = _stats(client)
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 4
+
+
+def test_equivalent_parameters_share_an_entry(client):
+    project, _ = _project_with_tasks(client)
+    client.get("/api/v1/tasks", params={"project_id": project["id"], "tag": ["b", "a"]})
+    before = _stats(client)
+    client.get("/api/v1/tasks", params={"tag": ["a", "b", "a"], "project_id": project["id"]})
+    assert _stats(client)["hits"] == before["hits"] + 1
+
+
+def test_status_change_invalidates_progress_can_archive_and_listing(client):
+    project, task = _project_with_tasks(client)
+    pid = project["id"]
+    assert client.get(f"/api/v1/projects/{pid}/progress").json() == {"progress": 0.0}
+    assert client.get(f"/api/v1/projects/{pid}/can-archive").json() == {"can_archive": False}
+    assert len(client.get("/api/v1/tasks", params={"status": "DONE"}).json()) == 0
+
+    resp = client.patch(f"/api/v1/tasks/{task['id']}/status", params={"new_status": "DONE"})
+    assert resp.status_code == 200
+
+    assert client.get(f"/api/v1/projects/{pid}/progress").json() == {"progress": 50.0}
+    assert client.get(f"/api/v1/projects/{pid}/can-archive").json() == {"can_archive": True}
+    assert len(client.get("/api/v1/tasks", params={"status": "DONE"}).json()) == 1
+
+
+def test_create_and_bulk_writes_invalidate_listings(client):
+    project, _ = _project_with_tasks(client)
+    pid = project["id"]
+    assert len(client.get("/api/v1/tasks", params={"project_id": pid}).json()) == 2
+    assert len(client.get("/api/v1/tasks").json()) == 2
+
+    client.post("/api/v1/tasks", json={"title": "C", "project_id": pid})
+    assert len(client.get("/api/v1/tasks", params={"project_id": pid}).json()) == 3
+    client.post("/api/v1/tasks/bulk", json=[{"title": "D", "project_id": pid}])
+    assert len(client.get("/api/v1/tasks").json()) == 4
+
+    client.patch("/api/v1/tasks/bulk/status", json={"new_status": "IN_PROGRESS", "filter": {"project_id": pid}})
+    listed = client.get("/api/v1/tasks", params={"project_id": pid, "status": "IN_PROGRESS"}).json()
+    assert len(listed) == 4
+
+
+def test_writes_to_one_project_keep_other_projects_cached(client):
+    project, _ = _project_with_tasks(client)
+    other = client.post("/api/v1/projects", json={"name": "Q"}).json()
+    client.get(f"/api/v1/projects/{project['id']}/progress")
+    client.post("/api/v1/tasks", json={"title": "X", "project_id": other["id"]})
+    before = _stats(client)
+    client.get(f"/api/v1/projects/{project['id']}/progress")
+    assert _stats(client)["hits"] == before["hits"] + 1
+
+
+def test_new_tag_invalidates_tag_filtered_listing(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    assert client.get("/api/v1/tasks", params={"tag": "ops"}).json() == []
+    tag = client.post("/api/v1/tags", json={"name": "ops"}).json()
+    client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"], "tag_ids": [tag["id"]]})
+    listed = client.get("/api/v1/tasks", params={"tag": "ops"}).json()
+    assert [t["tags"] for t in listed] == [["ops"]]
+
+
+def test_cache_can_be_switched_off(client, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    project, _ = _project_with_tasks(client)
+    before = _stats(client)
+    for _ in range(2):
+        client.get(f"/api/v1/projects/{project['id']}/progress")
+    after = _stats(client)
+    assert after["enabled"] is False
+    assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])
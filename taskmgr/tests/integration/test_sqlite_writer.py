@@ -0,0 +1,151 @@
+# tests/integration/test_sqlite_writer.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.cache import _bind_namespace, project_scope, response_cache
+from app.core.config import settings
+from app.core.exceptions import DomainError
+from app.models import migrations
+from app.models.entities import Project, Task
+from app.models.sqlite_writer import SQLiteWriter, configure_sqlite, run_write, writer_for
+from app.repositories.project_repo import ProjectRepo
+from app.repositories.task_repo import TaskRepo
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'writer.db'}"))
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def writer(engine):
+    writer = SQLiteWriter(engine)
+    yield writer
+    writer.stop()
+
+
+def _count(engine, model) -> int:
+    with Session(engine) as s:
+        return s.exec(select(func.count()).select_from(model)).one()
+
+
+def test_database_is_in_wal_mode(engine, writer):
+    writer.run(lambda s: ProjectRepo(s).create(Project(name="P")))
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+
+def test_jobs_waiting_together_share_one_commit(engine, writer):
+    project = writer.run(lambda s: ProjectRepo(s).create(Project(name="P")))
+    entered, gate = threading.Event(), threading.Event()
+    # segura o escritor para que os próximos jobs se acumulem na fila
+    blocker = writer.submit(lambda s: entered.set() or gate.wait(5))
+    assert entered.wait(5)
+    futures = [
+        writer.submit(lambda s, i=i: TaskRepo(s).create(Task(title=f"T{i}", project_id=project.id), []))
+        for i in range(30)
+    ]
+    gate.set()
+    blocker.result()
+    ids = [f.result().id for f in futures]
+
+    assert len(set(ids)) == 30
+    assert _count(engine, Task) == 30
+    # projeto + bloqueio + um lote com as 30 tasks
+    assert writer.stats() == {"jobs": 32, "batches": 3}
+
+
+def test_failed_job_only_rolls_back_its_own_changes(engine, writer):
+    def _fails(s):
+        s.add(Project(name="desfeito"))
+        s.flush()
+        raise DomainError("boom", "falhou")
+
+    entered, gate = threading.Event(), threading.Event()
+    writer.submit(lambda s: entered.set() or gate.wait(5))
+    assert entered.wait(5)
+    ok_before = writer.submit(lambda s: ProjectRepo(s).create(Project(name="A")))
+    failing = writer.submit(_fails)
+    ok_after = writer.submit(lambda s: ProjectRepo(s).create(Project(name="B")))
+    gate.set()
+
+    assert ok_before.result().name == "A"
+    assert ok_after.result().name == "B"
+    with pytest.raises(DomainError):
+        failing.result()
+    with Session(engine) as s:
+        assert sorted(p.name for p in s.exec(select(Project))) == ["A", "B"]
+
+
+def test_cache_is_invalidated_only_after_the_real_commit(engine, writer):
+    project = writer.run(lambda s: ProjectRepo(s).create(Project(name="P")))
+    key = (_bind_namespace(engine), project_scope(project.id))
+    before = response_cache._generations.get(key, 0)
+    seen_inside = []
+
+    def _write(s):
+        TaskRepo(s).create(Task(title="T", project_id=project.id), [])
+        # o SAVEPOINT já foi liberado, mas o lote ainda não fez COMMIT
+        seen_inside.append(response_cache._generations.get(key, 0))
+
+    writer.run(_write)
+    assert seen_inside == [before]
+    assert response_cache._generations[key] == before + 1
+
+
+def test_reads_do_not_wait_for_an_open_write(engine, writer):
+    project = writer.run(lambda s: ProjectRepo(s).create(Project(name="P")))
+    inside, release = threading.Event(), threading.Event()
+
+    def _slow_write(s):
+        TaskRepo(s).create(Task(title="T", project_id=project.id), [])
+        inside.set()
+        release.wait(5)
+
+    future = writer.submit(_slow_write)
+    assert inside.wait(5)
+    # transação de escrita aberta: a leitura vê o último commit, sem lock
+    assert _count(engine, Task) == 0
+    release.set()
+    future.result()
+    assert _count(engine, Task) == 1
+
+
+def test_run_write_serializes_concurrent_writers(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_WRITER_ENABLED", True)
+    with Session(engine) as s:
+        project = ProjectRepo(s).create(Project(name="P"))
+
+    def _create(i):
+        with Session(engine) as s:
+            return run_write(s, lambda w: TaskRepo(w).create(Task(title=f"T{i}", project_id=project.id), [])).id
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        ids = list(pool.map(_create, range(200)))
+
+    assert len(set(ids)) == 200
+    assert _count(engine, Task) == 200
+    with Session(engine) as s:
+        assert ProjectRepo(s).status_counts(project.id) == {"OPEN": 200}
+    writer_for(engine).stop()
+
+
+def test_run_write_runs_inline_when_disabled_or_in_memory(engine, monkeypatch):
+    memory = create_engine("sqlite://")
+    SQLModel.metadata.create_all(memory)
+    assert writer_for(memory) is None
+
+    monkeypatch.setattr(settings, "SQLITE_WRITER_ENABLED", False)
+    with Session(engine) as s:
+        run_write(s, lambda w: ProjectRepo(w).create(Project(name="P")))
+        # sem escritor, a escrita usa a própria sessão do request
+        assert s.exec(select(Project)).one().name == "P"
@@ -0,0 +1,113 @@
+# tests/integration/test_tag_dictionary.py
+
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.query_stats import instrument_engine, track_queries
+from app.models import migrations, versions
+from app.models.entities import Project, Tag, Task
+from app.repositories.tag_repo import TagRepo
+from app.repositories.task_repo import TaskRepo
+
+TAG_TABLE = re.compile(r"\b(FROM|JOIN)\s+tag\b", re.IGNORECASE)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tags.db"
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    migrations.migrate(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.commit()
+        urgent = TagRepo(s).create(Tag(name="urgent"))
+        bug = TagRepo(s).create(Tag(name="bug"))
+        repo = TaskRepo(s)
+        repo.create(Task(title="A", project_id=1), [urgent.id, bug.id])
+        repo.create(Task(title="B", project_id=1), [bug.id])
+    engine.dispose()
+    return path
+
+
+def _engine(path):
+    # cada engine tem o seu dicionário: dois engines simulam dois workers
+    return instrument_engine(create_engine(f"sqlite:///{path}"))
+
+
+def _selects(fn):
+    with track_queries(record_statements=True) as stats:
+        result = fn()
+    return result, [st for st, _ in stats.statements if st.lstrip().upper().startswith("SELECT")]
+
+
+def test_warm_dictionary_keeps_tag_table_out_of_task_queries(db_path):
+    engine = _engine(db_path)
+    with Session(engine) as s:
+        TagRepo(s).dictionary()
+
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+
+        def _run():
+            tasks = repo.list_with_filters(tag=["urgent", "bug"], tag_mode="all")
+            return [t.title for t in tasks], repo.tag_names_for_tasks(t.id for t in tasks)
+
+        (titles, names), statements = _selects(_run)
+
+    assert titles == ["A"]
+    assert list(names.values()) == [["urgent", "bug"]]
+    assert not [st for st in statements if TAG_TABLE.search(st)]
+    # só a conferência de versão, uma vez por sessão
+    assert sum("change_version" in st for st in statements) == 1
+
+
+def test_create_updates_the_dictionary_in_place(db_path):
+    engine = _engine(db_path)
+    with Session(engine) as s:
+        TagRepo(s).dictionary()
+        TagRepo(s).create(Tag(name="ops"))
+
+    with Session(engine) as s:
+        snapshot, statements = _selects(TagRepo(s).dictionary)
+    assert "ops" in snapshot.ids_by_name
+    assert not [st for st in statements if TAG_TABLE.search(st)]
+
+
+def test_writes_from_another_worker_are_detected(db_path):
+    engine, other = _engine(db_path), _engine(db_path)
+    with Session(engine) as s:
+        TagRepo(s).dictionary()
+
+    with Session(other) as s:
+        ops = TagRepo(s).create(Tag(name="ops"))
+        s.execute(text("INSERT INTO tasktaglink (task_id, tag_id) VALUES (2, :t)"), {"t": ops.id})
+        # escrita fora do TagRepo também muda a versão (triggers)
+        s.execute(text("UPDATE tag SET name = 'defect' WHERE name = 'bug'"))
+        s.commit()
+
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        assert [t.title for t in repo.list_with_filters(tag="ops")] == ["B"]
+        assert repo.list_with_filters(tag="bug") == []
+        assert repo.tag_names_for_task(2) == ["defect", "ops"]
+
+
+def test_migration_adds_version_triggers_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # simula um banco anterior à versão 5 do schema
+        for name in ("ai", "au", "ad"):
+            conn.execute(text(f"DROP TRIGGER tag_version_{name}"))
+        conn.execute(text("PRAGMA user_version = 4"))
+
+    assert migrations.migrate(engine) == list(range(5, migrations.LATEST_VERSION + 1))
+    with engine.begin() as conn:
+        before = versions.read_version(conn, versions.TAG_SCOPE)
+        assert before is not None
+        conn.execute(text("INSERT INTO tag (name) VALUES ('x')"))
+        assert versions.read_version(conn, versions.TAG_SCOPE) == before + 1
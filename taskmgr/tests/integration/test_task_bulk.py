@@ -0,0 +1,115 @@
+# tests/integration/test_task_bulk.py
+
+from datetime import date, timedelta
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.entities import Project, Task
+from app.repositories.task_repo import MAX_ROWID, TaskRepo
+
+
+def _setup(client):
+    user = client.post("/api/v1/users", json={"name": "Ana", "email": "a@x"}).json()
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    tag = client.post("/api/v1/tags", json={"name": "import"}).json()
+    return user, project, tag
+
+
+def test_bulk_create_reports_each_item(client):
+    user, project, tag = _setup(client)
+    past = (date.today() - timedelta(days=1)).isoformat()
+    payload = [
+        {"title": "A", "project_id": project["id"], "tag_ids": [tag["id"]]},
+        {"title": "B", "project_id": project["id"], "due_date": past},
+        {"title": "C", "project_id": project["id"], "assignee_id": user["id"]},
+        # limite padrão de abertas por usuário é 1: esta é recusada
+        {"title": "D", "project_id": project["id"], "assignee_id": user["id"]},
+        {"title": "E", "project_id": project["id"], "status": "DONE"},
+    ]
+    resp = client.post("/api/v1/tasks/bulk", json=payload)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 3
+    assert body["failed"] == 2
+    results = body["results"]
+    assert [r["ok"] for r in results] == [True, False, True, False, True]
+    assert results[1]["error"]["code"] == "due_date_past"
+    assert results[3]["error"]["code"] == "user_overload"
+
+    listed = client.get("/api/v1/tasks", params={"project_id": project["id"]}).json()
+    by_title = {t["title"]: t for t in listed}
+    assert sorted(by_title) == ["A", "C", "E"]
+    assert by_title["A"]["tags"] == ["import"]
+    assert by_title["A"]["id"] == results[0]["id"]
+
+
+def test_bulk_create_keeps_counters_and_search_in_sync(client):
+    user, project, _ = _setup(client)
+    payload = [
+        {"title": f"Importada {i}", "project_id": project["id"], "status": "DONE" if i % 2 else "OPEN"}
+        for i in range(10)
+    ]
+    assert client.post("/api/v1/tasks/bulk", json=payload).json()["created"] == 10
+
+    progress = client.get(f"/api/v1/projects/{project['id']}/progress").json()
+    assert progress["progress"] == 50.0
+    found = client.get("/api/v1/tasks", params={"q": "importada"}).json()
+    assert len(found) == 10
+
+    # a vaga do usuário continua livre e é respeitada depois do lote
+    r = client.post("/api/v1/tasks", json={"title": "X", "project_id": project["id"], "assignee_id": user["id"]})
+    assert r.status_code == 200
+    r = client.post("/api/v1/tasks", json={"title": "Y", "project_id": project["id"], "assignee_id": user["id"]})
+    assert r.status_code == 400
+
+
+def test_bulk_create_uses_a_fixed_number_of_statements(client, query_budget):
+    _, project, tag = _setup(client)
+
+    def _count(n):
+        payload = [
+            {"title": f"T{i}", "project_id": project["id"], "tag_ids": [tag["id"]]}
+            for i in range(n)
+        ]
+        resp = client.post("/api/v1/tasks/bulk", json=payload)
+        assert resp.json()["created"] == n
+        # tasks e links num executemany cada: a contagem não depende de n
+        return query_budget(resp, 9)
+
+    assert _count(5) == _count(50)
+
+
+def test_bulk_create_returns_the_ids_the_database_assigned(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add(Task(id=MAX_ROWID, title="ultima", project_id=1))
+        s.commit()
+
+    with Session(engine) as s:
+        items = [(Task(title=f"T{i}", project_id=1), []) for i in range(20)]
+        ids = TaskRepo(s).bulk_create(items)
+        assert [s.get(Task, task_id).title for task_id in ids] == [f"T{i}" for i in range(20)]
+    engine.dispose()
+
+
+def test_bulk_create_rejects_invalid_payload(client):
+    _, project, _ = _setup(client)
+    resp = client.post("/api/v1/tasks/bulk", json=[{"title": "A", "project_id": project["id"], "priority": 9}])
+    assert resp.status_code == 422
+
+
+def test_bulk_create_ids_follow_the_current_max_id(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add(Task(id=100, title="antiga", project_id=1))
+        s.commit()
+
+    with Session(engine) as s:
+        ids = TaskRepo(s).bulk_create([(Task(title=f"T{i}", project_id=1), []) for i in range(3)])
+        assert ids == [101, 102, 103]
+        assert [s.get(Task, task_id).title for task_id in ids] == ["T0", "T1", "T2"]
+    engine.dispose()
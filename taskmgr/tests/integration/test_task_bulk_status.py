@@ -0,0 +1,138 @@
+# tests/integration/test_task_bulk_status.py
+
+
+from app.core.config import settings
+
+
+def _setup(client, n_assigned=3, n_unassigned=2):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    ids = []
+    for i in range(n_assigned):
+        user = client.post("/api/v1/users", json={"name": f"U{i}", "email": f"u{i}@x"}).json()
+        r = client.post("/api/v1/tasks", json={"title": f"A{i}", "project_id": project["id"], "assignee_id": user["id"]})
+        ids.append(r.json()["id"])
+    for i in range(n_unassigned):
+        r = client.post("/api/v1/tasks", json={"title": f"S{i}", "project_id": project["id"]})
+        ids.append(r.json()["id"])
+    return project, ids
+
+
+def test_bulk_done_by_ids_reports_each_task(client):
+    project, ids = _setup(client)
+    resp = client.patch(
+        "/api/v1/tasks/bulk/status",
+        json={"new_status": "DONE", "ids": ids + [999999]},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 3
+    assert body["failed"] == 3
+
+    by_id = {r["id"]: r for r in body["results"]}
+    assert [r["id"] for r in body["results"]] == ids + [999999]
+    assert all(by_id[i]["ok"] and by_id[i]["status"] == "DONE" for i in ids[:3])
+    assert [by_id[i]["error"]["code"] for i in ids[3:]] == ["no_assignee", "no_assignee"]
+    assert by_id[999999]["error"]["code"] == "not_found"
+
+    listed = client.get("/api/v1/tasks", params={"project_id": project["id"], "status": "DONE"}).json()
+    assert sorted(t["id"] for t in listed) == sorted(ids[:3])
+    assert client.get(f"/api/v1/projects/{project['id']}/progress").json()["progress"] == 60.0
+
+
+def test_bulk_status_by_filter(client):
+    project, ids = _setup(client)
+    resp = client.patch(
+        "/api/v1/tasks/bulk/status",
+        json={"new_status": "IN_PROGRESS", "filter": {"project_id": project["id"]}},
+    )
+    body = resp.json()
+    assert body["updated"] == 5
+    assert [r["id"] for r in body["results"]] == sorted(ids)
+
+    stats = client.get(f"/api/v1/projects/{project['id']}/stats").json()
+    assert stats["by_status"] == {"IN_PROGRESS": 5}
+
+
+def test_bulk_done_frees_open_slots(client):
+    user = client.post("/api/v1/users", json={"name": "Ana", "email": "a@x"}).json()
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    t = client.post("/api/v1/tasks", json={"title": "T", "project_id": project["id"], "assignee_id": user["id"]}).json()
+    blocked = client.post("/api/v1/tasks", json={"title": "U", "project_id": project["id"], "assignee_id": user["id"]})
+    assert blocked.status_code == 400
+
+    client.patch("/api/v1/tasks/bulk/status", json={"new_status": "DONE", "ids": [t["id"]]})
+    again = client.post("/api/v1/tasks", json={"title": "U", "project_id": project["id"], "assignee_id": user["id"]})
+    assert again.status_code == 200
+
+
+def test_bulk_status_uses_a_fixed_number_of_statements(client, query_budget, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 100)
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    user = client.post("/api/v1/users", json={"name": "U", "email": "u@x"}).json()
+
+    def _count(n):
+        ids = [
+            client.post("/api/v1/tasks", json={"title": f"T{i}", "project_id": project["id"], "assignee_id": user["id"]}).json()["id"]
+            for i in range(n)
+        ]
+        r = client.patch("/api/v1/tasks/bulk/status", json={"new_status": "DONE", "ids": ids})
+        assert r.json()["updated"] == n
+        return query_budget(r, 10)
+
+    # os contadores mudam uma vez por projeto/responsável, não por task
+    assert _count(2) == _count(12)
+
+
+def test_bulk_status_requires_ids_or_filter(client):
+    assert client.patch("/api/v1/tasks/bulk/status", json={"new_status": "DONE"}).status_code == 422
+    both = {"new_status": "DONE", "ids": [1], "filter": {"project_id": 1}}
+    assert client.patch("/api/v1/tasks/bulk/status", json=both).status_code == 422
+
+
+def test_bulk_status_rejects_filter_without_criteria(client):
+    _, ids = _setup(client)
+    for empty in ({}, {"tag_mode": "all"}, {"q": "", "tag": []}):
+        resp = client.patch("/api/v1/tasks/bulk/status", json={"new_status": "IN_PROGRESS", "filter": empty})
+        assert resp.status_code == 422
+    statuses = {t["status"] for t in client.get("/api/v1/tasks").json()}
+    assert statuses == {"OPEN"}
+
+
+def test_bulk_status_limits_number_of_ids(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BULK_ITEMS", 3)
+    resp = client.patch("/api/v1/tasks/bulk/status", json={"new_status": "DONE", "ids": [1, 2, 3, 4]})
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] == "bulk_too_large"
+
+
+def test_bulk_status_filter_with_project_id_zero_matches_nothing(client):
+    _setup(client)
+    other = client.post("/api/v1/projects", json={"name": "Q"}).json()
+    client.post("/api/v1/tasks", json={"title": "Q1", "project_id": other["id"]})
+
+    resp = client.patch("/api/v1/tasks/bulk/status", json={"new_status": "IN_PROGRESS", "filter": {"project_id": 0}})
+
+    assert resp.status_code == 200
+    assert resp.json()["updated"] == 0
+    assert {t["status"] for t in client.get("/api/v1/tasks").json()} == {"OPEN"}
+
+
+def test_bulk_status_limits_number_of_tasks_matched_by_filter(client, monkeypatch):
+    project, ids = _setup(client, n_assigned=2, n_unassigned=2)
+    monkeypatch.setattr(settings, "MAX_BULK_ITEMS", 3)
+
+    resp = client.patch(
+        "/api/v1/tasks/bulk/status",
+        json={"new_status": "IN_PROGRESS", "filter": {"project_id": project["id"]}},
+    )
+
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] == "bulk_too_large"
+    assert {t["status"] for t in client.get("/api/v1/tasks").json()} == {"OPEN"}
+
+    monkeypatch.setattr(settings, "MAX_BULK_ITEMS", 4)
+    resp = client.patch(
+        "/api/v1/tasks/bulk/status",
+        json={"new_status": "IN_PROGRESS", "filter": {"project_id": project["id"]}},
+    )
+    assert resp.json()["updated"] == 4
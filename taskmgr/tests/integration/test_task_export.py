@@ -0,0 +1,80 @@
+# tests/integration/test_task_export.py
+
+import csv
+import io
+import json
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.entities import Project, Task
+from app.repositories.task_repo import TaskRepo
+from app.services.export_service import TaskExportService
+
+
+def _seed(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    other = client.post("/api/v1/projects", json={"name": "Q"}).json()
+    urgent = client.post("/api/v1/tags", json={"name": "urgent"}).json()
+    bug = client.post("/api/v1/tags", json={"name": "bug"}).json()
+    client.post("/api/v1/tasks", json={
+        "title": "A", "project_id": p["id"], "tag_ids": [urgent["id"], bug["id"]],
+    })
+    client.post("/api/v1/tasks", json={
+        "title": "B, com vírgula", "description": 'tem "aspas"', "project_id": p["id"],
+    })
+    client.post("/api/v1/tasks", json={"title": "C", "project_id": other["id"]})
+    return p
+
+
+def test_export_ndjson_matches_listing(client):
+    p = _seed(client)
+    resp = client.get("/api/v1/tasks/export", params={"project_id": p["id"]})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    listed = client.get("/api/v1/tasks", params={"project_id": p["id"]}).json()
+    assert sorted(exported, key=lambda t: t["id"]) == sorted(listed, key=lambda t: t["id"])
+    assert sorted(exported[0]["tags"]) == ["bug", "urgent"]
+
+
+def test_export_csv(client):
+    p = _seed(client)
+    resp = client.get("/api/v1/tasks/export", params={"project_id": p["id"], "format": "csv"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="tasks.csv"' in resp.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["title"] for r in rows] == ["A", "B, com vírgula"]
+    assert rows[1]["description"] == 'tem "aspas"'
+    assert sorted(rows[0]["tags"].split("|")) == ["bug", "urgent"]
+    assert rows[1]["tags"] == ""
+
+
+def test_export_applies_filters(client):
+    _seed(client)
+    resp = client.get("/api/v1/tasks/export", params={"tag": "urgent"})
+    assert [json.loads(line)["title"] for line in resp.text.splitlines()] == ["A"]
+
+
+def test_export_rejects_unknown_format(client):
+    resp = client.get("/api/v1/tasks/export", params={"format": "xml"})
+    assert resp.status_code == 422
+
+
+def test_export_is_produced_in_chunks(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add_all(Task(title=f"T{i}", project_id=1) for i in range(1050))
+        s.commit()
+
+        svc = TaskExportService(TaskRepo(s), chunk_rows=100)
+        chunks = list(svc.stream("ndjson", project_id=1))
+        assert len(chunks) == 11
+        assert sum(c.count("\n") for c in chunks) == 1050
+
+        csv_chunks = list(svc.stream("csv", project_id=1))
+        assert sum(c.count("\n") for c in csv_chunks) == 1051  # + cabeçalho
@@ -0,0 +1,109 @@
+# tests/integration/test_task_pagination.py
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.query_stats import track_queries
+from app.repositories.task_repo import TaskRepo
+
+
+def _seed(client, n=23):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    today = date.today()
+    for i in range(n):
+        payload = {
+            "title": f"T{i}",
+            "project_id": project["id"],
+            # prioridades e datas repetidas para exercitar o desempate por id
+            "priority": (i % 3) + 1,
+        }
+        if i % 4:
+            payload["due_date"] = (today + timedelta(days=i % 5)).isoformat()
+        assert client.post("/api/v1/tasks", json=payload).status_code == 200
+    return project
+
+
+def _walk(client, params, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, limit=limit)
+        if cursor:
+            query["cursor"] = cursor
+        resp = client.get("/api/v1/tasks", params=query)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= limit
+        ids.extend(t["id"] for t in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("order_by", [None, "priority", "due_date"])
+def test_pages_cover_full_listing_in_order(client, order_by):
+    project = _seed(client)
+    params = {"project_id": project["id"]}
+    if order_by:
+        params["order_by"] = order_by
+
+    full = client.get("/api/v1/tasks", params=params).json()
+    if order_by is None:
+        expected = sorted(t["id"] for t in full)
+    else:
+        expected = [t["id"] for t in full]
+
+    ids, pages = _walk(client, params, limit=5)
+    assert ids == expected
+    assert len(ids) == len(set(ids)) == 23
+    assert pages == 5
+
+
+def test_last_page_has_no_next_cursor(client):
+    project = _seed(client, n=3)
+    body = client.get(
+        "/api/v1/tasks", params={"project_id": project["id"], "limit": 10}
+    ).json()
+    assert len(body["items"]) == 3
+    assert body["next_cursor"] is None
+
+
+def test_deep_pages_do_not_use_offset(client, db_session):
+    project = _seed(client, n=6)
+    repo = TaskRepo(db_session)
+    cursor = None
+    with track_queries(record_statements=True) as stats:
+        for _ in range(3):
+            _, cursor = repo.list_page(limit=2, cursor=cursor, order_by="priority", project_id=project["id"])
+    assert cursor is None
+
+    paged = [(s, p) for s, p in stats.statements if "LIMIT" in s.upper()]
+    assert len(paged) == 3
+    # o dialeto SQLite sempre emite "LIMIT ? OFFSET ?"; o offset tem que ser 0
+    assert all(p[-1] == 0 for s, p in paged if "OFFSET" in s.upper())
+
+
+def test_invalid_cursor_returns_422(client):
+    resp = client.get("/api/v1/tasks", params={"limit": 5, "cursor": "lixo!!"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] == "invalid_cursor"
+
+
+def test_cursor_from_other_ordering_is_rejected(client):
+    project = _seed(client, n=4)
+    body = client.get(
+        "/api/v1/tasks",
+        params={"project_id": project["id"], "limit": 2, "order_by": "priority"},
+    ).json()
+    resp = client.get(
+        "/api/v1/tasks",
+        params={
+            "project_id": project["id"],
+            "limit": 2,
+            "order_by": "due_date",
+            "cursor": body["next_cursor"],
+        },
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] == "invalid_cursor"
@@ -0,0 +1,109 @@
+# tests/integration/test_task_search.py
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.entities import Project, Task
+from app.models.search import ensure_search_index, has_search_index, rebuild_search_index
+from app.repositories.task_repo import TaskRepo
+
+
+def _create(client, project_id, title, description=""):
+    resp = client.post(
+        "/api/v1/tasks",
+        json={"title": title, "description": description, "project_id": project_id},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _titles(client, **params):
+    resp = client.get("/api/v1/tasks", params=params)
+    assert resp.status_code == 200
+    return [t["title"] for t in resp.json()]
+
+
+def test_q_matches_title_and_description(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    _create(client, p["id"], "Corrigir login", "erro no formulário")
+    _create(client, p["id"], "Deploy", "subir correção do login em produção")
+    _create(client, p["id"], "Documentação")
+
+    assert sorted(_titles(client, q="login")) == ["Corrigir login", "Deploy"]
+    assert _titles(client, q="formulário") == ["Corrigir login"]
+
+
+def test_q_matches_word_prefix_and_requires_all_words(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    _create(client, p["id"], "Relatório mensal")
+    _create(client, p["id"], "Relatório anual")
+
+    assert sorted(_titles(client, q="relat")) == ["Relatório anual", "Relatório mensal"]
+    assert _titles(client, q="relatório mensal") == ["Relatório mensal"]
+    # pontuação solta não quebra a sintaxe do MATCH
+    assert _titles(client, q='"mensal*') == ["Relatório mensal"]
+    assert _titles(client, q="!!!") == []
+
+
+def test_order_by_relevance(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    _create(client, p["id"], "Outra coisa", "cache")
+    _create(client, p["id"], "cache cache cache", "invalidação do cache")
+
+    assert _titles(client, q="cache", order_by="relevance") == [
+        "cache cache cache",
+        "Outra coisa",
+    ]
+
+
+def test_relevance_pagination_walks_all_matches(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    for i in range(7):
+        _create(client, p["id"], f"bug {i}", "bug " * (i % 3))
+
+    full = _titles(client, q="bug", order_by="relevance")
+    seen, cursor = [], None
+    while True:
+        params = {"q": "bug", "order_by": "relevance", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/v1/tasks", params=params).json()
+        seen.extend(t["title"] for t in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == full
+    assert len(seen) == 7
+
+
+def test_index_follows_status_and_title_updates(client):
+    p = client.post("/api/v1/projects", json={"name": "P"}).json()
+    t = _create(client, p["id"], "Migrar banco")
+    client.patch(f"/api/v1/tasks/{t['id']}/status", params={"new_status": "IN_PROGRESS"})
+    assert _titles(client, q="migrar") == ["Migrar banco"]
+
+
+def test_existing_database_gets_index_built(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # simula um banco criado antes do índice FTS existir
+        conn.execute(text("DROP TABLE task_fts"))
+        for trg in ("task_fts_ai", "task_fts_ad", "task_fts_au"):
+            conn.execute(text(f"DROP TRIGGER {trg}"))
+    with Session(engine) as s:
+        s.add(Project(id=1, name="P"))
+        s.add(Task(title="Tarefa antiga", project_id=1))
+        s.commit()
+
+    with engine.begin() as conn:
+        assert not has_search_index(conn)
+        assert ensure_search_index(conn) is True
+        assert ensure_search_index(conn) is False
+        rebuild_search_index(conn)
+
+    with Session(engine) as s:
+        repo = TaskRepo(s)
+        assert [t.title for t in repo.list_with_filters(q="antiga")] == ["Tarefa antiga"]
+        repo.create(Task(title="Tarefa nova", project_id=1), [])
+        assert [t.title for t in repo.list_with_filters(q="nova")] == ["Tarefa nova"]
@@ -0,0 +1,138 @@
+# tests/integration/test_task_tag_filters.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session
+
+from app.core.exceptions import ValidationError
+from app.core.query_stats import track_queries
+from app.repositories.task_repo import TaskRepo
+
+
+def _seed(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    tags = {
+        name: client.post("/api/v1/tags", json={"name": name}).json()["id"]
+        for name in ("urgent", "bug", "ui")
+    }
+    layout = {
+        "T-urgent-bug": ["urgent", "bug"],
+        "T-urgent-bug-ui": ["urgent", "bug", "ui"],
+        "T-urgent": ["urgent"],
+        "T-ui": ["ui"],
+        "T-none": [],
+    }
+    ids = {}
+    for i, (title, names) in enumerate(layout.items()):
+        resp = client.post(
+            "/api/v1/tasks",
+            json={
+                "title": title,
+                "project_id": project["id"],
+                "priority": 5 - i,
+                "tag_ids": [tags[n] for n in names],
+            },
+        )
+        assert resp.status_code == 200
+        ids[title] = resp.json()["id"]
+    return project, ids
+
+
+def _titles(resp):
+    assert resp.status_code == 200
+    return [t["title"] for t in resp.json()]
+
+
+def test_tag_any_returns_each_task_once(client):
+    project, _ = _seed(client)
+    titles = _titles(client.get(
+        "/api/v1/tasks",
+        params={"project_id": project["id"], "tag": ["urgent", "bug", "ui"]},
+    ))
+    assert sorted(titles) == ["T-ui", "T-urgent", "T-urgent-bug", "T-urgent-bug-ui"]
+    assert len(titles) == len(set(titles))
+
+
+def test_tag_all_requires_every_tag(client):
+    project, _ = _seed(client)
+    params = {"project_id": project["id"], "tag": ["urgent", "bug"], "tag_mode": "all"}
+    titles = _titles(client.get("/api/v1/tasks", params=params))
+    assert sorted(titles) == ["T-urgent-bug", "T-urgent-bug-ui"]
+
+    params["tag"] = ["urgent", "bug", "ui"]
+    assert _titles(client.get("/api/v1/tasks", params=params)) == ["T-urgent-bug-ui"]
+
+
+def test_repeated_tag_counts_once_in_all_mode(client):
+    project, _ = _seed(client)
+    params = {"project_id": project["id"], "tag": ["ui", "ui"], "tag_mode": "all"}
+    assert sorted(_titles(client.get("/api/v1/tasks", params=params))) == [
+        "T-ui", "T-urgent-bug-ui",
+    ]
+
+
+def test_tag_filter_combines_with_order_and_other_filters(client):
+    project, ids = _seed(client)
+    resp = client.patch(
+        f"/api/v1/tasks/{ids['T-urgent']}/status", params={"new_status": "IN_PROGRESS"}
+    )
+    assert resp.status_code == 200
+
+    params = {"project_id": project["id"], "tag": ["urgent", "ui"], "order_by": "priority"}
+    titles = _titles(client.get("/api/v1/tasks", params=params))
+    assert titles == ["T-ui", "T-urgent", "T-urgent-bug-ui", "T-urgent-bug"]
+
+    params["status"] = "OPEN"
+    titles = _titles(client.get("/api/v1/tasks", params=params))
+    assert titles == ["T-ui", "T-urgent-bug-ui", "T-urgent-bug"]
+
+
+def test_tag_filter_pages_without_duplicates(client):
+    project, _ = _seed(client)
+    params = {"project_id": project["id"], "tag": ["urgent", "bug", "ui"], "limit": 1}
+    seen, cursor = [], None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/v1/tasks", params=params).json()
+        seen.extend(t["id"] for t in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 4
+
+
+def test_tag_filter_is_a_single_query(client, db_session):
+    project, _ = _seed(client)
+    with track_queries(record_statements=True) as stats:
+        TaskRepo(db_session).list_with_filters(
+            project_id=project["id"], tag=["urgent", "bug"], tag_mode="all", as_rows=True
+        )
+    statements = [s for s, _ in stats.statements if "FROM task " in s and "tasktaglink" in s]
+    assert len(statements) == 1
+    assert "GROUP BY" in statements[0] and "DISTINCT" not in statements[0].split("FROM")[0]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_accepts_multiple_tags(client, fmt):
+    project, _ = _seed(client)
+    resp = client.get(
+        "/api/v1/tasks/export",
+        params={"format": fmt, "project_id": project["id"], "tag": ["urgent", "ui"], "tag_mode": "all"},
+    )
+    assert resp.status_code == 200
+    assert "T-urgent-bug-ui" in resp.text
+    assert "T-urgent\"" not in resp.text and "T-ui\"" not in resp.text
+
+
+def test_invalid_tag_mode_is_rejected(client):
+    resp = client.get("/api/v1/tasks", params={"tag": "bug", "tag_mode": "some"})
+    assert resp.status_code == 422
+
+
+def test_invalid_tag_mode_in_repo_raises_validation_error(client):
+    engine = create_engine("sqlite:///./test_integration.db")
+    with Session(engine) as session, pytest.raises(ValidationError) as exc:
+        TaskRepo(session).list_with_filters(tag="bug", tag_mode="some")
+    engine.dispose()
+    assert exc.value.code == "invalid_tag_mode"
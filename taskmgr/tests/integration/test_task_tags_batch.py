@@ -0,0 +1,57 @@
+# tests/integration/test_task_tags_batch.py
+
+
+def _seed(client, n_tasks):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    t1 = client.post("/api/v1/tags", json={"name": "urgent"}).json()
+    t2 = client.post("/api/v1/tags", json={"name": "bug"}).json()
+    for i in range(n_tasks):
+        tag_ids = [t1["id"], t2["id"]] if i % 2 == 0 else []
+        r = client.post(
+            "/api/v1/tasks",
+            json={"title": f"T{i}", "project_id": project["id"], "tag_ids": tag_ids},
+        )
+        assert r.status_code == 200
+    return project
+
+
+def _queries_for_listing(client, query_budget, project_id):
+    resp = client.get(f"/api/v1/tasks?project_id={project_id}")
+    assert resp.status_code == 200
+    # tags de todas as tasks numa consulta só: o orçamento não cresce com a lista
+    return query_budget(resp, 4), resp.json()
+
+
+def test_list_tasks_returns_tags_for_each_task(client, query_budget):
+    project = _seed(client, 4)
+    _, data = _queries_for_listing(client, query_budget, project["id"])
+    tags_by_title = {t["title"]: t["tags"] for t in data}
+    assert tags_by_title == {
+        "T0": ["urgent", "bug"],
+        "T1": [],
+        "T2": ["urgent", "bug"],
+        "T3": [],
+    }
+
+
+def test_list_tasks_query_count_does_not_grow_with_result_size(client, query_budget):
+    small = _seed(client, 3)
+    large = _seed(client, 40)
+
+    n_small, data_small = _queries_for_listing(client, query_budget, small["id"])
+    n_large, data_large = _queries_for_listing(client, query_budget, large["id"])
+
+    assert len(data_small) == 3
+    assert len(data_large) == 40
+    assert n_small == n_large
+
+
+def test_create_task_returns_tag_names(client):
+    project = client.post("/api/v1/projects", json={"name": "P"}).json()
+    tag = client.post("/api/v1/tags", json={"name": "backend"}).json()
+    resp = client.post(
+        "/api/v1/tasks",
+        json={"title": "X", "project_id": project["id"], "tag_ids": [tag["id"]]},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["tags"] == ["backend"]
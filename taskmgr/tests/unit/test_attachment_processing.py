@@ -0,0 +1,41 @@
+# tests/unit/test_attachment_processing.py
+
+import hashlib
+
+import pytest
+
+from app.services.attachment_processing import PREVIEW_CHARS, process_attachment, sniff_mime
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b"\x89PNG\r\n\x1a\n....", "image/png"),
+        (b"\xff\xd8\xff\xe0", "image/jpeg"),
+        (b"GIF89a", "image/gif"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+        (b"%PDF-1.7", "application/pdf"),
+        (b"PK\x03\x04", "application/zip"),
+        ("olá, mundo\n".encode(), "text/plain"),
+        # caractere multibyte cortado no fim do trecho lido continua sendo texto
+        ("ação".encode()[:-1], "text/plain"),
+        (b"abc\x00def", "application/octet-stream"),
+        (b"\xff\xfe\xfd\x80", "application/octet-stream"),
+    ],
+)
+def test_sniff_mime(head, expected):
+    assert sniff_mime(head) == expected
+
+
+def test_process_attachment_text_preview_and_checksum(tmp_path):
+    path = tmp_path / "blob"
+    content = ("linha\n" * 200).encode()
+    path.write_bytes(content)
+    sha = hashlib.sha256(content).hexdigest()
+
+    result = process_attachment(str(path), sha, str(tmp_path / "thumb.png"))
+
+    assert result["error"] is None
+    assert result["mime_type"] == "text/plain"
+    assert result["preview"] == ("linha\n" * 200)[:PREVIEW_CHARS]
+    assert process_attachment(str(path), "0" * 64, str(tmp_path / "thumb.png")) == {"error": "checksum_mismatch"}
@@ -0,0 +1,86 @@
+import pytest
+
+from app.core.cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _compute(value, calls):
+    def _fn():
+        calls.append(value)
+        return value
+    return _fn
+
+
+def test_hit_after_miss():
+    cache = ResponseCache(maxsize=4, ttl=10)
+    calls = []
+    assert cache.get_or_compute("k", ["s"], _compute(1, calls)) == 1
+    assert cache.get_or_compute("k", ["s"], _compute(2, calls)) == 1
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = ResponseCache(maxsize=4, ttl=10, clock=clock)
+    calls = []
+    cache.get_or_compute("k", [], _compute(1, calls))
+    clock.now = 10
+    assert cache.get_or_compute("k", [], _compute(2, calls)) == 2
+    assert cache.expirations == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResponseCache(maxsize=2, ttl=10)
+    calls = []
+    cache.get_or_compute("a", [], _compute("a", calls))
+    cache.get_or_compute("b", [], _compute("b", calls))
+    cache.get_or_compute("a", [], _compute("a", calls))  # "a" passa a ser o mais recente
+    cache.get_or_compute("c", [], _compute("c", calls))
+    assert cache.evictions == 1
+    cache.get_or_compute("a", [], _compute("a", calls))
+    cache.get_or_compute("b", [], _compute("b", calls))
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_invalidate_only_drops_entries_of_that_scope():
+    cache = ResponseCache(maxsize=4, ttl=10)
+    calls = []
+    cache.get_or_compute("p1", ["project:1"], _compute("p1", calls))
+    cache.get_or_compute("p2", ["project:2"], _compute("p2", calls))
+    cache.invalidate("project:1")
+    cache.get_or_compute("p1", ["project:1"], _compute("p1", calls))
+    cache.get_or_compute("p2", ["project:2"], _compute("p2", calls))
+    assert calls == ["p1", "p2", "p1"]
+    assert cache.invalidations == 1
+
+
+def test_value_computed_during_a_write_is_not_stored():
+    cache = ResponseCache(maxsize=4, ttl=10)
+
+    def _racing():
+        # uma escrita confirma (e invalida) enquanto a leitura ainda roda
+        cache.invalidate("s")
+        return "old"
+
+    assert cache.get_or_compute("k", ["s"], _racing) == "old"
+    assert cache.get_or_compute("k", ["s"], lambda: "new") == "new"
+    assert cache.stats()["size"] == 1
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache(maxsize=4, ttl=10)
+
+    def _boom():
+        raise ValueError("x")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("k", [], _boom)
+    assert cache.get_or_compute("k", [], lambda: 1) == 1
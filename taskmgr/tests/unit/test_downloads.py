@@ -0,0 +1,65 @@
+# tests/unit/test_downloads.py
+
+import os
+
+import pytest
+
+from app.core.downloads import RangeFileResponse, parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-9", (0, 9)),
+        ("bytes=5-", (5, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=90-500", (90, 99)),
+        # ignorados: o arquivo vai inteiro
+        ("bytes=0-1,4-5", None),
+        ("items=0-9", None),
+        ("bytes=abc", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=50-10", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+async def _send_messages(response, extensions):
+    messages = []
+
+    async def _send(message):
+        if message["type"] == "http.response.zerocopysend":
+            # o servidor usaria sendfile(); aqui lemos pelo descritor
+            message = dict(message, data=os.pread(message["file"], message["count"], message["offset"]))
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "extensions": extensions}
+    await response(scope, None, _send)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_zero_copy_extensions_are_used_when_offered(tmp_path):
+    path = tmp_path / "f.bin"
+    path.write_bytes(b"0123456789")
+
+    msgs = await _send_messages(
+        RangeFileResponse(str(path), offset=2, count=3), {"http.response.zerocopysend": {}}
+    )
+    assert msgs[1]["type"] == "http.response.zerocopysend"
+    assert msgs[1]["data"] == b"234"
+
+    msgs = await _send_messages(RangeFileResponse(str(path)), {"http.response.pathsend": {}})
+    assert msgs[1] == {"type": "http.response.pathsend", "path": str(path)}
+
+    msgs = await _send_messages(RangeFileResponse(str(path), offset=8, count=2), {})
+    assert b"".join(m["body"] for m in msgs[1:]) == b"89"
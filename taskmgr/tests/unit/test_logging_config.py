@@ -0,0 +1,123 @@
+# tests/unit/test_logging_config.py
+
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from app.core import logging_config
+from app.core.logging_config import JsonFormatter, SamplingFilter, configure_logging, get_logger, stop_logging
+from app.core.request_context import request_id_var
+
+
+@pytest.fixture
+def captured():
+    """Reconfigura o logger com um handler em memória; volta ao padrão no fim."""
+    stream = io.StringIO()
+
+    def _configure(**kwargs):
+        configure_logging("INFO", handlers=[logging.StreamHandler(stream)], **kwargs)
+        return stream
+
+    yield _configure
+    configure_logging()
+
+
+def _record(name="taskmgr.tasks", level=logging.INFO, msg="linha"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_sampling_uses_the_longest_matching_logger_prefix():
+    f = SamplingFilter({"taskmgr.tasks": 0.0, "taskmgr": 1.0})
+
+    assert not f.filter(_record("taskmgr.tasks"))
+    assert not f.filter(_record("taskmgr.tasks.bulk"))
+    assert f.filter(_record("taskmgr.projects"))
+    # avisos e erros nunca são descartados
+    assert f.filter(_record("taskmgr.tasks", logging.WARNING))
+
+
+def test_json_formatter_includes_request_id_and_traceback():
+    try:
+        raise RuntimeError("falhou")
+    except RuntimeError:
+        record = logging.LogRecord("taskmgr", logging.ERROR, __file__, 1, "erro %s", (42,), True)
+        record.exc_info = sys.exc_info()
+    record.request_id = "abc"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "erro 42"
+    assert entry["level"] == "ERROR"
+    assert entry["request_id"] == "abc"
+    assert "RuntimeError: falhou" in entry["exc_info"]
+
+
+def test_queue_pipeline_writes_in_the_listener_with_the_callers_request_id(captured):
+    stream = captured(use_queue=True, json_format=True, sampling={"taskmgr.tasks": 0.0})
+    token = request_id_var.set("req-1")
+    try:
+        get_logger("tasks").info("amostrada")          # descartada pela amostragem
+        get_logger("projects").info("projeto %s", 7)
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            get_logger("tasks").exception("falha")
+    finally:
+        request_id_var.reset(token)
+    stop_logging()   # esvazia a fila
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(e["logger"], e["message"], e["request_id"]) for e in entries] == [
+        ("taskmgr.projects", "projeto 7", "req-1"),
+        ("taskmgr.tasks", "falha", "req-1"),
+    ]
+    assert "ZeroDivisionError" in entries[1]["exc_info"]
+
+
+def test_without_queue_records_are_written_directly_with_request_id(captured):
+    stream = captured(use_queue=False)
+
+    get_logger("tasks").info("fora")
+    token = request_id_var.set("req-2")
+    try:
+        get_logger("tasks").info("dentro")
+    finally:
+        request_id_var.reset(token)
+
+    assert logging_config._listener is None
+    lines = stream.getvalue().splitlines()
+    assert lines[0].endswith("[INFO] taskmgr.tasks [-] - fora")
+    assert lines[1].endswith("[INFO] taskmgr.tasks [req-2] - dentro")
+
+
+def test_sampling_is_decided_once_for_all_handlers():
+    streams = [io.StringIO(), io.StringIO()]
+    configure_logging(
+        "INFO", use_queue=False, sampling={"taskmgr.tasks": 0.5},
+        handlers=[logging.StreamHandler(s) for s in streams],
+    )
+    try:
+        for i in range(200):
+            get_logger("tasks").info("linha %s", i)
+    finally:
+        configure_logging()
+
+    kept = [s.getvalue() for s in streams]
+    assert kept[0] == kept[1]
+    assert 0 < kept[0].count("\n") < 200
+
+
+def test_sampling_keeps_or_drops_a_whole_request():
+    f = SamplingFilter({"taskmgr": 0.5})
+    decisions = {}
+    for rid in (f"req-{i}" for i in range(50)):
+        records = [_record(name) for name in ("taskmgr.tasks", "taskmgr.projects", "taskmgr.tasks")]
+        for r in records:
+            r.request_id = rid
+        decisions[rid] = {f.filter(r) for r in records}
+
+    assert all(len(d) == 1 for d in decisions.values())
+    assert {True, False} == {d.pop() for d in decisions.values()}
@@ -0,0 +1,62 @@
+# tests/unit/test_metrics.py
+
+import asyncio
+
+from app.core.metrics import Metrics, MetricsMiddleware
+
+
+def _lines(registry: Metrics, prefix: str):
+    return [line for line in registry.render().splitlines() if line.startswith(prefix)]
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = Metrics(buckets=(0.01, 0.1))
+    registry.observe("GET", "/x", 200, 0.005)
+    registry.observe("GET", "/x", 200, 0.01)     # limite do bucket é inclusivo (le)
+    registry.observe("GET", "/x", 200, 0.05)
+    registry.observe("GET", "/x", 200, 3.0)
+
+    labels = 'method="GET",route="/x",status="200"'
+    assert _lines(registry, "taskmgr_http_request_duration_seconds") == [
+        f'taskmgr_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 2',
+        f'taskmgr_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 3',
+        f'taskmgr_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4',
+        f"taskmgr_http_request_duration_seconds_sum{{{labels}}} 3.065",
+        f"taskmgr_http_request_duration_seconds_count{{{labels}}} 4",
+    ]
+
+
+def test_render_has_type_lines_sizes_and_escaped_labels():
+    registry = Metrics()
+    registry.observe("POST", '/a"b', 201, 0.001, request_bytes=10, response_bytes=99)
+
+    text = registry.render()
+
+    assert "# TYPE taskmgr_http_request_duration_seconds histogram" in text
+    assert "# TYPE taskmgr_http_requests_in_flight gauge" in text
+    labels = 'method="POST",route="/a\\"b",status="201"'
+    assert f"taskmgr_http_request_size_bytes_sum{{{labels}}} 10" in text
+    assert f"taskmgr_http_response_size_bytes_sum{{{labels}}} 99" in text
+    assert text.endswith("taskmgr_http_requests_in_flight 0\n")
+
+
+def test_middleware_records_status_sizes_and_in_flight():
+    registry = Metrics()
+    seen_in_flight = []
+
+    async def app(scope, receive, send):
+        seen_in_flight.append(registry.in_flight)
+        await send({"type": "http.response.start", "status": 418, "headers": []})
+        await send({"type": "http.response.body", "body": b"abc", "more_body": True})
+        await send({"type": "http.response.body", "body": b"de"})
+
+    async def _noop(*args):
+        return None
+
+    scope = {"type": "http", "method": "PUT", "headers": [(b"content-length", b"7")]}
+    asyncio.run(MetricsMiddleware(app, registry)(scope, _noop, _noop))
+
+    assert seen_in_flight == [1]
+    assert registry.in_flight == 0
+    series = registry.series[("PUT", "<unmatched>", 418)]
+    assert (sum(series.counts), series.request_bytes, series.response_bytes) == (1, 7, 5)
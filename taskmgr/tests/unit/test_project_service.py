@@ -4,7 +4,7 @@ from app.services.project_service import ProjectService
 class TRepo:
     def __init__(self, tasks):
         self._tasks = tasks
-    def list_with_filters(self, **kwargs):
+    def archive_candidates(self, project_id, limit=1):
         return self._tasks
 
 def test_can_archive_true():
@@ -14,3 +14,7 @@ def test_can_archive_true():
 def test_can_archive_false_high_priority_open():
     svc = ProjectService(projects=None, tasks=TRepo(tasks=[SimpleNamespace(priority=1, status="OPEN")]))
     assert svc.can_archive(1) is False
+
+def test_can_archive_false_high_priority_in_progress():
+    svc = ProjectService(projects=None, tasks=TRepo(tasks=[SimpleNamespace(priority=2, status="IN_PROGRESS")]))
+    assert svc.can_archive(1) is False
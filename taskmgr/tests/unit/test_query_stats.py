@@ -0,0 +1,73 @@
+# tests/unit/test_query_stats.py
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.query_stats import explain_query_plan, instrument_engine, track_queries
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'q.db'}"))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name VARCHAR, size INTEGER)"))
+        conn.execute(text("CREATE INDEX ix_item_name ON item (name)"))
+    return engine
+
+
+def test_track_queries_counts_and_times_in_this_context(engine):
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1")).all()
+            conn.execute(text("SELECT count(*) FROM item")).all()
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+    # fora do bloco nada é contado
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1")).all()
+    assert stats.count == 2
+    assert stats.statements is None
+
+
+def test_track_queries_can_record_statements(engine):
+    with track_queries(record_statements=True) as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM item WHERE name = :n"), {"n": "x"}).all()
+
+    assert stats.statements == [("SELECT id FROM item WHERE name = ?", ("x",))]
+
+
+def test_slow_queries_are_logged_with_query_plan(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 1e-6)
+
+    with caplog.at_level(logging.WARNING, logger="taskmgr.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM item WHERE name = :n"), {"n": "x"}).all()
+            conn.execute(text("SELECT id FROM item WHERE size > :s"), {"s": 1}).all()
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "taskmgr.sql"]
+    assert len(messages) == 2
+    assert "SELECT id FROM item WHERE name = ?" in messages[0]
+    assert "('x',)" in messages[0]
+    assert "USING COVERING INDEX ix_item_name" in messages[0] or "USING INDEX ix_item_name" in messages[0]
+    assert "SCAN item" in messages[1]
+
+
+def test_slow_query_log_is_off_with_zero_threshold(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="taskmgr.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM item")).all()
+
+    assert not [r for r in caplog.records if r.name == "taskmgr.sql"]
+
+
+def test_explain_skips_statements_without_a_plan(engine):
+    with engine.connect() as conn:
+        assert explain_query_plan(conn, "PRAGMA user_version", ()) is None
+        assert explain_query_plan(conn, "SELECT * FROM item", ()) == ["SCAN item"]
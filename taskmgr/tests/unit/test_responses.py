@@ -0,0 +1,44 @@
+from datetime import date
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.core import responses
+from app.models.schemas import TaskOut, TaskPage
+
+ROWS = [
+    (1, "Título ção", 'com "aspas"', "OPEN", 3, date(2030, 1, 2), 7, None),
+    (2, "B", "", "DONE", 1, None, 7, 4),
+]
+TAGS = {1: ["urgent", "bug"], 2: []}
+
+
+def _pydantic_list():
+    out = [TaskOut(**dict(zip(responses.TASK_OUT_FIELDS, r)), tags=TAGS[r[0]]) for r in ROWS]
+    return JSONResponse(jsonable_encoder(out)).body
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson não instalado")
+    return request.param
+
+
+def test_fast_list_encoding_matches_pydantic_path(encoder):
+    assert responses.encode_task_list(ROWS, TAGS) == _pydantic_list()
+
+
+def test_fast_page_encoding_matches_pydantic_path(encoder):
+    items = [TaskOut(**dict(zip(responses.TASK_OUT_FIELDS, r)), tags=TAGS[r[0]]) for r in ROWS]
+    expected = JSONResponse(jsonable_encoder(TaskPage(items=items, next_cursor="abc"))).body
+    assert responses.encode_task_page(ROWS, TAGS, "abc") == expected
+
+
+def test_raw_json_response_sends_bytes_unchanged():
+    resp = responses.RawJSONResponse(b'[{"id":1}]')
+    assert resp.body == b'[{"id":1}]'
+    assert resp.headers["content-type"] == "application/json"
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import DomainError, ValidationError
+from app.services.task_service import TaskService
+
+
+class BulkRepo:
+    def __init__(self, open_by_user=None, refuse=()):
+        self.open_by_user = open_by_user or {}
+        self.refuse = set(refuse)
+        self.inserted = []
+    def open_counts_for_users(self, user_ids):
+        return {uid: self.open_by_user.get(uid, 0) for uid in user_ids}
+    def bulk_create(self, items):
+        ids = []
+        for data, tag_ids in items:
+            if data.title in self.refuse:
+                ids.append(None)
+                continue
+            self.inserted.append((data, tag_ids))
+            ids.append(len(self.inserted))
+        return ids
+
+
+def _task(title, assignee_id=None, due_days=None, status="OPEN"):
+    due = date.today() + timedelta(days=due_days) if due_days is not None else None
+    return SimpleNamespace(title=title, status=status, due_date=due,
+                           project_id=1, assignee_id=assignee_id)
+
+
+@pytest.fixture
+def limit_two(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OPEN_TASKS_PER_USER", 2)
+
+
+def test_bulk_reports_per_item_outcome(limit_two):
+    repo = BulkRepo()
+    svc = TaskService(repo)
+    out = svc.create_tasks_bulk([
+        (_task("a"), [1]),
+        (_task("b", due_days=-1), []),
+        (_task("c", due_days=3), []),
+    ])
+    assert out[0] == 1
+    assert isinstance(out[1], ValidationError) and out[1].code == "due_date_past"
+    assert out[2] == 2
+    assert [d.title for d, _ in repo.inserted] == ["a", "c"]
+
+
+def test_bulk_limit_counts_the_whole_batch(limit_two):
+    repo = BulkRepo(open_by_user={7: 1})
+    svc = TaskService(repo)
+    out = svc.create_tasks_bulk([
+        (_task("a", assignee_id=7), []),
+        (_task("b", assignee_id=7), []),
+        (_task("c", assignee_id=7, status="DONE"), []),
+        (_task("d", assignee_id=8), []),
+        (_task("e", assignee_id=8), []),
+        (_task("f", assignee_id=8), []),
+    ])
+    assert out[0] == 1
+    assert isinstance(out[1], DomainError) and out[1].code == "user_overload"
+    assert out[2] == 2  # concluída não conta para o limite
+    assert out[3] == 3 and out[4] == 4
+    assert isinstance(out[5], DomainError) and out[5].code == "user_overload"
+
+
+def test_bulk_item_refused_by_repo_becomes_overload(limit_two):
+    repo = BulkRepo(refuse={"b"})
+    svc = TaskService(repo)
+    out = svc.create_tasks_bulk([(_task("a", assignee_id=1), []), (_task("b", assignee_id=1), [])])
+    assert out[0] == 1
+    assert isinstance(out[1], DomainError) and out[1].code == "user_overload"
+
+
+class StatusRepo:
+    def __init__(self, rows):
+        self.rows = rows
+        self.applied = None
+    def status_snapshot(self, ids=None, filters=None, limit=None):
+        if ids is None:
+            return list(self.rows)[:None if limit is None else limit + 1]
+        return [r for r in self.rows if r[0] in ids]
+    def apply_status_change(self, rows, new_status):
+        self.applied = ([r[0] for r in rows], new_status)
+
+
+def test_bulk_status_checks_rule_for_whole_set():
+    # (id, project_id, assignee_id, status)
+    repo = StatusRepo([(1, 1, 10, "OPEN"), (2, 1, None, "OPEN"), (3, 1, 11, "IN_PROGRESS")])
+    svc = TaskService(repo)
+    out = dict(svc.update_status_bulk("DONE", ids=[3, 2, 1, 4]))
+    assert out[1] == "DONE" and out[3] == "DONE"
+    assert isinstance(out[2], ValidationError) and out[2].code == "no_assignee"
+    assert out[4].code == "not_found"
+    assert repo.applied == ([3, 1], "DONE")
+
+
+def test_bulk_status_without_done_allows_unassigned():
+    repo = StatusRepo([(1, 1, None, "OPEN"), (2, 1, None, "DONE")])
+    svc = TaskService(repo)
+    out = svc.update_status_bulk("IN_PROGRESS", filters={"project_id": 1})
+    assert out == [(1, "IN_PROGRESS"), (2, "IN_PROGRESS")]
+    assert repo.applied == ([1, 2], "IN_PROGRESS")